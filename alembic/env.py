@@ -6,7 +6,7 @@ from sqlalchemy import pool
 from alembic import context
 
 from assessment_app.repository.database import Base  # Import your Base class
-from assessment_app.models.schema import UserCredentialsORM, UserORM, PortfolioORM, HoldingORM, TradeORM, TradeHistoryORM  # Import your models
+from assessment_app.models.schema import UserCredentialsORM, UserORM, PortfolioORM, HoldingORM, TradeORM, TradeHistoryORM, PriceORM, PriceSymbolORM, BacktestJobORM  # Import your models
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -1,11 +1,30 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from assessment_app.routers.user_mgmt import router as user_mgmt_router
 from assessment_app.routers.strategy import router as strategy_router
 from assessment_app.routers.market_integration import router as market_router
 from assessment_app.routers.analysis import router as analysis_router
-from assessment_app.routers.backtest import router as backtest_router
+from assessment_app.routers.backtest import (
+    backtest_jobs, reclaim_expired_jobs, router as backtest_router, start_backtest_jobs
+)
+from assessment_app.service.executor import pool_stats
+from assessment_app.service.strategies import load_strategy_modules
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Resume the backtest jobs left queued by the last run, then take over those whose process stopped
+    start_backtest_jobs()
+    reclaiming = asyncio.create_task(reclaim_expired_jobs())
+    yield
+    reclaiming.cancel()
+    backtest_jobs.shutdown()
 
-app = FastAPI()
+
+app = FastAPI(lifespan=lifespan)
+load_strategy_modules()
 
 app.include_router(user_mgmt_router, prefix="", tags=["user_mgmt"])
 app.include_router(strategy_router, prefix="", tags=["strategy"])
@@ -17,3 +36,12 @@ app.include_router(backtest_router, prefix="", tags=["backtest"])
 @app.get("/")
 def read_root():
     return {"message": "Welcome to the Stock Simulator"}
+
+
+@app.get("/system/pools")
+def read_pools():
+    """
+    Load of the worker pools that run blocking I/O, CPU-heavy work and backtest jobs: in-flight and queued calls,
+    completions and rejections.
+    """
+    return {**pool_stats(), backtest_jobs.name: backtest_jobs.stats()}
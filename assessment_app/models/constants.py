@@ -2,6 +2,7 @@ from enum import Enum
 
 JWT_TOKEN = "jwt_token"
 DAYS_IN_YEAR = 365.25
+TRADING_DAYS_IN_YEAR = 252
 
 
 class TradeType(str, Enum):
@@ -9,6 +10,26 @@ class TradeType(str, Enum):
     SELL = "SELL"
 
 
+class JobStatus(str, Enum):
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    SUCCEEDED = "SUCCEEDED"
+    FAILED = "FAILED"
+    CANCELLED = "CANCELLED"
+
+
+class StreamFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class BarInterval(str, Enum):
+    WEEK = "W"
+    MONTH = "M"
+    QUARTER = "Q"
+    YEAR = "Y"
+
+
 class Env(str, Enum):
     LOCAL = "local"
     DEV = "dev"
@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel
 
@@ -44,6 +44,8 @@ class Holding(StockPrice):
 class Strategy(BaseModel):
     id: str
     name: str
+    # Defaults of the strategy's parameters
+    parameters: Dict[str, float] = {}
 
 
 class PortfolioRequest(BaseModel):
@@ -64,6 +66,134 @@ class TickData(BaseModel):
     price: float
 
 
+class Bar(BaseModel):
+    stock_symbol: str
+    timestamp: datetime
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: int
+
+
+class TickBatchRequest(BaseModel):
+    stock_symbols: List[str]
+    timestamps: List[datetime]
+
+
+class TickBatchResponse(BaseModel):
+    stock_symbols: List[str]
+    timestamps: List[datetime]
+    # prices[i][j] is the price of stock_symbols[i] at timestamps[j], None if there is no data for that date
+    prices: List[List[Optional[float]]]
+
+
+class ReturnWindow(BaseModel):
+    start_ts: datetime
+    end_ts: datetime
+
+
+class ReturnsBatchRequest(BaseModel):
+    stock_symbols: List[str]
+    windows: List[ReturnWindow]
+
+
+class ReturnsBatchResponse(BaseModel):
+    stock_symbols: List[str]
+    windows: List[ReturnWindow]
+    # cagr[i][j] is the CAGR of stock_symbols[i] over windows[j], None if either end of the window has no price
+    cagr: List[List[Optional[float]]]
+
+
+class RollingAnalytics(BaseModel):
+    # None for a portfolio
+    stock_symbol: Optional[str] = None
+    window: int
+    timestamps: List[datetime]
+    values: List[float]
+    # Percentages per timestamp; returns and volatility are None until `window` earlier bars exist
+    returns: List[Optional[float]]
+    volatility: List[Optional[float]]
+    drawdown: List[Optional[float]]
+    max_drawdown: float
+
+
+class CorrelationRequest(BaseModel):
+    # Defaults to every symbol in StockSymbols
+    stock_symbols: Optional[List[str]] = None
+    start_ts: datetime
+    end_ts: datetime
+
+
+class CorrelationResponse(BaseModel):
+    stock_symbols: List[str]
+    start_ts: datetime
+    end_ts: datetime
+    # Number of daily returns the matrices were computed from
+    observations: int
+    # [i][j] entries for stock_symbols[i] and stock_symbols[j], of daily log returns; None where undefined
+    covariance: List[List[Optional[float]]]
+    correlation: List[List[Optional[float]]]
+
+
+class RiskEstimate(BaseModel):
+    # Positive amounts lost over the horizon
+    value_at_risk: float
+    expected_shortfall: float
+
+
+class PortfolioRisk(BaseModel):
+    start_ts: datetime
+    end_ts: datetime
+    confidence: float
+    horizon_days: int
+    # Value of the holdings at the last close in the range, which the losses are computed against
+    portfolio_value: float
+    # Number of daily returns the estimates were computed from
+    observations: int
+    historical: RiskEstimate
+    monte_carlo: RiskEstimate
+    simulations: int
+    seed: int
+
+
+class OptimizationRequest(BaseModel):
+    portfolio_id: str
+    start_ts: datetime
+    end_ts: datetime
+    # Bounds on the weight of every symbol; a negative min_weight allows short positions
+    min_weight: float = 0.0
+    max_weight: float = 1.0
+    # Annual percentage, for the Sharpe ratio
+    risk_free_rate: float = 0.0
+    frontier_points: int = 1000
+
+
+class FrontierPoint(BaseModel):
+    # Annualized percentages
+    expected_return: float
+    volatility: float
+    # Fraction of the portfolio's value in each symbol, in the order of the response's stock_symbols
+    weights: List[float]
+
+
+class PortfolioOptimization(BaseModel):
+    portfolio_id: str
+    stock_symbols: List[str]
+    start_ts: datetime
+    end_ts: datetime
+    # Number of daily returns the estimates were computed from
+    observations: int
+    # Frontier point with the highest Sharpe ratio
+    optimal: FrontierPoint
+    sharpe_ratio: Optional[float] = None
+    min_variance: FrontierPoint
+    # The holdings' weights at the last close in the range; None if they have no positive value
+    current: Optional[FrontierPoint] = None
+    # In order of increasing risk
+    frontier: List[FrontierPoint]
+
+
 class TradeHistory(BaseModel):
     portfolio_id: str
     trades: List[Trade]
@@ -75,6 +205,8 @@ class BacktestRequest(BaseModel):
     start_date: datetime
     end_date: datetime
     initial_capital: float
+    # Overrides of the strategy's default parameters
+    parameters: Optional[Dict[str, float]] = None
 
 # class Trade(BaseModel):
 #     date: datetime
@@ -92,3 +224,69 @@ class BacktestResponse(BaseModel):
     trades: List[Trade]
     profit_loss: float
     annualized_return: float
+
+
+class BacktestProgress(BaseModel):
+    # Share of the backtest's bars simulated so far, in percent
+    percent: float
+    symbol: str
+    # Timestamp of the last bar simulated
+    current_date: datetime
+    capital: float
+    trades: int
+    # Cash plus the holdings at the close of the last bar simulated for each (at their first close if not reached yet)
+    equity: float
+    # Progress messages skipped since the previous one because the client reads too slowly
+    dropped: int = 0
+
+
+class BacktestJob(BaseModel):
+    id: str
+    status: str
+    request: BacktestRequest
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    # Set once the job succeeded
+    result: Optional[BacktestResponse] = None
+    # Set if the job failed
+    error: Optional[str] = None
+
+
+class BacktestPeriod(BaseModel):
+    start_date: datetime
+    end_date: datetime
+
+
+class SweepRequest(BaseModel):
+    strategy_id: str
+    portfolio_id: str
+    # Every parameter set is backtested over every period
+    periods: List[BacktestPeriod]
+    initial_capital: float
+    # Values to try for each parameter; parameters left out keep their default
+    parameters: Dict[str, List[float]] = {}
+    # Number of best runs to return; all of them if None
+    top: Optional[int] = None
+
+
+class SweepResult(BaseModel):
+    rank: int
+    # All of the strategy's parameters, defaults included
+    parameters: Dict[str, float]
+    start_date: datetime
+    end_date: datetime
+    final_capital: float
+    profit_loss: float
+    annualized_return: float
+    trades: int
+
+
+class SweepResponse(BaseModel):
+    strategy_id: str
+    portfolio_id: str
+    initial_capital: float
+    # Number of backtests run
+    runs: int
+    # Best annualized return first
+    results: List[SweepResult]
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 from typing import List
-from sqlalchemy import Column, String, Float, Integer, DateTime, ForeignKey
+from sqlalchemy import JSON, BigInteger, Boolean, Column, String, Float, Integer, DateTime, ForeignKey
 from sqlalchemy.orm import relationship
 
 from assessment_app.repository.database import Base
@@ -93,4 +93,48 @@ class TradeHistoryORM(Base):
     
     portfolio = relationship("PortfolioORM", back_populates="trade_histories")
     # One-to-many relationship with trades
-    trades = relationship('TradeORM', backref='trade_history', cascade="all, delete-orphan")
\ No newline at end of file
+    trades = relationship('TradeORM', backref='trade_history', cascade="all, delete-orphan")
+
+
+class PriceORM(Base):
+    __tablename__ = "prices"
+
+    # The composite primary key is the (symbol, ts) index every price lookup and range scan uses
+    symbol = Column(String, primary_key=True)
+    ts = Column(DateTime, primary_key=True)
+    open = Column(Float, nullable=False)
+    high = Column(Float, nullable=False)
+    low = Column(Float, nullable=False)
+    close = Column(Float, nullable=False)
+    volume = Column(BigInteger, nullable=False)
+
+
+class PriceSymbolORM(Base):
+    __tablename__ = "price_symbols"
+
+    # One row per ingested symbol; version is bumped on every ingest so cached series can be invalidated
+    symbol = Column(String, primary_key=True)
+    row_count = Column(Integer, nullable=False)
+    version = Column(Integer, nullable=False, default=1)
+
+
+class BacktestJobORM(Base):
+    __tablename__ = "backtest_jobs"
+
+    id = Column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    # Not foreign keys, so jobs outlive their portfolio
+    user_id = Column(String, nullable=False, index=True)
+    portfolio_id = Column(String, nullable=False)
+    status = Column(String, nullable=False, index=True)  # a JobStatus value
+    # Process running the job (see jobs.WORKER_ID) and when it last renewed its lease
+    owner = Column(String)
+    heartbeat_at = Column(DateTime(timezone=True))
+    # Set by a cancel request; a running job checks it before committing its result
+    cancel_requested = Column(Boolean, nullable=False, default=False)
+    # The BacktestRequest, and once the job succeeded the BacktestResponse, as JSON
+    request = Column(JSON, nullable=False)
+    result = Column(JSON)
+    error = Column(String)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    started_at = Column(DateTime(timezone=True))
+    finished_at = Column(DateTime(timezone=True))
@@ -0,0 +1,166 @@
+"""
+Intraday (timestamp-resolution) bars, partitioned by symbol and day and loaded lazily.
+
+Layout: `<INTRADAY_DIR>/<SYMBOL>/<YYYY-MM-DD>.csv`, one file per trading day with columns
+`Datetime,Open,High,Low,Close,Volume`. Only the day partitions a query touches are read, and they
+are kept in their own byte-bounded LRU cache.
+"""
+import os
+import threading
+from datetime import date, datetime
+from typing import Dict, Tuple, Union
+
+import numpy as np
+
+from assessment_app.repository.price_store import (
+    DATA_DIR, INTRADAY, PriceSeries, PriceStore, concat_price_series, from_day, has_time_of_day, price_store, to_day
+)
+
+INTRADAY_DIR = f"{DATA_DIR}/intraday"
+INTRADAY_CACHE_MAX_BYTES = int(os.environ.get("INTRADAY_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+SECONDS_PER_DAY = 24 * 60 * 60
+
+
+class IntradayStore:
+    """
+    Lazily loaded intraday bars. Each (symbol, day) partition is a separate PriceStore entry.
+    """
+
+    def __init__(self, root: str = INTRADAY_DIR, max_bytes: int = INTRADAY_CACHE_MAX_BYTES):
+        self.root = root
+        self.partitions = PriceStore(root, max_bytes, unit=INTRADAY)
+        self._days: Dict[str, Tuple[int, np.ndarray]] = {}
+        self._lock = threading.Lock()
+
+    def days(self, symbol: str) -> np.ndarray:
+        """
+        Sorted int64 days (since the Unix epoch) that have an intraday partition for the symbol.
+
+        The directory listing is cached and refreshed whenever the directory's mtime changes.
+        """
+        path = os.path.join(self.root, symbol)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return np.empty(0, dtype=np.int64)
+        with self._lock:
+            cached = self._days.get(symbol)
+            if cached is not None and cached[0] == mtime:
+                return cached[1]
+        days = []
+        for name in os.listdir(path):
+            if not name.endswith(".csv"):
+                continue
+            try:
+                days.append(to_day(date.fromisoformat(name[:-len(".csv")])))
+            except ValueError:
+                # Not a day partition, e.g. a stray or temporary file
+                continue
+        days = np.array(sorted(days), dtype=np.int64)
+        with self._lock:
+            self._days[symbol] = (mtime, days)
+        return days
+
+    def has_day(self, symbol: str, ts: Union[datetime, date]) -> bool:
+        days = self.days(symbol)
+        day = to_day(ts)
+        i = int(np.searchsorted(days, day))
+        return i < len(days) and days[i] == day
+
+    def get_day(self, symbol: str, day: int) -> PriceSeries:
+        """
+        Intraday bars of one symbol on one day (days since the Unix epoch).
+
+        Raises:
+        FileNotFoundError: If the symbol has no partition for that day.
+        """
+        series = self.partitions.get(f"{symbol}/{from_day(day).isoformat()}")
+        series.symbol = symbol
+        return series
+
+    def get_range(self, symbol: str, from_ts: Union[datetime, date], to_ts: Union[datetime, date]) -> PriceSeries:
+        """
+        Intraday bars of a symbol between `from_ts` and `to_ts`, both inclusive.
+
+        Only the day partitions between the two timestamps are loaded; they are joined and trimmed to the range.
+        """
+        days = self.days(symbol)
+        start = int(np.searchsorted(days, to_day(from_ts), side="left"))
+        stop = int(np.searchsorted(days, to_day(to_ts), side="right"))
+        parts = [self.get_day(symbol, day) for day in days[start:stop].tolist()]
+        series = concat_price_series(symbol, parts, INTRADAY)
+        return series.take(series.range_slice(from_ts, to_ts))
+
+
+intraday_store = IntradayStore()
+
+
+def bars_at(symbol: str, ts: Union[datetime, date]) -> PriceSeries:
+    """
+    Price series to resolve `ts` against: the intraday bars of its day when `ts` has a time of day
+    and that day has an intraday partition, otherwise the symbol's daily bars.
+
+    Raises:
+    FileNotFoundError: If there is no data file for the symbol.
+    """
+    if has_time_of_day(ts) and intraday_store.has_day(symbol, ts):
+        return intraday_store.get_day(symbol, to_day(ts))
+    return price_store.get(symbol)
+
+
+def bars_between(symbol: str, from_ts: Union[datetime, date], to_ts: Union[datetime, date]) -> PriceSeries:
+    """
+    Bars of a symbol between `from_ts` and `to_ts`, both inclusive.
+
+    When either bound has a time of day and the symbol has intraday data, these are the intraday bars of
+    the days with a partition and the daily bars of the other days (see `merge_daily_bars`); otherwise
+    the daily bars.
+
+    Raises:
+    FileNotFoundError: If there is no data file for the symbol.
+    """
+    if not (has_time_of_day(from_ts) or has_time_of_day(to_ts)):
+        return price_store.get_range(symbol, from_ts, to_ts)
+    days = intraday_store.days(symbol)
+    if not len(days):
+        return price_store.get_range(symbol, from_ts, to_ts)
+    intraday = intraday_store.get_range(symbol, from_ts, to_ts)
+    try:
+        daily = price_store.get_range(symbol, from_ts, to_ts)
+    except FileNotFoundError:
+        return intraday
+    return merge_daily_bars(intraday, daily, days)
+
+
+def merge_daily_bars(intraday: PriceSeries, daily: PriceSeries, days: np.ndarray) -> PriceSeries:
+    """
+    Intraday bars joined with the daily bars of the days without an intraday partition, as one intraday
+    series. A daily bar is stamped at midnight of its day.
+
+    Parameters:
+    intraday (PriceSeries): Intraday bars of the range.
+    daily (PriceSeries): Daily bars of the range.
+    days (np.ndarray): Sorted days (since the Unix epoch) with an intraday partition.
+
+    Returns:
+    PriceSeries: The merged bars, sorted by time.
+    """
+    keep = ~np.isin(daily.dates, days)
+    if not keep.any():
+        return intraday
+    dates = np.concatenate((daily.dates[keep] * SECONDS_PER_DAY, intraday.dates))
+    order = np.argsort(dates, kind="stable")
+
+    def join(name: str) -> np.ndarray:
+        return np.concatenate((getattr(daily, name)[keep], getattr(intraday, name)))[order]
+
+    return PriceSeries(
+        symbol=intraday.symbol,
+        dates=dates[order],
+        open_=join("open"),
+        high=join("high"),
+        low=join("low"),
+        close=join("close"),
+        volume=join("volume"),
+        unit=INTRADAY,
+    )
@@ -0,0 +1,239 @@
+"""
+Daily price history stored in Postgres, in the `prices` table keyed by (symbol, ts).
+
+Load the CSVs into the table with:
+    python -m assessment_app.repository.price_db [--data-dir DIR] [SYMBOL ...]
+and set PRICE_SOURCE=db to serve prices from the table instead of the data files.
+"""
+import argparse
+import glob
+import io
+import os
+import threading
+import time
+from datetime import date, datetime
+from datetime import time as time_of_day
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+
+from assessment_app.models.schema import PriceORM, PriceSymbolORM
+from assessment_app.repository.database import engine as default_engine
+from assessment_app.repository.price_store import (
+    DAILY, DATA_DIR, PRICE_CACHE_MAX_BYTES, PriceSeries, PriceStore, from_day, load_price_series, to_day
+)
+
+# Seconds a symbol's ingest version is trusted before it is read from `price_symbols` again
+PRICE_VERSION_TTL = float(os.environ.get("PRICE_VERSION_TTL", 1.0))
+PRICE_COLUMNS = ["symbol", "ts", "open", "high", "low", "close", "volume"]
+COPY_SQL = f"COPY prices ({', '.join(PRICE_COLUMNS)}) FROM STDIN WITH (FORMAT csv)"
+UPSERT_SYMBOL_SQL = (
+    "INSERT INTO price_symbols (symbol, row_count, version) VALUES (%s, %s, 1) "
+    "ON CONFLICT (symbol) DO UPDATE SET row_count = EXCLUDED.row_count, version = price_symbols.version + 1"
+)
+
+
+def create_price_tables(bind: Engine = default_engine) -> None:
+    """
+    Create the `prices` and `price_symbols` tables if they do not exist.
+    """
+    for table in (PriceORM.__table__, PriceSymbolORM.__table__):
+        table.create(bind=bind, checkfirst=True)
+
+
+def copy_buffer(series: PriceSeries) -> io.StringIO:
+    """
+    Format a daily price series as the CSV rows `COPY prices FROM STDIN` expects, in PRICE_COLUMNS order.
+    """
+    frame = pd.DataFrame({
+        "symbol": series.symbol,
+        "ts": series.iso_timestamps(slice(None)),
+        "open": series.open,
+        "high": series.high,
+        "low": series.low,
+        "close": series.close,
+        "volume": series.volume,
+    }, columns=PRICE_COLUMNS)
+    buffer = io.StringIO()
+    frame.to_csv(buffer, header=False, index=False)
+    buffer.seek(0)
+    return buffer
+
+
+def _copy(cursor, sql: str, buffer: io.StringIO) -> None:
+    # psycopg2 exposes COPY through copy_expert, psycopg 3 through a copy() context manager
+    if hasattr(cursor, "copy_expert"):
+        cursor.copy_expert(sql, buffer)
+    else:
+        with cursor.copy(sql) as copy:
+            copy.write(buffer.getvalue())
+
+
+def ingest_series(series: PriceSeries, bind: Engine = default_engine) -> int:
+    """
+    Replace the stored price history of `series.symbol` with `series`, streaming the rows in with one `COPY`.
+
+    The delete, the copy and the version bump run in one transaction, so readers see either the old
+    history or the new one.
+
+    Parameters:
+    series (PriceSeries): The daily price history to store.
+    bind (Engine): Postgres engine to write to.
+
+    Returns:
+    int: Number of rows written.
+    """
+    if series.unit != DAILY:
+        raise ValueError("The prices table holds daily bars only")
+    connection = bind.raw_connection()
+    try:
+        cursor = connection.cursor()
+        try:
+            cursor.execute("DELETE FROM prices WHERE symbol = %s", (series.symbol,))
+            _copy(cursor, COPY_SQL, copy_buffer(series))
+            cursor.execute(UPSERT_SYMBOL_SQL, (series.symbol, len(series)))
+        finally:
+            cursor.close()
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+    return len(series)
+
+
+def ingest_csv(symbol: str, data_dir: str = DATA_DIR, bind: Engine = default_engine) -> int:
+    """
+    Load `<data_dir>/<symbol>.csv` into the `prices` table.
+
+    Returns:
+    int: Number of rows written.
+    """
+    return ingest_series(load_price_series(symbol, data_dir), bind)
+
+
+class DatabasePriceStore(PriceStore):
+    """
+    Price store that reads daily bars from the `prices` table instead of data files.
+
+    Whole symbols are cached in the same byte-bounded LRU as PriceStore. An entry is reloaded when
+    the symbol's ingest version in `price_symbols` changes. The version is read at most once per
+    `version_ttl` seconds per symbol, so cache hits do not each cost a database round trip; a new
+    ingest is picked up within `version_ttl`.
+    """
+
+    def __init__(self, bind: Engine = default_engine, max_bytes: int = PRICE_CACHE_MAX_BYTES,
+                 version_ttl: float = PRICE_VERSION_TTL):
+        super().__init__(max_bytes=max_bytes)
+        self.bind = bind
+        self.version_ttl = version_ttl
+        # Last version read per symbol: (monotonic time it was read, signature)
+        self._versions: Dict[str, Tuple[float, Optional[tuple]]] = {}
+        self._versions_lock = threading.Lock()
+
+    def _signature(self, symbol: str) -> Optional[tuple]:
+        """
+        (row count, version) of the symbol's last ingest, None if it was never ingested.
+        """
+        now = time.monotonic()
+        with self._versions_lock:
+            checked = self._versions.get(symbol)
+        if checked is not None and now - checked[0] < self.version_ttl:
+            return checked[1]
+        query = select(PriceSymbolORM.row_count, PriceSymbolORM.version).where(PriceSymbolORM.symbol == symbol)
+        with self.bind.connect() as connection:
+            row = connection.execute(query).first()
+        signature = tuple(row) if row is not None else None
+        with self._versions_lock:
+            self._versions[symbol] = (now, signature)
+        return signature
+
+    def clear(self, symbol: Optional[str] = None) -> None:
+        with self._versions_lock:
+            if symbol is None:
+                self._versions.clear()
+            else:
+                self._versions.pop(symbol, None)
+        super().clear(symbol)
+
+    def _load(self, symbol: str) -> PriceSeries:
+        series = self._query(symbol)
+        if not len(series):
+            raise FileNotFoundError(f"No prices stored for {symbol}")
+        return series
+
+    def _query(self, symbol: str, start: Optional[datetime] = None, stop: Optional[datetime] = None) -> PriceSeries:
+        """
+        Fetch the bars of a symbol in one query on the (symbol, ts) primary key, optionally limited to [start, stop).
+        """
+        started = time.perf_counter()
+        query = select(
+            PriceORM.ts, PriceORM.open, PriceORM.high, PriceORM.low, PriceORM.close, PriceORM.volume,
+        ).where(PriceORM.symbol == symbol).order_by(PriceORM.ts)
+        if start is not None:
+            query = query.where(PriceORM.ts >= start)
+        if stop is not None:
+            query = query.where(PriceORM.ts < stop)
+        with self.bind.connect() as connection:
+            rows = connection.execute(query).all()
+
+        ts, open_, high, low, close, volume = zip(*rows) if rows else ((),) * 6
+        series = PriceSeries(
+            symbol=symbol,
+            dates=np.array(ts, dtype="datetime64[s]").astype("datetime64[D]").astype(np.int64),
+            open_=np.array(open_, dtype=np.float64),
+            high=np.array(high, dtype=np.float64),
+            low=np.array(low, dtype=np.float64),
+            close=np.array(close, dtype=np.float64),
+            volume=np.array(volume, dtype=np.int64),
+        )
+        series.load_time = time.perf_counter() - started
+        return series
+
+    def get_range(self, symbol: str, from_ts: Union[datetime, date], to_ts: Union[datetime, date]) -> PriceSeries:
+        """
+        Bars of a symbol between the dates of `from_ts` and `to_ts`, both inclusive.
+
+        A cached, up-to-date symbol is sliced in memory; otherwise only the range is fetched, in one
+        indexed query, without loading the rest of the symbol.
+
+        Raises:
+        FileNotFoundError: If the symbol was never ingested.
+        """
+        signature = self._signature(symbol)
+        if signature is None:
+            raise FileNotFoundError(f"No prices stored for {symbol}")
+        with self._lock:
+            entry = self._series.get(symbol)
+            if entry is not None and entry[0] == signature:
+                self._series.move_to_end(symbol)
+                self.hits += 1
+                series = entry[1]
+                return series.take(series.range_slice(from_ts, to_ts))
+        start = datetime.combine(from_day(to_day(from_ts)), time_of_day.min)
+        stop = datetime.combine(from_day(to_day(to_ts) + 1), time_of_day.min)
+        return self._query(symbol, start, stop)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Bulk load price CSV files into the prices table.")
+    parser.add_argument("symbols", nargs="*", help="Symbols to load (default: every CSV in the data directory)")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="Directory holding the CSV files")
+    args = parser.parse_args(argv)
+
+    symbols = args.symbols or sorted(
+        os.path.splitext(os.path.basename(path))[0] for path in glob.glob(os.path.join(args.data_dir, "*.csv"))
+    )
+    create_price_tables()
+    for symbol in symbols:
+        started = time.perf_counter()
+        rows = ingest_csv(symbol, args.data_dir)
+        print(f"{symbol}: copied {rows} rows in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Aligned symbols x dates matrix of daily closes, for vectorized portfolio valuation.
+"""
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Iterable, List, Sequence, Tuple, Union
+
+import numpy as np
+
+from assessment_app.repository.price_store import PriceSeries, PriceStore, asof_rows, price_store, to_day
+
+PRICE_PANEL_CACHE_SIZE = int(os.environ.get("PRICE_PANEL_CACHE_SIZE", 32))
+
+
+class PricePanel:
+    """
+    Daily closes of several symbols on one shared date axis.
+
+    `dates` is the sorted union of the symbols' trading days (days since the Unix epoch) and `close[i, j]`
+    is the close of `symbols[i]` on `dates[j]`, forward-filled from its last earlier bar where the symbol
+    did not trade that day and NaN before its first bar. Portfolio values on any set of dates are then a
+    single matrix-vector product with the holding quantities.
+    """
+
+    def __init__(self, symbols: Tuple[str, ...], dates: np.ndarray, close: np.ndarray, version: Tuple[int, ...] = ()):
+        self.symbols = symbols
+        # Versions of the price series the panel was built from
+        self.version = version
+        self.dates = dates
+        self.close = close
+        self._rows = {symbol: i for i, symbol in enumerate(symbols)}
+        for array in (dates, close):
+            array.setflags(write=False)
+
+    @classmethod
+    def build(cls, series: Sequence[PriceSeries]) -> "PricePanel":
+        """
+        Align the daily series of several symbols on the union of their dates, forward-filling gaps.
+        """
+        dates = np.unique(np.concatenate([s.dates for s in series])) if series else np.empty(0, dtype=np.int64)
+        close = np.full((len(series), len(dates)), np.nan)
+        for i, s in enumerate(series):
+            # Last bar of the symbol at or before every panel date
+            rows = np.searchsorted(s.dates, dates, side="right") - 1
+            close[i] = np.where(rows >= 0, s.close[np.maximum(rows, 0)], np.nan)
+        return cls(tuple(s.symbol for s in series), dates, close, tuple(s.version for s in series))
+
+    @property
+    def nbytes(self) -> int:
+        return self.dates.nbytes + self.close.nbytes
+
+    def quantities(self, holdings: Iterable[Tuple[str, float]]) -> np.ndarray:
+        """
+        Quantity vector aligned with `symbols` from (symbol, quantity) pairs; repeated symbols are summed.
+        """
+        quantities = np.zeros(len(self.symbols))
+        for symbol, quantity in holdings:
+            quantities[self._rows[symbol]] += quantity
+        return quantities
+
+    def asof_columns(self, timestamps: Iterable[Union[datetime, date]]) -> np.ndarray:
+        """
+        Column of the last trading day at or before each timestamp's calendar date, -1 before the first one.
+        """
+        return asof_rows(self.dates, np.fromiter((to_day(ts) for ts in timestamps), dtype=np.int64))
+
+    def range_columns(self, from_ts: Union[datetime, date], to_ts: Union[datetime, date]) -> slice:
+        """
+        Columns whose dates fall between the calendar dates of `from_ts` and `to_ts`, both inclusive.
+        """
+        start = int(np.searchsorted(self.dates, to_day(from_ts), side="left"))
+        stop = int(np.searchsorted(self.dates, to_day(to_ts), side="right"))
+        return slice(start, max(start, stop))
+
+    def values(self, quantities: np.ndarray, columns: Union[slice, np.ndarray] = slice(None)) -> np.ndarray:
+        """
+        Value of the holdings on the given columns: `quantities @ close[:, columns]`.
+
+        A column is NaN when a held symbol has no price yet on its date; symbols with a zero quantity are
+        left out, so their missing prices do not matter.
+        """
+        rows = np.flatnonzero(quantities)
+        if len(rows) == len(quantities):
+            block = self.close[:, columns]
+        elif isinstance(columns, slice):
+            block = self.close[rows, columns]
+        else:
+            block = self.close[np.ix_(rows, columns)]
+        return quantities[rows] @ block
+
+
+class PricePanelCache:
+    """
+    LRU of price panels keyed by symbol set. A panel is rebuilt when the price store reloads any of its symbols.
+    """
+
+    def __init__(self, store: PriceStore = price_store, max_panels: int = PRICE_PANEL_CACHE_SIZE):
+        self.store = store
+        self.max_panels = max_panels
+        self._panels: "OrderedDict[Tuple[str, ...], Tuple[List[weakref.ref], PricePanel]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, symbols: Iterable[str]) -> PricePanel:
+        """
+        Panel over the given symbols (deduplicated and sorted).
+
+        Raises:
+        FileNotFoundError: If there is no data for one of the symbols.
+        """
+        key = tuple(sorted(set(symbols)))
+        series = [self.store.get(symbol) for symbol in key]
+        with self._lock:
+            entry = self._panels.get(key)
+            # The store hands out the same series object until the symbol's data changes. Sources are held
+            # weakly so cached panels do not keep series the store has evicted alive.
+            if entry is not None and all(ref() is s for ref, s in zip(entry[0], series)):
+                self._panels.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+        panel = PricePanel.build(series)
+        with self._lock:
+            self.misses += 1
+            self._panels[key] = ([weakref.ref(s) for s in series], panel)
+            self._panels.move_to_end(key)
+            while len(self._panels) > self.max_panels:
+                self._panels.popitem(last=False)
+        return panel
+
+
+price_panels = PricePanelCache()
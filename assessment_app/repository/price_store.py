@@ -0,0 +1,586 @@
+import itertools
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from datetime import date, datetime, timedelta
+from datetime import time as time_of_day
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = "assessment_app/data"
+PRICE_CACHE_MAX_BYTES = int(os.environ.get("PRICE_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+PRICE_SOURCE = os.environ.get("PRICE_SOURCE", "file")
+EPOCH = date(1970, 1, 1)
+EPOCH_DATETIME = datetime(1970, 1, 1)
+
+# Resolution of a PriceSeries' time column: "D" for daily bars, "s" for intraday bars
+DAILY = "D"
+INTRADAY = "s"
+TIME_COLUMNS = {DAILY: "Date", INTRADAY: "Datetime"}
+
+# Symbols are used as file names, so they may not contain path separators
+SYMBOL_PATTERN = re.compile(r"^[A-Z0-9_.-]+$")
+
+# Source of PriceSeries.version stamps
+_series_versions = itertools.count(1)
+
+
+def is_valid_symbol(symbol: str) -> bool:
+    """
+    Whether `symbol` can name a price data file: upper-case letters, digits, '_', '.' and '-' only.
+    """
+    return bool(SYMBOL_PATTERN.match(symbol)) and symbol not in (".", "..")
+
+
+def to_day(ts: Union[datetime, date]) -> int:
+    """
+    Convert a datetime (or date) to the number of days since the Unix epoch.
+
+    Parameters:
+    ts (datetime | date): The timestamp to convert. Only the calendar date is used.
+
+    Returns:
+    int: Days since 1970-01-01.
+    """
+    if isinstance(ts, datetime):
+        ts = ts.date()
+    return (ts - EPOCH).days
+
+
+def to_second(ts: Union[datetime, date]) -> int:
+    """
+    Convert a datetime (or date, taken as midnight) to wall-clock seconds since the Unix epoch.
+
+    Timezone-aware datetimes keep their local wall-clock time, matching how `to_day` uses their local date.
+
+    Parameters:
+    ts (datetime | date): The timestamp to convert.
+
+    Returns:
+    int: Seconds since 1970-01-01T00:00:00.
+    """
+    if not isinstance(ts, datetime):
+        ts = datetime(ts.year, ts.month, ts.day)
+    return (ts.replace(tzinfo=None) - EPOCH_DATETIME) // timedelta(seconds=1)
+
+
+def has_time_of_day(ts: Union[datetime, date]) -> bool:
+    """
+    Whether `ts` points inside a day rather than at midnight, i.e. asks for an intraday bar.
+    """
+    return isinstance(ts, datetime) and ts.time() != time_of_day.min
+
+
+def asof_rows(axis: np.ndarray, keys: np.ndarray) -> np.ndarray:
+    """
+    As-of lookup: the row of the last entry of a sorted key axis at or before each key, -1 before the first.
+
+    Any number of keys is resolved with one `searchsorted` call. Every point lookup goes through here,
+    so a weekend, holiday or other gap resolves to the previous bar the same way everywhere.
+
+    Parameters:
+    axis (np.ndarray): Sorted int64 keys, e.g. PriceSeries.dates.
+    keys (np.ndarray): int64 keys to look up on the same axis.
+
+    Returns:
+    np.ndarray: int64 row per key.
+    """
+    return (np.searchsorted(axis, np.asarray(keys, dtype=np.int64), side="right") - 1).astype(np.int64)
+
+
+def from_day(day: int) -> date:
+    """
+    Convert a number of days since the Unix epoch back to a date.
+
+    Parameters:
+    day (int): Days since 1970-01-01.
+
+    Returns:
+    date: The corresponding calendar date.
+    """
+    return date.fromordinal(EPOCH.toordinal() + int(day))
+
+
+class PriceSeries:
+    """
+    Columnar, read-only price history of a single stock symbol.
+
+    The `dates` column holds int64 counts of `unit` since the Unix epoch, sorted ascending: days for
+    daily bars, wall-clock seconds for intraday bars. Every other column is a float64 (or int64 for
+    volume) array of the same length.
+
+    `version` is unique per series object: the store hands out a new series (and so a new version)
+    whenever it reloads a symbol, which makes it a data-version stamp for caching derived results.
+    """
+
+    def __init__(self, symbol: str, dates: np.ndarray, open_: np.ndarray, high: np.ndarray,
+                 low: np.ndarray, close: np.ndarray, volume: np.ndarray, load_time: float = 0.0,
+                 unit: str = DAILY):
+        self.symbol = symbol
+        self.unit = unit
+        self.version = next(_series_versions)
+        self.dates = dates
+        self.open = open_
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        self.load_time = load_time
+        self.mapped = False
+        self._resampled: Dict[str, Tuple["PriceSeries", np.ndarray]] = {}
+        self._derived: Dict[Hashable, Any] = {}
+        for array in (dates, open_, high, low, close, volume):
+            array.setflags(write=False)
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Total memory held by the column arrays, plus the window table of a daily series, in bytes. The table is
+        built on the first window query but counted from the start, so a cached series' size never changes.
+        """
+        arrays = (self.dates, self.open, self.high, self.low, self.close, self.volume)
+        window_table = len(self) * np.dtype(np.float64).itemsize if self.unit == DAILY else 0
+        return sum(array.nbytes for array in arrays) + window_table
+
+    @property
+    def mid(self) -> np.ndarray:
+        """
+        Tick price of every row: the average of Open and Close.
+        """
+        return (self.open + self.close) / 2
+
+    def memoize(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Value derived from this series (e.g. rolling analytics), computed on first use and kept per `key`.
+
+        Derived values live on the series, so they are dropped with it when the price store evicts or
+        reloads the symbol: they are cached per data version without any explicit invalidation.
+        """
+        value = self._derived.get(key)
+        if value is None:
+            value = self._derived[key] = compute()
+        return value
+
+    def window_table(self) -> np.ndarray:
+        """
+        Cumulative log return of the close from the first row, built on the first window query and kept: the log
+        return from row i to row j is `table[j] - table[i]`.
+        """
+        def build() -> np.ndarray:
+            log_close = np.log(self.close)
+            table = log_close - log_close[0] if len(log_close) else log_close
+            table.setflags(write=False)
+            return table
+
+        return self.memoize("window_table", build)
+
+    def window_log_return(self, start_rows, end_rows):
+        """
+        Log return of the close from `start_rows` to `end_rows` (row indices or arrays of them), from the window table.
+        """
+        table = self.window_table()
+        return table[end_rows] - table[start_rows]
+
+    def key(self, ts: Union[datetime, date]) -> int:
+        """
+        Position of `ts` on this series' time axis: its day for daily bars, its second for intraday bars.
+        """
+        return to_day(ts) if self.unit == DAILY else to_second(ts)
+
+    def timestamp(self, key: int) -> datetime:
+        """
+        Inverse of `key`: the datetime a value of the `dates` column stands for.
+        """
+        if self.unit == DAILY:
+            return datetime.combine(from_day(key), time_of_day.min)
+        return EPOCH_DATETIME + timedelta(seconds=int(key))
+
+    def iso_timestamps(self, rows: slice) -> List[str]:
+        """
+        ISO-8601 timestamps ("YYYY-MM-DDTHH:MM:SS") of the given rows, formatted in one vectorized call.
+        """
+        formatted = self.dates[rows].astype(f"datetime64[{self.unit}]").astype(str).tolist()
+        if self.unit == DAILY:
+            return [f"{day}T00:00:00" for day in formatted]
+        return formatted
+
+    def datetimes(self, rows: Union[slice, np.ndarray]) -> List[datetime]:
+        """
+        Datetimes of the given rows (see `timestamp`), converted in one vectorized call.
+        """
+        return self.dates[rows].astype(f"datetime64[{self.unit}]").astype("datetime64[us]").tolist()
+
+    def asof(self, ts: Union[datetime, date]) -> Optional[int]:
+        """
+        Row of the last bar at or before `ts` (by calendar date for daily bars), see `asof_rows`.
+
+        Returns:
+        Optional[int]: The row index, or None if `ts` is before the first bar.
+        """
+        i = int(self.asof_keys([self.key(ts)])[0])
+        return i if i >= 0 else None
+
+    def asof_many(self, timestamps: Iterable[Union[datetime, date]]) -> np.ndarray:
+        """
+        Vectorized `asof`: int64 row per timestamp, -1 where it is before the first bar.
+        """
+        return self.asof_keys(np.fromiter((self.key(ts) for ts in timestamps), dtype=np.int64))
+
+    def asof_keys(self, keys: np.ndarray) -> np.ndarray:
+        """
+        `asof_many` for timestamps already converted to this series' time axis (see `key`).
+        """
+        return asof_rows(self.dates, keys)
+
+    def range_slice(self, from_ts: Union[datetime, date], to_ts: Union[datetime, date]) -> slice:
+        """
+        Binary-search the rows between `from_ts` and `to_ts`, both inclusive (by date for daily bars).
+
+        Slicing the column arrays with the result returns views, so no data is copied.
+
+        Parameters:
+        from_ts (datetime | date): Start of the range.
+        to_ts (datetime | date): End of the range.
+
+        Returns:
+        slice: The matching rows (empty if none match).
+        """
+        start = int(np.searchsorted(self.dates, self.key(from_ts), side="left"))
+        stop = int(np.searchsorted(self.dates, self.key(to_ts), side="right"))
+        return slice(start, max(start, stop))
+
+    def resample(self, interval: str) -> Tuple["PriceSeries", np.ndarray]:
+        """
+        OHLCV bars of this daily series at a coarser interval ("W", "M", "Q" or "Y").
+
+        Bars are aggregated in one vectorized pass (ufunc.reduceat over period boundaries) and memoized
+        on the series, so they are computed once per interval and dropped with the series when the
+        price store evicts or reloads it.
+
+        Returns:
+        Tuple[PriceSeries, np.ndarray]: The bars, dated by the first calendar day of their period,
+        and the day of the last row aggregated into each bar.
+        """
+        cached = self._resampled.get(interval)
+        if cached is not None:
+            return cached
+        if self.unit != DAILY:
+            raise ValueError("Only daily series can be resampled")
+
+        periods = period_starts(np.asarray(self.dates), interval)
+        boundaries = np.flatnonzero(periods[1:] != periods[:-1]) + 1
+        if len(periods):
+            starts = np.r_[0, boundaries]
+            ends = np.r_[boundaries, len(periods)] - 1
+        else:
+            starts = ends = boundaries
+        bars = PriceSeries(
+            symbol=self.symbol,
+            dates=periods[starts],
+            open_=self.open[starts],
+            high=np.maximum.reduceat(self.high, starts),
+            low=np.minimum.reduceat(self.low, starts),
+            close=self.close[ends],
+            volume=np.add.reduceat(self.volume, starts),
+        )
+        last_days = np.asarray(self.dates)[ends]
+        self._resampled[interval] = (bars, last_days)
+        return bars, last_days
+
+    def take(self, rows: slice) -> "PriceSeries":
+        """
+        A PriceSeries over a contiguous subset of rows, sharing (not copying) this series' arrays.
+        """
+        return PriceSeries(
+            symbol=self.symbol,
+            dates=self.dates[rows],
+            open_=self.open[rows],
+            high=self.high[rows],
+            low=self.low[rows],
+            close=self.close[rows],
+            volume=self.volume[rows],
+            unit=self.unit,
+        )
+
+
+def period_starts(days: np.ndarray, interval: str) -> np.ndarray:
+    """
+    First calendar day (days since the Unix epoch) of the week ("W", starting Monday), month ("M"),
+    quarter ("Q") or year ("Y") containing each of `days`.
+    """
+    if interval == "W":
+        # 1970-01-01 was a Thursday, so Mondays are the days where (day + 3) % 7 == 0
+        return (days + 3) // 7 * 7 - 3
+    months = days.astype("datetime64[D]").astype("datetime64[M]")
+    if interval == "Q":
+        months = (months.astype(np.int64) // 3 * 3).astype("datetime64[M]")
+    elif interval == "Y":
+        months = months.astype("datetime64[Y]").astype("datetime64[M]")
+    elif interval != "M":
+        raise ValueError(f"Unsupported interval {interval}")
+    return months.astype("datetime64[D]").astype(np.int64)
+
+
+def concat_price_series(symbol: str, parts: List[PriceSeries], unit: str) -> PriceSeries:
+    """
+    Join consecutive, non-overlapping price series (e.g. day partitions) into one.
+    """
+    if len(parts) == 1:
+        return parts[0]
+
+    def join(name: str, dtype: type) -> np.ndarray:
+        return np.concatenate([getattr(part, name) for part in parts]) if parts else np.empty(0, dtype=dtype)
+
+    return PriceSeries(
+        symbol=symbol,
+        dates=join("dates", np.int64),
+        open_=join("open", np.float64),
+        high=join("high", np.float64),
+        low=join("low", np.float64),
+        close=join("close", np.float64),
+        volume=join("volume", np.int64),
+        unit=unit,
+    )
+
+
+def load_price_series(symbol: str, data_dir: str = DATA_DIR, unit: str = DAILY) -> PriceSeries:
+    """
+    Parse `<data_dir>/<symbol>.csv` into a PriceSeries.
+
+    Daily files are keyed by a `Date` column, intraday files by a `Datetime` column.
+
+    Parameters:
+    symbol (str): The stock symbol, also the CSV file name.
+    data_dir (str): Directory holding the CSV files.
+    unit (str): DAILY or INTRADAY resolution of the file.
+
+    Returns:
+    PriceSeries: The parsed price history, sorted by date.
+
+    Raises:
+    FileNotFoundError: If there is no data file for the symbol.
+    """
+    started = time.perf_counter()
+    time_column = TIME_COLUMNS[unit]
+    df = pd.read_csv(f"{data_dir}/{symbol}.csv", usecols=[time_column, "Open", "High", "Low", "Close", "Volume"])
+    df = df.sort_values(time_column, kind="stable")
+    dates = pd.to_datetime(df[time_column]).to_numpy().astype(f"datetime64[{unit}]").astype(np.int64)
+    series = PriceSeries(
+        symbol=symbol,
+        dates=dates,
+        open_=df["Open"].to_numpy(dtype=np.float64),
+        high=df["High"].to_numpy(dtype=np.float64),
+        low=df["Low"].to_numpy(dtype=np.float64),
+        close=df["Close"].to_numpy(dtype=np.float64),
+        volume=df["Volume"].to_numpy(dtype=np.int64),
+        unit=unit,
+    )
+    series.load_time = time.perf_counter() - started
+    return series
+
+
+class PriceStore:
+    """
+    Process-wide LRU cache of price series, loaded from each symbol's binary tick file or CSV.
+
+    The cache holds at most `max_bytes` of column data; the least recently used symbols are
+    evicted first. An entry is reloaded when the mtime or size of its data files changes.
+    """
+
+    def __init__(self, data_dir: str = DATA_DIR, max_bytes: int = PRICE_CACHE_MAX_BYTES, unit: str = DAILY):
+        self.data_dir = data_dir
+        self.max_bytes = max_bytes
+        self.unit = unit
+        self._series: "OrderedDict[str, Tuple[tuple, PriceSeries]]" = OrderedDict()
+        # Loads in flight, by symbol: (signature being loaded, future of the series)
+        self._loading: Dict[str, Tuple[tuple, Future]] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, symbol: str) -> PriceSeries:
+        """
+        Return the price series for a symbol, loading it on a miss or when its data files changed.
+
+        The load runs outside the store's lock, so a cold symbol does not hold up hits on other symbols;
+        concurrent misses on the same symbol wait for the one load in flight instead of repeating it.
+
+        Parameters:
+        symbol (str): The stock symbol.
+
+        Returns:
+        PriceSeries: The cached price history.
+
+        Raises:
+        FileNotFoundError: If there is no data file for the symbol.
+        """
+        signature = self._signature(symbol)
+        with self._lock:
+            entry = self._series.get(symbol)
+            if entry is not None and entry[0] == signature:
+                self._series.move_to_end(symbol)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                self._remove(symbol)
+                self.invalidations += 1
+            loading = self._loading.get(symbol)
+            owner = loading is None or loading[0] != signature
+            if owner:
+                self.misses += 1
+                loading = self._loading[symbol] = (signature, Future())
+            else:
+                self.hits += 1
+        future = loading[1]
+        if not owner:
+            return future.result()
+        try:
+            series = self._load(symbol)
+        except BaseException as exc:
+            with self._lock:
+                self._finish_loading(symbol, future)
+            future.set_exception(exc)
+            raise
+        with self._lock:
+            if self._finish_loading(symbol, future):
+                if symbol in self._series:
+                    self._remove(symbol)
+                self._series[symbol] = (signature, series)
+                self._bytes += series.nbytes
+                self._evict()
+        future.set_result(series)
+        logger.info("Loaded %s: %d rows, %d bytes in %.2f ms",
+                    symbol, len(series), series.nbytes, series.load_time * 1000)
+        return series
+
+    def get_range(self, symbol: str, from_ts: Union[datetime, date], to_ts: Union[datetime, date]) -> PriceSeries:
+        """
+        Bars of a symbol between `from_ts` and `to_ts`, both inclusive, as views over the cached series.
+
+        Raises:
+        FileNotFoundError: If there is no data file for the symbol.
+        """
+        series = self.get(symbol)
+        return series.take(series.range_slice(from_ts, to_ts))
+
+    def _signature(self, symbol: str) -> tuple:
+        """
+        (mtime, size) of the symbol's CSV and binary tick file, None for a missing file.
+        """
+        from assessment_app.repository.tick_file import tick_file_path
+
+        signature = []
+        for path in (f"{self.data_dir}/{symbol}.csv", tick_file_path(symbol, self.data_dir)):
+            try:
+                stat = os.stat(path)
+                signature.append((stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                signature.append(None)
+        return tuple(signature)
+
+    def _finish_loading(self, symbol: str, future: Future) -> bool:
+        """
+        Forget the load in flight behind `future`. False if a load of newer files has replaced it meanwhile.
+        """
+        loading = self._loading.get(symbol)
+        if loading is None or loading[1] is not future:
+            return False
+        del self._loading[symbol]
+        return True
+
+    def _remove(self, symbol: str) -> None:
+        _, series = self._series.pop(symbol)
+        self._bytes -= series.nbytes
+
+    def _evict(self) -> None:
+        """
+        Drop least recently used entries until the cache fits its budget, always keeping the newest one.
+        """
+        while self._bytes > self.max_bytes and len(self._series) > 1:
+            symbol = next(iter(self._series))
+            self._remove(symbol)
+            self.evictions += 1
+            logger.info("Evicted %s from the price store", symbol)
+
+    def _load(self, symbol: str) -> PriceSeries:
+        """
+        Memory-map the symbol's binary tick file if it is at least as new as its CSV, else parse the CSV.
+        Binary tick files hold daily bars only.
+        """
+        from assessment_app.repository.tick_file import open_tick_file, tick_file_path
+
+        csv_path = f"{self.data_dir}/{symbol}.csv"
+        bin_path = tick_file_path(symbol, self.data_dir)
+        if self.unit == DAILY and os.path.exists(bin_path) and (
+                not os.path.exists(csv_path) or os.path.getmtime(bin_path) >= os.path.getmtime(csv_path)):
+            return open_tick_file(symbol, bin_path)
+        return load_price_series(symbol, self.data_dir, self.unit)
+
+    def clear(self, symbol: Optional[str] = None) -> None:
+        """
+        Drop one symbol, or every symbol, from the store.
+        """
+        with self._lock:
+            # Loads in flight finish without caching their series
+            if symbol is None:
+                self._series.clear()
+                self._loading.clear()
+                self._bytes = 0
+            else:
+                self._loading.pop(symbol, None)
+                if symbol in self._series:
+                    self._remove(symbol)
+
+    def stats(self) -> dict:
+        """
+        Report cache usage and counters, plus rows, memory and load time of every cached symbol.
+        """
+        with self._lock:
+            return {
+                "max_bytes": self.max_bytes,
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "symbols": {
+                    symbol: {
+                        "rows": len(series),
+                        "bytes": series.nbytes,
+                        "load_time_ms": series.load_time * 1000,
+                        "mapped": series.mapped,
+                    }
+                    for symbol, (_, series) in self._series.items()
+                },
+            }
+
+
+def create_price_store() -> PriceStore:
+    """
+    The price store selected by PRICE_SOURCE: "file" (default) reads the data directory, "db" reads the `prices` table.
+    """
+    if PRICE_SOURCE == "db":
+        # Imported here: price_db builds on this module and connects to the database on import
+        from assessment_app.repository.price_db import DatabasePriceStore
+
+        return DatabasePriceStore()
+    if PRICE_SOURCE != "file":
+        raise ValueError(f"Unsupported PRICE_SOURCE {PRICE_SOURCE}")
+    return PriceStore()
+
+
+price_store = create_price_store()
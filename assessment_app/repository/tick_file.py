@@ -0,0 +1,135 @@
+"""
+Fixed-width, column-major binary format for price history, read through mmap.
+
+Layout of `<SYMBOL>.bin` (all little-endian):
+    header: 4-byte magic b"PRC1", uint32 column count, uint64 row count
+    body:   one contiguous 8-byte-per-row block per column, in COLUMNS order
+
+Build the files from the CSVs with:
+    python -m assessment_app.repository.tick_file [--data-dir DIR] [SYMBOL ...]
+"""
+import argparse
+import glob
+import mmap
+import os
+import struct
+import time
+from typing import List, Optional
+
+import numpy as np
+
+from assessment_app.repository.price_store import DAILY, DATA_DIR, PriceSeries, load_price_series
+
+MAGIC = b"PRC1"
+HEADER = struct.Struct("<4sIQ")
+COLUMNS = [
+    ("dates", np.dtype("<i8")),
+    ("open", np.dtype("<f8")),
+    ("high", np.dtype("<f8")),
+    ("low", np.dtype("<f8")),
+    ("close", np.dtype("<f8")),
+    ("volume", np.dtype("<i8")),
+]
+TICK_FILE_SUFFIX = ".bin"
+
+
+def tick_file_path(symbol: str, data_dir: str = DATA_DIR) -> str:
+    return os.path.join(data_dir, f"{symbol}{TICK_FILE_SUFFIX}")
+
+
+def write_tick_file(series: PriceSeries, path: str) -> None:
+    """
+    Write a price series to `path` in the binary tick format.
+
+    The file is written next to the target and renamed into place, so readers never see a partial file.
+
+    Parameters:
+    series (PriceSeries): The daily price history to write.
+    path (str): Destination file path.
+    """
+    if series.unit != DAILY:
+        raise ValueError("Binary tick files hold daily bars only")
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(HEADER.pack(MAGIC, len(COLUMNS), len(series)))
+        for name, dtype in COLUMNS:
+            file.write(np.ascontiguousarray(getattr(series, name), dtype=dtype).tobytes())
+    os.replace(tmp_path, path)
+
+
+def open_tick_file(symbol: str, path: str) -> PriceSeries:
+    """
+    Memory-map a binary tick file as a PriceSeries.
+
+    Every column is a zero-copy, read-only view over the mapping, so a query only faults in the pages it reads.
+
+    Parameters:
+    symbol (str): The stock symbol.
+    path (str): Path of the binary tick file.
+
+    Returns:
+    PriceSeries: The mapped price history.
+
+    Raises:
+    FileNotFoundError: If the file does not exist.
+    ValueError: If the file is not a valid tick file.
+    """
+    started = time.perf_counter()
+    with open(path, "rb") as file:
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(buffer) < HEADER.size:
+        raise ValueError(f"{path} is not a tick file")
+    magic, column_count, rows = HEADER.unpack_from(buffer)
+    if magic != MAGIC or column_count != len(COLUMNS):
+        raise ValueError(f"{path} is not a tick file")
+    if len(buffer) != HEADER.size + sum(dtype.itemsize for _, dtype in COLUMNS) * rows:
+        raise ValueError(f"{path} is truncated")
+
+    columns = {}
+    offset = HEADER.size
+    for name, dtype in COLUMNS:
+        columns[name] = np.frombuffer(buffer, dtype=dtype, count=rows, offset=offset)
+        offset += dtype.itemsize * rows
+
+    series = PriceSeries(
+        symbol=symbol,
+        dates=columns["dates"],
+        open_=columns["open"],
+        high=columns["high"],
+        low=columns["low"],
+        close=columns["close"],
+        volume=columns["volume"],
+    )
+    series.load_time = time.perf_counter() - started
+    series.mapped = True
+    return series
+
+
+def convert_csv(symbol: str, data_dir: str = DATA_DIR) -> str:
+    """
+    Build `<symbol>.bin` from `<symbol>.csv` in `data_dir`.
+
+    Returns:
+    str: Path of the written tick file.
+    """
+    path = tick_file_path(symbol, data_dir)
+    write_tick_file(load_price_series(symbol, data_dir), path)
+    return path
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Convert price CSV files to the binary tick format.")
+    parser.add_argument("symbols", nargs="*", help="Symbols to convert (default: every CSV in the data directory)")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="Directory holding the CSV files")
+    args = parser.parse_args(argv)
+
+    symbols = args.symbols or sorted(
+        os.path.splitext(os.path.basename(path))[0] for path in glob.glob(os.path.join(args.data_dir, "*.csv"))
+    )
+    for symbol in symbols:
+        path = convert_csv(symbol, args.data_dir)
+        print(f"{symbol}: wrote {os.path.getsize(path)} bytes to {path}")
+
+
+if __name__ == "__main__":
+    main()
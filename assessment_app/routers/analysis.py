@@ -1,36 +1,89 @@
-import csv
+import asyncio
 from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
 
+import numpy as np
 from fastapi import Depends, APIRouter, HTTPException
 from sqlalchemy.orm import Session
 
-from assessment_app.models.constants import StockSymbols
+from assessment_app.models.constants import TRADING_DAYS_IN_YEAR, StockSymbols
+from assessment_app.models.models import (
+    CorrelationRequest, CorrelationResponse, FrontierPoint, OptimizationRequest, Portfolio, PortfolioOptimization,
+    PortfolioRisk, ReturnWindow, ReturnsBatchRequest, ReturnsBatchResponse, RiskEstimate, RollingAnalytics,
+)
 from assessment_app.service.auth_service import get_current_user
-from assessment_app.utils.utils import compute_cagr, datetime_to_str
+from assessment_app.utils.utils import compute_cagr, compute_cagr_from_log_return, datetime_to_str
 from assessment_app.repository.database import get_db
-from assessment_app.service.portfolio_service import get_portfolio_for_user
+from assessment_app.repository.price_panel import PricePanel, price_panels
+from assessment_app.repository.price_store import PriceSeries, price_store, to_day
+from assessment_app.service.analytics import covariance_matrices, daily_log_returns, drawdown, rolling_analytics
+from assessment_app.service.optimizer import efficient_frontier
+from assessment_app.service.portfolio_service import get_portfolio_by_id, get_portfolio_for_user
+from assessment_app.service.executor import cpu_pool, io_pool
+from assessment_app.service.result_cache import analysis_cache, portfolio_tag
+from assessment_app.service.risk import (
+    historical_risk, monte_carlo_chunks, return_distribution, simulate_chunk_losses, tail_risk
+)
 
 
 router = APIRouter()
 
+MAX_BATCH_WINDOWS = 1000000
+MIN_ROLLING_WINDOW = 2
+MAX_SIMULATIONS = 1000000
+MAX_FRONTIER_POINTS = 10000
+# Most symbols x frontier points solved in one optimization, about a second of CPU time
+MAX_FRONTIER_SIZE = 20000
 
 
-def get_stock_data(stock_symbol: str):
-    file_path = f'assessment_app/data/{stock_symbol}.csv'
-    stock_data = []
-    
+
+def get_stock_data(stock_symbol: str) -> PriceSeries:
+    try:
+        return price_store.get(stock_symbol)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Stock data not found")
+
+
+def get_price_panel(stock_symbols: Iterable[str]) -> PricePanel:
     try:
-        with open(file_path, 'r') as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                stock_data.append({
-                    "date": datetime.strptime(row["Date"], "%Y-%m-%d"),
-                    "close": float(row["Close"]),
-                })
+        return price_panels.get(stock_symbols)
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Stock data not found")
+
+
+def get_known_price_panel(stock_symbols: List[str]) -> PricePanel:
+    """
+    Price panel of the given symbols, rejecting (400) any symbol the price store has no data for.
+    """
+    unknown = []
+    for stock_symbol in sorted(set(stock_symbols)):
+        try:
+            price_store.get(stock_symbol)
+        except FileNotFoundError:
+            unknown.append(stock_symbol)
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"No price data for symbols: {', '.join(unknown)}")
+    return get_price_panel(stock_symbols)
+
+
+def holdings_key(portfolio: Portfolio) -> tuple:
+    """
+    Holdings of a portfolio as sorted (symbol, quantity) pairs, for result cache keys.
+    """
+    return tuple(sorted((holding.symbol, holding.quantity) for holding in portfolio.holdings))
+
+
+def compute_stock_cagr(stock_data: PriceSeries, start_ts: datetime, end_ts: datetime) -> float:
+    # Get starting and ending rows as of the start and end timestamps
+    start_row = stock_data.asof(start_ts)
+    end_row = stock_data.asof(end_ts)
+
+    if start_row is None or end_row is None:
+        raise HTTPException(status_code=400, detail="Invalid start or end date")
     
-    return stock_data
+    # Calculate CAGR from two reads of the cumulative log-return table
+    cagr = compute_cagr_from_log_return(float(stock_data.window_log_return(start_row, end_row)), start_ts, end_ts)
+    return cagr
 
 
 @router.get("/analysis/estimate_returns/stock", response_model=float)
@@ -41,22 +94,61 @@ async def get_stock_analysis(stock_symbol: str, start_ts: datetime, end_ts: date
     Example:
         200% CAGR would mean your returned value would be 200 for the duration
         5% CAGR would mean your returned value would be 5 for the duration
+    Prices are the closes of the last trading days at or before the given timestamps.
+    """
+    stock_data = await io_pool.run(get_stock_data, stock_symbol)
+    # Cached per inputs and data version, so a reloaded symbol is never answered from stale prices
+    return await io_pool.run(
+        analysis_cache.get_or_compute, "estimate_returns/stock", (stock_symbol, stock_data.version, start_ts, end_ts),
+        lambda: compute_stock_cagr(stock_data, start_ts, end_ts),
+    )
+
+
+def window_bounds(windows: List[ReturnWindow]):
+    """
+    Start and end timestamps of the windows as naive datetime64 arrays, for vectorized lookups and CAGRs.
+    """
+    starts = np.array([window.start_ts.replace(tzinfo=None) for window in windows], dtype="datetime64[s]")
+    ends = np.array([window.end_ts.replace(tzinfo=None) for window in windows], dtype="datetime64[s]")
+    return starts, ends
+
+
+def compute_window_cagrs(stock_symbol: str, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """
+    CAGR of one stock over many windows, NaN where either end of a window is before the stock's first close.
+
+    The start and end rows of every window are found with one vectorized as-of search over the symbol's dates, and
+    each window's return is the difference of two entries of the cumulative log-return table.
     """
     stock_data = get_stock_data(stock_symbol)
-    
-    # Get starting and ending prices based on start and end timestamps
-    for data in stock_data:
-        if data["date"].date() == start_ts.date():
-            start_price = data["close"]
-        if data["date"].date() == end_ts.date():
-            end_price = data["close"]
-
-    if start_price is None or end_price is None:
-        raise HTTPException(status_code=400, detail="Invalid start or end date")
-    
-    # Calculate CAGR
-    cagr = compute_cagr(start_price, end_price, start_ts, end_ts)
-    return cagr
+    rows = stock_data.asof_keys(np.concatenate([starts, ends]).astype("datetime64[D]").astype(np.int64))
+    start_rows, end_rows = rows[:len(starts)], rows[len(starts):]
+    found = (start_rows >= 0) & (end_rows >= 0)
+
+    cagrs = np.full(len(starts), np.nan)
+    cagrs[found] = compute_cagr_from_log_return(
+        stock_data.window_log_return(start_rows[found], end_rows[found]), starts[found], ends[found],
+    )
+    return cagrs
+
+
+@router.post("/analysis/estimate_returns/stocks", response_model=ReturnsBatchResponse)
+async def get_stocks_analysis(request: ReturnsBatchRequest, current_user_id: str = Depends(get_current_user)) -> ReturnsBatchResponse:
+    """
+    Batch variant of `/analysis/estimate_returns/stock`: CAGR of every requested stock over every requested window.
+    CAGRs follow the same as-of closing price rule; a window starting or ending before the stock's first close,
+    or whose CAGR overflows, gets None in that cell.
+    """
+    if len(request.stock_symbols) * len(request.windows) > MAX_BATCH_WINDOWS:
+        raise HTTPException(status_code=400, detail=f"Batch exceeds {MAX_BATCH_WINDOWS} windows")
+
+    starts, ends = window_bounds(request.windows)
+    cagr = []
+    for stock_symbol in request.stock_symbols:
+        cagrs = await io_pool.run(compute_window_cagrs, stock_symbol, starts, ends)
+        cagr.append([value if np.isfinite(value) else None for value in cagrs.tolist()])
+
+    return ReturnsBatchResponse(stock_symbols=request.stock_symbols, windows=request.windows, cagr=cagr)
 
 
 @router.get("/analysis/estimate_returns/portfolio")
@@ -67,26 +159,334 @@ async def estimate_portfolio_returns(start_ts: datetime, end_ts: datetime, curre
     Example:
         100% CAGR would mean your returned value would be 2.0 for the duration
         5% CAGR would mean your returned value would be 1.05 for the duration
+    Holdings are valued at the closes of the last trading days at or before the given timestamps.
     """
 
-    portfolio = get_portfolio_for_user(current_user_id, db)
-    total_start_value = 0
-    total_end_value = 0
+    portfolio = await io_pool.run(get_portfolio_for_user, current_user_id, db)
+    if not portfolio.holdings:
+        raise HTTPException(status_code=400, detail="Portfolio has no value at the start")
+
+    panel = await io_pool.run(get_price_panel, [holding.symbol for holding in portfolio.holdings])
+    return await io_pool.run(
+        analysis_cache.get_or_compute, "estimate_returns/portfolio",
+        (portfolio.id, holdings_key(portfolio), panel.version, start_ts, end_ts),
+        lambda: compute_portfolio_cagr(portfolio, panel, start_ts, end_ts),
+        portfolio_tag(portfolio.id),
+    )
 
-    for holding in portfolio.holdings:
-        stock_data = get_stock_data(holding.symbol)
-        start_price = next((data["close"] for data in stock_data if data["date"].date() == start_ts.date()), None)
-        end_price = next((data["close"] for data in stock_data if data["date"].date() == end_ts.date()), None)
-        
-        if start_price is None or end_price is None:
-            raise HTTPException(status_code=400, detail="Invalid start or end date for stock")
 
-        # Calculate the total value of the portfolio based on stock holdings
-        total_start_value += holding.quantity * start_price
-        total_end_value += holding.quantity * end_price
+def compute_portfolio_cagr(portfolio: Portfolio, panel: PricePanel, start_ts: datetime, end_ts: datetime) -> float:
+    columns = panel.asof_columns([start_ts, end_ts])
+    if (columns < 0).any():
+        raise HTTPException(status_code=400, detail="Invalid start or end date for stock")
+
+    # Value of the holdings on both dates in one matrix-vector product
+    quantities = panel.quantities((holding.symbol, holding.quantity) for holding in portfolio.holdings)
+    total_start_value, total_end_value = panel.values(quantities, columns).tolist()
+    if np.isnan(total_start_value) or np.isnan(total_end_value):
+        raise HTTPException(status_code=400, detail="Invalid start or end date for stock")
 
     if total_start_value == 0:
         raise HTTPException(status_code=400, detail="Portfolio has no value at the start")
 
     cagr = compute_cagr(total_start_value, total_end_value, start_ts, end_ts)
     return cagr
+
+
+def optional_floats(values: np.ndarray) -> List[Optional[float]]:
+    return [value if np.isfinite(value) else None for value in values.tolist()]
+
+
+def rolling_response(stock_symbol: Optional[str], window: int, dates: np.ndarray, values: np.ndarray,
+                     stats: Dict[str, np.ndarray], start_ts: datetime, end_ts: datetime) -> RollingAnalytics:
+    """
+    Slice full-history rolling statistics to the days between `start_ts` and `end_ts`, and add the drawdown
+    from the running peak within that range.
+    """
+    start = int(np.searchsorted(dates, to_day(start_ts), side="left"))
+    stop = max(start, int(np.searchsorted(dates, to_day(end_ts), side="right")))
+    values = values[start:stop]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        drawdowns = drawdown(values)
+    finite = drawdowns[np.isfinite(drawdowns)]
+    return RollingAnalytics(
+        stock_symbol=stock_symbol,
+        window=window,
+        timestamps=np.datetime_as_string(dates[start:stop].astype("datetime64[D]").astype("datetime64[s]")).tolist(),
+        values=values.tolist(),
+        returns=optional_floats(stats["returns"][start:stop]),
+        volatility=optional_floats(stats["volatility"][start:stop]),
+        drawdown=optional_floats(drawdowns),
+        max_drawdown=float(finite.min()) if len(finite) else 0.0,
+    )
+
+
+def compute_stock_rolling(stock_data: PriceSeries, start_ts: datetime, end_ts: datetime, window: int) -> RollingAnalytics:
+    # Over the full history, so windows reach back before `start_ts`; repeated requests are served by the result cache
+    stats = rolling_analytics(stock_data.close, window)
+    return rolling_response(stock_data.symbol, window, stock_data.dates, stock_data.close, stats, start_ts, end_ts)
+
+
+def compute_portfolio_rolling(portfolio: Portfolio, panel: PricePanel, start_ts: datetime, end_ts: datetime,
+                              window: int) -> RollingAnalytics:
+    """
+    Rolling analytics of the portfolio's value (holding quantities times forward-filled closing prices)
+    from the first day every holding has a price.
+    """
+    values = panel.values(panel.quantities((holding.symbol, holding.quantity) for holding in portfolio.holdings))
+    priced = np.flatnonzero(~np.isnan(values))
+    first = priced[0] if len(priced) else len(values)
+    dates, values = panel.dates[first:], values[first:]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        stats = rolling_analytics(values, window)
+    return rolling_response(None, window, dates, values, stats, start_ts, end_ts)
+
+
+@router.get("/analysis/rolling/stock", response_model=RollingAnalytics)
+async def get_stock_rolling_analysis(stock_symbol: str, start_ts: datetime, end_ts: datetime, window: int = 30,
+                                     current_user_id: str = Depends(get_current_user)) -> RollingAnalytics:
+    """
+    Rolling analytics of a stock's closing prices on every trading day between the given timestamps (both inclusive):
+    return and annualized volatility over the last `window` trading days, and drawdown from the highest close in the range.
+    Windows reach back before `start_ts` when there is earlier data. All values are percentages.
+    """
+    if window < MIN_ROLLING_WINDOW:
+        raise HTTPException(status_code=400, detail=f"Window must be at least {MIN_ROLLING_WINDOW} days")
+    stock_data = await io_pool.run(get_stock_data, stock_symbol)
+    return await io_pool.run(
+        analysis_cache.get_or_compute, "rolling/stock", (stock_symbol, stock_data.version, start_ts, end_ts, window),
+        lambda: compute_stock_rolling(stock_data, start_ts, end_ts, window),
+    )
+
+
+@router.get("/analysis/rolling/portfolio", response_model=RollingAnalytics)
+async def get_portfolio_rolling_analysis(start_ts: datetime, end_ts: datetime, window: int = 30,
+                                         current_user_id: str = Depends(get_current_user), db: Session = Depends(get_db)) -> RollingAnalytics:
+    """
+    Rolling analytics, as for `/analysis/rolling/stock`, of the current portfolio's holdings valued at closing prices.
+    """
+    if window < MIN_ROLLING_WINDOW:
+        raise HTTPException(status_code=400, detail=f"Window must be at least {MIN_ROLLING_WINDOW} days")
+    portfolio = await io_pool.run(get_portfolio_for_user, current_user_id, db)
+    if not portfolio.holdings:
+        raise HTTPException(status_code=400, detail="Portfolio has no holdings")
+    panel = await io_pool.run(get_price_panel, [holding.symbol for holding in portfolio.holdings])
+    return await io_pool.run(
+        analysis_cache.get_or_compute, "rolling/portfolio",
+        (portfolio.id, holdings_key(portfolio), panel.version, start_ts, end_ts, window),
+        lambda: compute_portfolio_rolling(portfolio, panel, start_ts, end_ts, window),
+        portfolio_tag(portfolio.id),
+    )
+
+
+def compute_correlation(panel: PricePanel, start_ts: datetime, end_ts: datetime) -> CorrelationResponse:
+    columns = panel.range_columns(start_ts, end_ts)
+    covariance, correlation, observations = covariance_matrices(panel.close[:, columns])
+    if observations < 2:
+        raise HTTPException(status_code=400, detail="Not enough prices between start and end date")
+    return CorrelationResponse(
+        stock_symbols=list(panel.symbols),
+        start_ts=start_ts,
+        end_ts=end_ts,
+        observations=observations,
+        covariance=[optional_floats(row) for row in covariance],
+        correlation=[optional_floats(row) for row in correlation],
+    )
+
+
+@router.post("/analysis/correlation", response_model=CorrelationResponse)
+async def get_correlation(request: CorrelationRequest, current_user_id: str = Depends(get_current_user)) -> CorrelationResponse:
+    """
+    Covariance and correlation matrices of the daily log returns of the given stocks (default: all StockSymbols)
+    between the given timestamps. Returns are aligned on the trading days of any of the stocks, with prices
+    forward-filled (a stock that did not trade that day has a zero return), from the first day every stock has
+    a price. Symbols are returned sorted.
+    """
+    stock_symbols = request.stock_symbols or [symbol.value for symbol in StockSymbols]
+    panel = await io_pool.run(get_price_panel, stock_symbols)
+    return await io_pool.run(
+        analysis_cache.get_or_compute, "correlation", (panel.symbols, panel.version, request.start_ts, request.end_ts),
+        lambda: compute_correlation(panel, request.start_ts, request.end_ts),
+    )
+
+
+@router.get("/analysis/cache/stats")
+async def get_analysis_cache_stats(current_user_id: str = Depends(get_current_user)) -> dict:
+    """
+    Report analysis result cache usage (entries, evictions, expirations, invalidations) and the hits, misses
+    and hit rate of every cached endpoint.
+    """
+    return analysis_cache.stats()
+
+
+def risk_inputs(portfolio: Portfolio, panel: PricePanel, start_ts: datetime, end_ts: datetime) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Daily log returns of the held symbols between the given timestamps, and the value of each position
+    at the last close in that range.
+    """
+    quantities = panel.quantities((holding.symbol, holding.quantity) for holding in portfolio.holdings)
+    rows = np.flatnonzero(quantities)
+    close = panel.close[rows, panel.range_columns(start_ts, end_ts)]
+    log_returns = daily_log_returns(close)
+    if log_returns.shape[1] < 2:
+        raise HTTPException(status_code=400, detail="Not enough prices between start and end date")
+    return log_returns, quantities[rows] * close[:, -1]
+
+
+async def compute_portfolio_risk(portfolio: Portfolio, panel: PricePanel, start_ts: datetime, end_ts: datetime,
+                                 confidence: float, horizon_days: int, simulations: int, seed: int) -> PortfolioRisk:
+    log_returns, exposures = await io_pool.run(risk_inputs, portfolio, panel, start_ts, end_ts)
+    if log_returns.shape[1] - horizon_days + 1 < 2:
+        raise HTTPException(status_code=400, detail="Not enough prices between start and end date for the horizon")
+    historical = historical_risk(log_returns, exposures, confidence, horizon_days)
+
+    # One task per CPU pool worker, each simulating a contiguous run of chunks; losses are concatenated in
+    # chunk order, so the result for a seed does not depend on how many workers there are
+    mean, factor = return_distribution(log_returns, horizon_days)
+    chunks = monte_carlo_chunks(seed, simulations)
+    bounds = np.linspace(0, len(chunks), min(len(chunks), cpu_pool.max_workers) + 1).astype(int).tolist()
+    losses = await asyncio.gather(*(
+        cpu_pool.run(simulate_chunk_losses, exposures, mean, factor, chunks[start:stop])
+        for start, stop in zip(bounds, bounds[1:])
+    ))
+    monte_carlo = tail_risk(np.concatenate(losses), confidence)
+
+    return PortfolioRisk(
+        start_ts=start_ts,
+        end_ts=end_ts,
+        confidence=confidence,
+        horizon_days=horizon_days,
+        portfolio_value=float(exposures.sum()),
+        observations=log_returns.shape[1],
+        historical=RiskEstimate(value_at_risk=historical[0], expected_shortfall=historical[1]),
+        monte_carlo=RiskEstimate(value_at_risk=monte_carlo[0], expected_shortfall=monte_carlo[1]),
+        simulations=simulations,
+        seed=seed,
+    )
+
+
+@router.get("/analysis/risk/portfolio", response_model=PortfolioRisk)
+async def get_portfolio_risk(start_ts: datetime, end_ts: datetime, confidence: float = 0.95, horizon_days: int = 1,
+                             simulations: int = 100000, seed: Optional[int] = None,
+                             current_user_id: str = Depends(get_current_user), db: Session = Depends(get_db)) -> PortfolioRisk:
+    """
+    Value-at-Risk and Expected Shortfall of the current portfolio over `horizon_days` trading days at the given
+    confidence, from the daily log returns of its holdings between the given timestamps. Losses are positive
+    amounts, against the holdings valued at the last close in the range.
+    Historical simulation revalues the holdings under every past `horizon_days` return; Monte Carlo draws
+    `simulations` correlated normal returns with the same mean and covariance. Monte Carlo results are
+    reproducible for a given `seed` (random when omitted, and returned in the response). Only results for
+    a given seed are cached.
+    """
+    if not 0 < confidence < 1:
+        raise HTTPException(status_code=400, detail="Confidence must be between 0 and 1")
+    if horizon_days < 1:
+        raise HTTPException(status_code=400, detail="Horizon must be at least 1 day")
+    if not 1 <= simulations <= MAX_SIMULATIONS:
+        raise HTTPException(status_code=400, detail=f"Simulations must be between 1 and {MAX_SIMULATIONS}")
+    if seed is not None and seed < 0:
+        raise HTTPException(status_code=400, detail="Seed must not be negative")
+
+    portfolio = await io_pool.run(get_portfolio_for_user, current_user_id, db)
+    if not portfolio.holdings:
+        raise HTTPException(status_code=400, detail="Portfolio has no holdings")
+    panel = await io_pool.run(get_price_panel, [holding.symbol for holding in portfolio.holdings])
+
+    if seed is None:
+        # A fresh random seed could never be asked for again, so the result is not cached
+        seed = int(np.random.SeedSequence().entropy)
+        return await compute_portfolio_risk(portfolio, panel, start_ts, end_ts, confidence, horizon_days, simulations, seed)
+    key = (portfolio.id, holdings_key(portfolio), panel.version, start_ts, end_ts, confidence, horizon_days, simulations, seed)
+    risk = analysis_cache.get("risk/portfolio", key)
+    if risk is None:
+        risk = await compute_portfolio_risk(portfolio, panel, start_ts, end_ts, confidence, horizon_days, simulations, seed)
+        analysis_cache.put("risk/portfolio", key, risk, portfolio_tag(portfolio.id))
+    return risk
+
+
+def frontier_point(weights: np.ndarray, expected_return: float, volatility: float) -> FrontierPoint:
+    return FrontierPoint(expected_return=expected_return * 100, volatility=volatility * 100, weights=weights.tolist())
+
+
+async def compute_portfolio_optimization(portfolio: Portfolio, panel: PricePanel,
+                                         request: OptimizationRequest) -> PortfolioOptimization:
+    columns = panel.range_columns(request.start_ts, request.end_ts)
+    returns = np.expm1(daily_log_returns(panel.close[:, columns]))
+    observations = returns.shape[1]
+    if observations < 2:
+        raise HTTPException(status_code=400, detail="Not enough prices between start and end date")
+
+    # Annualized from the daily returns in one pass over the aligned panel
+    mean = returns.mean(axis=1) * TRADING_DAYS_IN_YEAR
+    covariance = np.atleast_2d(np.cov(returns)) * TRADING_DAYS_IN_YEAR
+    weights, expected_returns, volatility = await cpu_pool.run(
+        efficient_frontier, mean, covariance, request.min_weight, request.max_weight, request.frontier_points,
+    )
+    frontier = [frontier_point(*point) for point in zip(weights, expected_returns.tolist(), volatility.tolist())]
+
+    sharpe_ratio = None
+    optimal = int(np.argmax(expected_returns))
+    if (volatility > 0).any():
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sharpe = np.where(volatility > 0, (expected_returns - request.risk_free_rate / 100) / volatility, -np.inf)
+        optimal = int(np.argmax(sharpe))
+        sharpe_ratio = float(sharpe[optimal])
+
+    current = None
+    values = panel.quantities((holding.symbol, holding.quantity) for holding in portfolio.holdings) * panel.close[:, columns][:, -1]
+    if values.sum() > 0:
+        current_weights = values / values.sum()
+        current = frontier_point(current_weights, float(current_weights @ mean),
+                                 float(np.sqrt(max(current_weights @ covariance @ current_weights, 0.0))))
+
+    return PortfolioOptimization(
+        portfolio_id=portfolio.id,
+        stock_symbols=list(panel.symbols),
+        start_ts=request.start_ts,
+        end_ts=request.end_ts,
+        observations=observations,
+        optimal=frontier[optimal],
+        sharpe_ratio=sharpe_ratio,
+        min_variance=frontier[0],
+        current=current,
+        frontier=frontier,
+    )
+
+
+@router.post("/analysis/optimize/portfolio", response_model=PortfolioOptimization)
+async def optimize_portfolio(request: OptimizationRequest, current_user_id: str = Depends(get_current_user),
+                             db: Session = Depends(get_db)) -> PortfolioOptimization:
+    """
+    Mean-variance optimization over the symbols held in the given portfolio, from their daily returns between
+    the given timestamps. Weights are fully invested (they sum to 1) and bounded by min_weight and max_weight.
+    Returns a sampled efficient frontier from the minimum variance portfolio to the highest expected return,
+    the frontier point with the highest Sharpe ratio as the optimal weights, and the holdings' current weights.
+    Portfolios holding symbols without price data are rejected, and so are requests with more than
+    MAX_FRONTIER_SIZE symbols x frontier points.
+    """
+    if not 2 <= request.frontier_points <= MAX_FRONTIER_POINTS:
+        raise HTTPException(status_code=400, detail=f"Frontier points must be between 2 and {MAX_FRONTIER_POINTS}")
+    if request.min_weight > request.max_weight:
+        raise HTTPException(status_code=400, detail="min_weight must not exceed max_weight")
+
+    portfolio = await io_pool.run(get_portfolio_by_id, request.portfolio_id, current_user_id, db)
+    if not portfolio.holdings:
+        raise HTTPException(status_code=400, detail="Portfolio has no holdings")
+    panel = await io_pool.run(get_known_price_panel, [holding.symbol for holding in portfolio.holdings])
+    symbols = len(panel.symbols)
+    if symbols * request.min_weight > 1 or symbols * request.max_weight < 1:
+        raise HTTPException(status_code=400, detail=f"Weight bounds cannot be met by {symbols} symbols")
+    if symbols * request.frontier_points > MAX_FRONTIER_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Symbols x frontier points must not exceed {MAX_FRONTIER_SIZE}, use at most "
+                   f"{MAX_FRONTIER_SIZE // symbols} points for {symbols} symbols"
+        )
+
+    key = (portfolio.id, holdings_key(portfolio), panel.version, request.start_ts, request.end_ts,
+           request.min_weight, request.max_weight, request.risk_free_rate, request.frontier_points)
+    optimization = analysis_cache.get("optimize/portfolio", key)
+    if optimization is None:
+        optimization = await compute_portfolio_optimization(portfolio, panel, request)
+        analysis_cache.put("optimize/portfolio", key, optimization, portfolio_tag(portfolio.id))
+    return optimization
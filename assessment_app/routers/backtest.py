@@ -1,108 +1,95 @@
-from datetime import datetime
-from typing import List
+import asyncio
+import json
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
 from fastapi import APIRouter, HTTPException, Depends
-import pandas as pd
+from fastapi.responses import StreamingResponse
+import numpy as np
+from sqlalchemy import or_
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import Session
 
-from assessment_app.models.models import BacktestRequest, BacktestResponse, Trade
-from assessment_app.models.schema import PortfolioORM
+from assessment_app.models.constants import JobStatus, TradeType
+from assessment_app.models.models import (
+    BacktestJob, BacktestProgress, BacktestRequest, BacktestResponse, SweepRequest, SweepResponse, SweepResult, Trade
+)
+from assessment_app.models.schema import BacktestJobORM, PortfolioORM
 from assessment_app.service.auth_service import get_current_user
 from assessment_app.utils.utils import compute_cagr
-from assessment_app.repository.database import get_db
+from assessment_app.repository.database import engine, get_db
+from assessment_app.repository.intraday_store import bars_between
+from assessment_app.repository.price_store import is_valid_symbol
+from assessment_app.service.backtest_engine import LOT, portfolio_signals, simulate_holding, simulate_portfolio
+from assessment_app.service.executor import cpu_pool, io_pool
+from assessment_app.service.jobs import (
+    BACKTEST_JOB_LEASE_SECONDS, BACKTEST_JOB_MAX_QUEUE, BACKTEST_JOB_WORKERS, WORKER_ID, JobRunner
+)
+from assessment_app.service.progress import BACKTEST_PROGRESS_BARS, ProgressChannel
+from assessment_app.service.result_cache import analysis_cache, portfolio_tag
+from assessment_app.service.strategies import StrategySpec, get_strategy
+from assessment_app.service.sweep import MAX_SWEEP_RUNS, SharedPrices, parameter_grid, run_sweep_chunk
+from assessment_app.service.valuation import net_worth_cache
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-@router.post("/backtest", response_model=BacktestResponse)
-async def backtest_strategy(
-    request: BacktestRequest,
-    db: Session = Depends(get_db),
-    current_user_id: str = Depends(get_current_user)
-) -> BacktestResponse:
+def load_backtest_inputs(portfolio_id: str, start_date: datetime, end_date: datetime, db: Session, current_user_id: str):
     """
-    Backtest a trading strategy over a specified period, buying/selling stocks
-    based on holdings in the given portfolio.
+    Load the portfolio, its holdings and their bars for the backtest period (blocking database and file I/O).
+    Holdings without price data are skipped; a holding whose symbol cannot name a data file is rejected with 400.
     """
-    
-    # Load portfolio from the database
-    portfolio = db.query(PortfolioORM).filter(PortfolioORM.id == request.portfolio_id, PortfolioORM.user_id == current_user_id).first()
+    portfolio = db.query(PortfolioORM).filter(PortfolioORM.id == portfolio_id, PortfolioORM.user_id == current_user_id).first()
     if not portfolio:
         raise HTTPException(status_code=404, detail="Portfolio not found")
 
-    # Load portfolio holdings
     holdings = portfolio.holdings
     if not holdings:
         raise HTTPException(status_code=404, detail="No holdings found for the portfolio")
 
-    # Load stock data
-    stock_data_files = {
-        'HDFCBANK': 'assessment_app/data/HDFCBANK.csv',
-        'ICICIBANK': 'assessment_app/data/ICICIBANK.csv',
-        'RELIANCE': 'assessment_app/data/RELIANCE.csv',
-        'TATAMOTORS': 'assessment_app/data/TATAMOTORS.csv'
-    }
+    invalid = [holding.symbol for holding in holdings if not is_valid_symbol(holding.symbol)]
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"Invalid stock symbols: {', '.join(invalid)}")
 
-    # Initialize backtest variables
-    capital = request.initial_capital
-    trades = []
-    
+    holdings_data = []
     for holding in holdings:
-        stock_symbol = holding.symbol
-        if stock_symbol not in stock_data_files:
-            continue
-        
-        file_path = stock_data_files[stock_symbol]
         try:
-            df = pd.read_csv(file_path)
-            df['Date'] = pd.to_datetime(df['Date']).dt.date
+            # Daily bars for the backtest period, or intraday bars when the period has times of day
+            holdings_data.append((holding, bars_between(holding.symbol, start_date, end_date)))
         except FileNotFoundError:
             continue
+    return portfolio, holdings_data
+
+
+def simulation_inputs(holdings_data) -> list:
+    """
+    (opens, closes, quantity) of every holding, as `simulate_portfolio` takes them.
+    """
+    return [(stock_data.open, stock_data.close, holding.quantity) for holding, stock_data in holdings_data]
 
-        # Filter data for the backtest period
-        df = df[(df['Date'] >= request.start_date.date()) & (df['Date'] <= request.end_date.date())]
-        
-        if df.empty:
-            continue
 
-        # Simulate trading based on the strategy (mock implementation)
-        for index, row in df.iterrows():
-            if capital <= 0:
-                break
-
-            # Example trade logic
-            if row['Close'] < row['Open']:
-                # Assume we buy 100 units of stock when price is lower
-                quantity = 100
-                cost = quantity * row['Close']
-                if capital >= cost:
-                    capital -= cost
-                    # Update holdings for the portfolio
-                    holding.quantity += quantity
-                    trades.append(Trade(
-                        symbol=stock_symbol,
-                        price=row['Close'],
-                        quantity=quantity,
-                        type='BUY',
-                        execution_ts=row['Date']
-                    ))
-            
-            elif row['Close'] > row['Open'] and holding.quantity >= 100:
-                # Assume we sell 100 units of stock when price is higher
-                quantity = 100
-                revenue = quantity * row['Close']
-                capital += revenue
-                # Update holdings for the portfolio
-                holding.quantity -= quantity
-                trades.append(Trade(
-                    symbol=stock_symbol,
-                    price=row['Close'],
-                    quantity=quantity,
-                    type='SELL',
-                    execution_ts=row['Date']
-                ))
+def apply_backtest(request: BacktestRequest, portfolio: PortfolioORM, holdings_data, simulation) -> BacktestResponse:
+    """
+    Apply the result of `simulate_portfolio` to the portfolio and its holdings (without committing) and build
+    the backtest response.
+    """
+    capital, quantities, fills = simulation
+    trades = []
+    for (holding, stock_data), quantity, holding_fills in zip(holdings_data, quantities, fills):
+        # Update holdings for the portfolio
+        holding.quantity = quantity
+        rows, buys = holding_fills
+        trades.extend(
+            Trade(symbol=holding.symbol, price=price, quantity=LOT,
+                  type=TradeType.BUY.value if buy else TradeType.SELL.value, execution_ts=execution_ts)
+            for price, buy, execution_ts in zip(stock_data.close[rows].tolist(), buys.tolist(),
+                                                stock_data.datetimes(rows))
+        )
 
     # Update the portfolio's cash remaining
     portfolio.cash_remaining = capital
-    db.commit()
 
     # Calculate profit/loss as final capital minus initial capital
     final_capital = capital
@@ -122,3 +109,537 @@ async def backtest_strategy(
         profit_loss=profit_loss,
         annualized_return=annualized_return
     )
+
+
+def backtest_committed(portfolio_id: str) -> None:
+    """
+    Drop what is cached about a portfolio once a backtest's changes to it are committed.
+    """
+    analysis_cache.invalidate(portfolio_tag(portfolio_id))
+    # Holdings changed, so the next net-worth poll reloads the portfolio
+    net_worth_cache.invalidate(portfolio_id)
+
+
+def commit_backtest(db: Session, portfolio_id: str) -> None:
+    """
+    Commit a backtest's changes to the portfolio and drop what is cached about it, in one blocking call.
+    """
+    db.commit()
+    backtest_committed(portfolio_id)
+
+
+@router.post("/backtest", response_model=BacktestResponse)
+async def backtest_strategy(
+    request: BacktestRequest,
+    db: Session = Depends(get_db),
+    current_user_id: str = Depends(get_current_user)
+) -> BacktestResponse:
+    """
+    Backtest a trading strategy over a specified period, buying/selling stocks
+    based on holdings in the given portfolio.
+    The strategy is looked up in the strategy registry and run with its default parameters, overridden by request.parameters.
+    Data loading runs on the I/O pool and the simulation on the CPU (process) pool, so the event loop stays free.
+    """
+    strategy = get_strategy(request.strategy_id)
+    parameters = strategy.resolve(request.parameters)
+
+    # Load portfolio, holdings and stock data
+    portfolio, holdings_data = await io_pool.run(
+        load_backtest_inputs, request.portfolio_id, request.start_date, request.end_date, db, current_user_id
+    )
+
+    # Simulate trading on the strategy's signals
+    simulation = await cpu_pool.run(
+        simulate_portfolio, simulation_inputs(holdings_data), request.initial_capital, strategy.signals, parameters
+    )
+    response = apply_backtest(request, portfolio, holdings_data, simulation)
+    await io_pool.run(db.commit)
+    backtest_committed(portfolio.id)
+    return response
+
+
+async def simulate_with_progress(request: BacktestRequest, strategy: StrategySpec, parameters: Dict[str, float],
+                                 holdings_data, channel: ProgressChannel):
+    """
+    `simulate_portfolio` run as segments of BACKTEST_PROGRESS_BARS bars on the CPU pool, publishing a progress
+    message after each. Segments carry over cash and units, so the result is the same as in one call.
+    """
+    signals = await cpu_pool.run(
+        portfolio_signals, [(stock_data.open, stock_data.close) for _, stock_data in holdings_data],
+        strategy.signals, parameters
+    )
+    total_bars = max(1, sum(len(stock_data) for _, stock_data in holdings_data))
+    # Value of every holding at the last bar simulated for it, or at its first bar until then
+    values = [holding.quantity * float(stock_data.close[0]) if len(stock_data) else 0.0
+              for holding, stock_data in holdings_data]
+    capital = request.initial_capital
+    quantities, fills = [], []
+    done = trades = 0
+    for index, ((holding, stock_data), (buys, sells)) in enumerate(zip(holdings_data, signals)):
+        quantity = holding.quantity
+        rows, fill_buys = [], []
+        for start in range(0, len(stock_data), BACKTEST_PROGRESS_BARS):
+            stop = min(start + BACKTEST_PROGRESS_BARS, len(stock_data))
+            capital, quantity, (segment_rows, segment_buys) = await cpu_pool.run(
+                simulate_holding, buys[start:stop], sells[start:stop], stock_data.close[start:stop], capital, quantity
+            )
+            rows.append(segment_rows + start)
+            fill_buys.append(segment_buys)
+            done += stop - start
+            trades += len(segment_rows)
+            values[index] = quantity * float(stock_data.close[stop - 1])
+            channel.publish("progress", BacktestProgress(
+                percent=100.0 * done / total_bars,
+                symbol=holding.symbol,
+                current_date=stock_data.timestamp(int(stock_data.dates[stop - 1])),
+                capital=capital,
+                trades=trades,
+                equity=capital + sum(values),
+            ))
+        quantities.append(quantity)
+        fills.append((np.concatenate(rows) if rows else np.empty(0, dtype=np.int64),
+                      np.concatenate(fill_buys) if fill_buys else np.empty(0, dtype=bool)))
+    return capital, quantities, fills
+
+
+async def run_streamed_backtest(request: BacktestRequest, strategy: StrategySpec, parameters: Dict[str, float],
+                                db: Session, portfolio: PortfolioORM, holdings_data, channel: ProgressChannel) -> None:
+    """
+    Run a streamed backtest, apply it to the portfolio and close the channel with its result (or error).
+    Owns `db` and closes it.
+
+    Once the commit has started it is shielded from cancellation (the client going away): it runs to the
+    end together with the cache invalidation, and `db` is only closed after it.
+    """
+    committing = None
+    try:
+        simulation = await simulate_with_progress(request, strategy, parameters, holdings_data, channel)
+        response = apply_backtest(request, portfolio, holdings_data, simulation)
+        committing = asyncio.ensure_future(io_pool.run(commit_backtest, db, portfolio.id))
+        await asyncio.shield(committing)
+        channel.close("result", response)
+    except HTTPException as exc:
+        channel.close("error", {"status_code": exc.status_code, "detail": exc.detail})
+    except Exception as exc:
+        logger.exception("Streamed backtest of portfolio %s failed", portfolio.id)
+        channel.close("error", {"status_code": 500, "detail": repr(exc)})
+    finally:
+        if committing is not None and not committing.done():
+            # Cancelled while committing
+            await asyncio.wait([committing])
+            if committing.exception() is not None:
+                logger.error("Committing the streamed backtest of portfolio %s failed", portfolio.id,
+                             exc_info=committing.exception())
+        await io_pool.run(db.close)
+
+
+def load_streamed_inputs(portfolio_id: str, start_date: datetime, end_date: datetime, db: Session,
+                         current_user_id: str):
+    """
+    `load_backtest_inputs`, then end the read transaction, releasing its connection.
+    """
+    inputs = load_backtest_inputs(portfolio_id, start_date, end_date, db, current_user_id)
+    db.commit()
+    return inputs
+
+
+async def server_sent_events(channel: ProgressChannel, producer: asyncio.Task):
+    """
+    Format the channel's messages as Server-Sent Events; stops the producer if the client goes away first.
+    """
+    try:
+        async for event, data, dropped in channel.messages():
+            if isinstance(data, BacktestProgress):
+                data = data.model_copy(update={"dropped": dropped})
+            payload = data.model_dump_json() if hasattr(data, "model_dump_json") else json.dumps(data)
+            yield f"event: {event}\ndata: {payload}\n\n"
+    finally:
+        producer.cancel()
+
+
+@router.post("/backtest/stream")
+async def stream_backtest(
+    request: BacktestRequest,
+    db: Session = Depends(get_db),
+    current_user_id: str = Depends(get_current_user)
+) -> StreamingResponse:
+    """
+    Streaming variant of /backtest, as Server-Sent Events: a `progress` event (BacktestProgress) every
+    BACKTEST_PROGRESS_BARS bars simulated, then one `result` event (BacktestResponse) or `error` event.
+
+    The simulation runs as a background task publishing to a bounded ProgressChannel, so a slow client never
+    slows it down or makes the server buffer more than PROGRESS_MAX_PENDING messages: older progress messages
+    are dropped and counted instead. The portfolio is updated once the whole backtest has run; a client that
+    disconnects earlier abandons it.
+
+    The background task outlives the request's session, so it gets its own. Its read transaction ends once the
+    inputs are loaded, so no pooled connection is held while the backtest runs; the loaded portfolio and holdings
+    are kept as they are (not expired) and written back in a new transaction.
+    """
+    strategy = get_strategy(request.strategy_id)
+    parameters = strategy.resolve(request.parameters)
+    stream_db = Session(bind=db.get_bind(), autoflush=False, expire_on_commit=False)
+    try:
+        portfolio, holdings_data = await io_pool.run(
+            load_streamed_inputs, request.portfolio_id, request.start_date, request.end_date, stream_db, current_user_id
+        )
+    except BaseException:
+        await io_pool.run(stream_db.close)
+        raise
+
+    channel = ProgressChannel()
+    producer = asyncio.create_task(
+        run_streamed_backtest(request, strategy, parameters, stream_db, portfolio, holdings_data, channel)
+    )
+    return StreamingResponse(server_sent_events(channel, producer), media_type="text/event-stream")
+
+
+@router.post("/backtest/sweep", response_model=SweepResponse)
+async def sweep_backtests(
+    request: SweepRequest,
+    db: Session = Depends(get_db),
+    current_user_id: str = Depends(get_current_user)
+) -> SweepResponse:
+    """
+    Backtest a strategy for every combination of the given parameter values over every given period, and rank
+    the runs by annualized return. The portfolio is left unchanged.
+
+    The holdings' bars for the whole span of the periods are loaded once and placed in shared memory, and the
+    runs are split into one interleaved chunk per CPU pool worker, so workers neither reload nor unpickle prices.
+    """
+    strategy = get_strategy(request.strategy_id)
+    parameter_sets = parameter_grid(strategy, request.parameters)
+    if not request.periods:
+        raise HTTPException(status_code=400, detail="No periods given")
+    if len(parameter_sets) * len(request.periods) > MAX_SWEEP_RUNS:
+        raise HTTPException(status_code=400, detail=f"A sweep runs at most {MAX_SWEEP_RUNS} backtests")
+    if request.top is not None and request.top < 1:
+        raise HTTPException(status_code=400, detail="top must be at least 1")
+
+    span_start = min(period.start_date for period in request.periods)
+    span_end = max(period.end_date for period in request.periods)
+    _, holdings_data = await io_pool.run(
+        load_backtest_inputs, request.portfolio_id, span_start, span_end, db, current_user_id
+    )
+    quantities = [holding.quantity for holding, _ in holdings_data]
+    # Bar rows of every holding in every period
+    period_rows = []
+    for period in request.periods:
+        slices = [stock_data.range_slice(period.start_date, period.end_date) for _, stock_data in holdings_data]
+        period_rows.append([(rows.start, rows.stop) for rows in slices])
+    runs = [(parameters, period) for parameters in parameter_sets for period in range(len(request.periods))]
+
+    chunks = max(1, min(len(runs), cpu_pool.max_workers))
+    with SharedPrices([(stock_data.open, stock_data.close) for _, stock_data in holdings_data]) as prices:
+        chunk_results = await asyncio.gather(*(
+            cpu_pool.run(
+                run_sweep_chunk, prices.handle, quantities, request.initial_capital, strategy.signals,
+                [(parameters, period_rows[period]) for parameters, period in runs[chunk::chunks]],
+            )
+            for chunk in range(chunks)
+        ))
+    results = [None] * len(runs)
+    for chunk, chunk_result in enumerate(chunk_results):
+        results[chunk::chunks] = chunk_result
+
+    annualized_return = np.array([
+        compute_cagr(request.initial_capital, capital, request.periods[period].start_date, request.periods[period].end_date)
+        for (capital, _), (_, period) in zip(results, runs)
+    ])
+    ranking = np.argsort(-annualized_return, kind="stable")[:request.top]
+
+    return SweepResponse(
+        strategy_id=strategy.id,
+        portfolio_id=request.portfolio_id,
+        initial_capital=request.initial_capital,
+        runs=len(runs),
+        results=[
+            SweepResult(
+                rank=rank,
+                parameters=runs[index][0],
+                start_date=request.periods[runs[index][1]].start_date,
+                end_date=request.periods[runs[index][1]].end_date,
+                final_capital=results[index][0],
+                profit_loss=results[index][0] - request.initial_capital,
+                annualized_return=float(annualized_return[index]),
+                trades=results[index][1],
+            )
+            for rank, index in enumerate(ranking.tolist(), start=1)
+        ],
+    )
+
+
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def job_response(job: BacktestJobORM) -> BacktestJob:
+    return BacktestJob(
+        id=job.id,
+        status=job.status,
+        request=job.request,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+        result=job.result,
+        error=job.error,
+    )
+
+
+def lock_job(db: Session, job_id: str) -> Optional[BacktestJobORM]:
+    """
+    Read a job with its row locked (SELECT ... FOR UPDATE) until the transaction ends, so that cancelling
+    and finishing a job are serialized.
+    """
+    return db.query(BacktestJobORM).filter(BacktestJobORM.id == job_id).with_for_update().populate_existing().first()
+
+
+def finish_job(db: Session, job_id: str, status: JobStatus, error: Optional[str] = None) -> None:
+    """
+    Roll back whatever the job changed and record how it ended, unless this process no longer holds the job's
+    lease: a job taken over by another process is finished by that process.
+    """
+    db.rollback()
+    db.query(BacktestJobORM).filter(
+        BacktestJobORM.id == job_id,
+        BacktestJobORM.status == JobStatus.RUNNING.value,
+        BacktestJobORM.owner == WORKER_ID,
+    ).update(
+        {BacktestJobORM.status: status.value, BacktestJobORM.error: error, BacktestJobORM.finished_at: utc_now()},
+        synchronize_session=False,
+    )
+    db.commit()
+
+
+def renew_lease(bind: Engine, job_id: str) -> None:
+    """
+    Record that this process is still running job `job_id`, in a transaction of its own.
+    """
+    db = Session(bind=bind, autoflush=False)
+    try:
+        db.query(BacktestJobORM).filter(BacktestJobORM.id == job_id, BacktestJobORM.owner == WORKER_ID).update(
+            {BacktestJobORM.heartbeat_at: utc_now()}, synchronize_session=False
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+def run_backtest_job(job_id: str, bind: Engine = engine) -> None:
+    """
+    Run a queued backtest job in a worker thread of the job runner, with its own database session on `bind`
+    (the database of the request that submitted it).
+
+    The job is claimed under a row lock, recording this process as its owner, and its lease is renewed while
+    it simulates. The portfolio's changes and the job's result are committed in one transaction, and only if
+    this process still owns the job, so a job taken over after its lease expired (see `reclaim_backtest_jobs`)
+    is applied at most once. A job cancelled while it ran is rolled back instead.
+    """
+    db = Session(bind=bind, autoflush=False)
+    try:
+        job = lock_job(db, job_id)
+        if job is None or job.status != JobStatus.QUEUED.value:
+            # Cancelled before it started (or already taken)
+            db.rollback()
+            return
+        job.status = JobStatus.RUNNING.value
+        job.owner = WORKER_ID
+        job.started_at = job.heartbeat_at = utc_now()
+        db.commit()
+        request = BacktestRequest.model_validate(job.request)
+
+        try:
+            strategy = get_strategy(request.strategy_id)
+            parameters = strategy.resolve(request.parameters)
+            portfolio, holdings_data = load_backtest_inputs(
+                request.portfolio_id, request.start_date, request.end_date, db, job.user_id
+            )
+            # Job threads bound their own concurrency, so they use the CPU pool's processes without its backlog limit
+            simulating = cpu_pool.executor.submit(
+                simulate_portfolio, simulation_inputs(holdings_data), request.initial_capital, strategy.signals, parameters
+            )
+            while True:
+                try:
+                    simulation = simulating.result(timeout=BACKTEST_JOB_LEASE_SECONDS / 3)
+                    break
+                except TimeoutError:
+                    renew_lease(bind, job_id)
+            response = apply_backtest(request, portfolio, holdings_data, simulation)
+        except HTTPException as exc:
+            finish_job(db, job_id, JobStatus.FAILED, str(exc.detail))
+            return
+        except Exception as exc:
+            logger.exception("Backtest job %s failed", job_id)
+            finish_job(db, job_id, JobStatus.FAILED, repr(exc))
+            return
+
+        job = lock_job(db, job_id)
+        if job.status != JobStatus.RUNNING.value or job.owner != WORKER_ID:
+            # The lease expired and the job was taken over
+            db.rollback()
+            return
+        if job.cancel_requested:
+            finish_job(db, job_id, JobStatus.CANCELLED)
+            return
+        job.status = JobStatus.SUCCEEDED.value
+        job.result = response.model_dump(mode="json")
+        job.finished_at = utc_now()
+        db.commit()
+        backtest_committed(request.portfolio_id)
+    finally:
+        db.close()
+
+
+backtest_jobs = JobRunner("backtest_jobs", run_backtest_job, BACKTEST_JOB_WORKERS, BACKTEST_JOB_MAX_QUEUE)
+_jobs_started = threading.Lock()
+_jobs_ready = False
+
+
+def reclaim_backtest_jobs(bind: Engine = engine) -> List[str]:
+    """
+    Requeue the running jobs whose lease expired, i.e. whose process stopped or lost contact, and return their
+    ids. Rows are locked and skipped if another process is reclaiming them, so each is requeued once.
+    """
+    stale = datetime.now(timezone.utc) - timedelta(seconds=BACKTEST_JOB_LEASE_SECONDS)
+    db = Session(bind=bind, autoflush=False)
+    try:
+        jobs = db.query(BacktestJobORM).filter(
+            BacktestJobORM.status == JobStatus.RUNNING.value,
+            or_(BacktestJobORM.heartbeat_at.is_(None), BacktestJobORM.heartbeat_at < stale),
+        ).order_by(BacktestJobORM.created_at).with_for_update(skip_locked=True).all()
+        for job in jobs:
+            logger.warning("Requeueing backtest job %s, whose lease held by %s expired", job.id, job.owner)
+            job.status = JobStatus.QUEUED.value
+            job.owner = job.started_at = job.heartbeat_at = None
+        db.commit()
+        return [job.id for job in jobs]
+    finally:
+        db.close()
+
+
+def start_backtest_jobs(bind: Engine = engine) -> None:
+    """
+    Submit the queued jobs, and the running jobs whose lease expired, left by earlier runs of the app.
+    Runs once, at startup or on the first job request; `reclaim_expired_jobs` then takes over expired
+    leases periodically. Several processes may do this at once: a job is only run by the one that claims it.
+    """
+    global _jobs_ready
+    with _jobs_started:
+        if _jobs_ready:
+            return
+        reclaim_backtest_jobs(bind)
+        db = Session(bind=bind, autoflush=False)
+        try:
+            job_ids = [job_id for job_id, in db.query(BacktestJobORM.id).filter(
+                BacktestJobORM.status == JobStatus.QUEUED.value
+            ).order_by(BacktestJobORM.created_at)]
+        finally:
+            db.close()
+        _jobs_ready = True
+    for job_id in job_ids:
+        backtest_jobs.submit(job_id, bind, bounded=False)
+
+
+async def reclaim_expired_jobs(bind: Engine = engine) -> None:
+    """
+    Every BACKTEST_JOB_LEASE_SECONDS, requeue and submit the running jobs whose lease expired. Runs for the
+    lifetime of the app.
+    """
+    while True:
+        await asyncio.sleep(BACKTEST_JOB_LEASE_SECONDS)
+        try:
+            job_ids = await io_pool.run(reclaim_backtest_jobs, bind)
+        except Exception:
+            logger.exception("Reclaiming expired backtest jobs failed")
+            continue
+        for job_id in job_ids:
+            backtest_jobs.submit(job_id, bind, bounded=False)
+
+
+def create_backtest_job(request: BacktestRequest, db: Session, current_user_id: str) -> BacktestJob:
+    start_backtest_jobs(db.get_bind())
+    portfolio = db.query(PortfolioORM).filter(PortfolioORM.id == request.portfolio_id, PortfolioORM.user_id == current_user_id).first()
+    if not portfolio:
+        raise HTTPException(status_code=404, detail="Portfolio not found")
+    job = BacktestJobORM(
+        user_id=current_user_id,
+        portfolio_id=request.portfolio_id,
+        status=JobStatus.QUEUED.value,
+        cancel_requested=False,
+        request=request.model_dump(mode="json"),
+        created_at=utc_now(),
+    )
+    db.add(job)
+    db.commit()
+    return job_response(job)
+
+
+def delete_backtest_job(job_id: str, db: Session) -> None:
+    db.query(BacktestJobORM).filter(BacktestJobORM.id == job_id).delete(synchronize_session=False)
+    db.commit()
+
+
+def read_backtest_job(job_id: str, db: Session, current_user_id: str, cancel: bool = False) -> BacktestJob:
+    start_backtest_jobs(db.get_bind())
+    query = db.query(BacktestJobORM).filter(BacktestJobORM.id == job_id, BacktestJobORM.user_id == current_user_id)
+    job = (query.with_for_update() if cancel else query).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if cancel and job.status in (JobStatus.QUEUED.value, JobStatus.RUNNING.value):
+        job.cancel_requested = True
+        if job.status == JobStatus.QUEUED.value:
+            job.status = JobStatus.CANCELLED.value
+            job.finished_at = utc_now()
+    response = job_response(job)
+    db.commit()
+    return response
+
+
+@router.post("/backtest/jobs", response_model=BacktestJob, status_code=202)
+async def submit_backtest_job(
+    request: BacktestRequest,
+    db: Session = Depends(get_db),
+    current_user_id: str = Depends(get_current_user)
+) -> BacktestJob:
+    """
+    Queue a backtest (see /backtest) and return its job at once; poll /backtest/jobs/{job_id} for its result.
+    Jobs run on a bounded pool of background workers and their state is kept in the database.
+    """
+    strategy = get_strategy(request.strategy_id)
+    strategy.resolve(request.parameters)
+    backtest_jobs.check_capacity()
+    job = await io_pool.run(create_backtest_job, request, db, current_user_id)
+    try:
+        backtest_jobs.submit(job.id, db.get_bind())
+    except HTTPException:
+        # The queue filled up since the early check; the rejected job is not kept
+        await io_pool.run(delete_backtest_job, job.id, db)
+        raise
+    return job
+
+
+@router.get("/backtest/jobs/{job_id}", response_model=BacktestJob)
+async def get_backtest_job(
+    job_id: str,
+    db: Session = Depends(get_db),
+    current_user_id: str = Depends(get_current_user)
+) -> BacktestJob:
+    """
+    Status of a backtest job, with its result once it succeeded or its error if it failed.
+    """
+    return await io_pool.run(read_backtest_job, job_id, db, current_user_id)
+
+
+@router.post("/backtest/jobs/{job_id}/cancel", response_model=BacktestJob)
+async def cancel_backtest_job(
+    job_id: str,
+    db: Session = Depends(get_db),
+    current_user_id: str = Depends(get_current_user)
+) -> BacktestJob:
+    """
+    Cancel a backtest job. A queued job is cancelled at once; a running job stays RUNNING until its worker
+    rolls it back and marks it CANCELLED. Finished jobs are returned unchanged.
+    """
+    job = await io_pool.run(read_backtest_job, job_id, db, current_user_id, True)
+    backtest_jobs.cancel(job_id)
+    return job
@@ -1,30 +1,77 @@
-import csv
+import json
 from datetime import datetime
-from typing import List
+from typing import Iterator, List, Optional, Tuple, Union
 
-import pandas as pd
+import numpy as np
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from assessment_app.models.models import TickData
+from assessment_app.models.constants import BarInterval, StreamFormat
+from assessment_app.models.models import Bar, TickBatchRequest, TickBatchResponse, TickData
 from assessment_app.models.models import Trade
 from assessment_app.models.schema import PortfolioORM, TradeORM, TradeHistoryORM
 from assessment_app.service.auth_service import get_current_user
 from assessment_app.utils.utils import compute_cagr
 from assessment_app.repository.database import get_db
+from assessment_app.repository.intraday_store import bars_at, bars_between, intraday_store
+from assessment_app.repository.price_store import INTRADAY, PriceSeries, has_time_of_day, price_store, to_day
+from assessment_app.service.executor import io_pool
+from assessment_app.service.result_cache import analysis_cache, portfolio_tag
+from assessment_app.service.valuation import net_worth_cache
 
 router = APIRouter()
 
+MAX_BATCH_TICKS = 100000
+STREAM_CHUNK_ROWS = 4096
+STREAM_MEDIA_TYPES = {
+    StreamFormat.NDJSON: "application/x-ndjson",
+    StreamFormat.CSV: "text/csv",
+}
 
-# Helper function to read stock data from CSV
-def read_stock_data(stock_symbol: str) -> List[dict]:
-    file_path = f"assessment_app/data/{stock_symbol}.csv"
-    stock_data = []
-    with open(file_path, mode='r') as file:
-        reader = csv.DictReader(file)
-        for row in reader:
-            stock_data.append(row)
-    return stock_data
+
+# Helper function to read stock data from the shared price store.
+# With a timestamp, returns the intraday bars of its day when it has a time of day and intraday data exists.
+def read_stock_data(stock_symbol: str, ts: Optional[datetime] = None) -> PriceSeries:
+    try:
+        if ts is None:
+            return price_store.get(stock_symbol)
+        return bars_at(stock_symbol, ts)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Stock data not found")
+
+
+# Helper function to read the daily (or, for timestamps with a time of day, intraday) bars of a range
+def read_stock_range(stock_symbol: str, from_ts: datetime, to_ts: datetime) -> PriceSeries:
+    try:
+        return bars_between(stock_symbol, from_ts, to_ts)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Stock data not found")
+
+
+def read_asof_bar(stock_symbol: str, ts: datetime) -> Tuple[PriceSeries, Optional[int]]:
+    """
+    Bars and row of the last bar at or before `ts`: the day's intraday bar for a timestamp with a time of day,
+    when intraday data exists for its day, else the daily bar of the last trading day up to its date.
+    A time before the day's first intraday bar resolves to the last daily bar of an earlier day.
+
+    Returns:
+    Tuple[PriceSeries, Optional[int]]: The bars and the row, None if `ts` is before the stock's first bar.
+    """
+    stock_data = read_stock_data(stock_symbol, ts)
+    i = stock_data.asof(ts)
+    if i is None and stock_data.unit == INTRADAY:
+        stock_data = read_stock_data(stock_symbol)
+        i = int(stock_data.asof_keys([to_day(ts) - 1])[0])
+        i = i if i >= 0 else None
+    return stock_data, i
+
+
+def tick_price(stock_data: PriceSeries, rows: Union[int, slice, np.ndarray]):
+    """
+    Tick price of the given rows: the average of their Open and Close prices.
+    """
+    return (stock_data.open[rows] + stock_data.close[rows]) / 2
 
 
 @router.post("/market/data/tick", response_model=TickData)
@@ -32,19 +79,18 @@ async def get_market_data_tick(stock_symbol: str, current_ts: datetime, current_
     """
     Get data for stocks for a given datetime from `data` folder.
     Please note consider price value in TickData to be average of open and close price column value for the timestamp from the data file.
+    A timestamp with a time of day resolves to the intraday bar starting at that time, when intraday data exists for its day.
+    Weekends, holidays and other gaps resolve to the last bar before them (see `read_asof_bar`).
     """
-    stock_data = read_stock_data(stock_symbol)
-    print(stock_data)
-    for data in stock_data:
-
-        if datetime.strptime(data['Date'], '%Y-%m-%d').date() == current_ts.date():
-            price = (float(data['Open']) + float(data['Close'])) / 2
-            return TickData(
-                stock_symbol=stock_symbol,
-                timestamp=current_ts,
-                price=price
-            )
-    raise HTTPException(status_code=404, detail="Data not found for the given date")
+    stock_data, i = await io_pool.run(read_asof_bar, stock_symbol, current_ts)
+    if i is None:
+        raise HTTPException(status_code=404, detail="Data not found for the given date")
+    price = tick_price(stock_data, i)
+    return TickData(
+        stock_symbol=stock_symbol,
+        timestamp=current_ts,
+        price=price
+    )
 
 
 @router.post("/market/data/range", response_model=List[TickData])
@@ -52,31 +98,145 @@ async def get_market_data_range(stock_symbol: str, from_ts: datetime, to_ts: dat
     """
     Get data for stocks for a given datetime from `data` folder.
     Please note consider price value in TickData to be average of open and close price column value for the timestamp from the data file.
+    If either bound has a time of day and the stock has intraday data, intraday bars are returned.
     """
-    stock_data = read_stock_data(stock_symbol)
-    tick_data_range = []
-    for data in stock_data:
-        date = datetime.strptime(data['Date'], '%Y-%m-%d').date()
-        if from_ts.date() <= date <= to_ts.date():
-            price = (float(data['Open']) + float(data['Close'])) / 2
-            tick_data_range.append(TickData(
-                stock_symbol=stock_symbol,
-                timestamp=date,
-                price=price
-            ))
+    stock_data = await io_pool.run(read_stock_range, stock_symbol, from_ts, to_ts)
+    prices = tick_price(stock_data, slice(None))
+    tick_data_range = [
+        TickData(stock_symbol=stock_symbol, timestamp=timestamp, price=price)
+        for timestamp, price in zip(stock_data.iso_timestamps(slice(None)), prices.tolist())
+    ]
     if not tick_data_range:
         raise HTTPException(status_code=404, detail="No data found for the given range")
     return tick_data_range
 
 
-@router.post("/market/trade", response_model=Trade)
-async def trade_stock(trade: Trade, db: Session = Depends(get_db), current_user_id: str = Depends(get_current_user)) -> Trade:
+def iter_tick_rows(stock_data: PriceSeries, rows: slice, fmt: StreamFormat,
+                   chunk_rows: int = STREAM_CHUNK_ROWS) -> Iterator[str]:
     """
-    Only if trade.price is within Open and Close price of that stock on the execution timestamp, then trade should be successful.
-    Trade.price must be average of Open and Close price of that stock on the execution timestamp.
-    Also, update the portfolio and trade history with the trade details and adjust cash and networth appropriately.
-    On every trade, current_ts of portfolio also becomes today.
-    One cannot place trade in date (Trade.execution_ts) older than portfolio.current_ts
+    Yield the ticks in `rows` as NDJSON lines or CSV rows, one chunk of `chunk_rows` rows at a time.
+
+    Prices and timestamps are computed per chunk straight from the column arrays, so memory use
+    stays bounded by the chunk size no matter how long the range is.
+    """
+    if fmt == StreamFormat.CSV:
+        yield "stock_symbol,timestamp,price\n"
+        line = stock_data.symbol + ",{},{!r}\n"
+    else:
+        line = '{{"stock_symbol": ' + json.dumps(stock_data.symbol) + ', "timestamp": "{}", "price": {!r}}}\n'
+
+    for start in range(rows.start, rows.stop, chunk_rows):
+        chunk = slice(start, min(start + chunk_rows, rows.stop))
+        timestamps = stock_data.iso_timestamps(chunk)
+        prices = tick_price(stock_data, chunk).tolist()
+        yield "".join([line.format(timestamp, price) for timestamp, price in zip(timestamps, prices)])
+
+
+@router.post("/market/data/range/stream")
+async def stream_market_data_range(stock_symbol: str, from_ts: datetime, to_ts: datetime, fmt: StreamFormat = StreamFormat.NDJSON,
+                                   current_user_id: str = Depends(get_current_user)) -> StreamingResponse:
+    """
+    Streaming variant of `/market/data/range` for long ranges.
+    Returns the same ticks as chunked NDJSON (one TickData object per line) or CSV, without building the whole list in memory.
+    """
+    stock_data = await io_pool.run(read_stock_range, stock_symbol, from_ts, to_ts)
+    if len(stock_data) == 0:
+        raise HTTPException(status_code=404, detail="No data found for the given range")
+    return StreamingResponse(iter_tick_rows(stock_data, slice(0, len(stock_data)), fmt), media_type=STREAM_MEDIA_TYPES[fmt])
+
+
+def read_tick_prices(stock_symbol: str, timestamps: List[datetime]) -> np.ndarray:
+    """
+    Tick prices of one stock at many timestamps, as of the last bar at or before each (see `read_asof_bar`),
+    NaN before the stock's first bar.
+
+    Timestamps that resolve to intraday bars are grouped by day so each day partition is loaded and searched
+    once; all daily lookups are then resolved in one vectorized as-of search.
+    """
+    prices = np.full(len(timestamps), np.nan)
+    intraday_days = set(intraday_store.days(stock_symbol).tolist())
+    daily_positions = []
+    daily_keys = []
+    intraday_positions = {}
+    for j, ts in enumerate(timestamps):
+        day = to_day(ts)
+        if has_time_of_day(ts) and day in intraday_days:
+            intraday_positions.setdefault(day, []).append(j)
+        else:
+            daily_positions.append(j)
+            daily_keys.append(day)
+
+    for day, positions in intraday_positions.items():
+        stock_data = intraday_store.get_day(stock_symbol, day)
+        positions = np.array(positions, dtype=np.int64)
+        rows = stock_data.asof_many([timestamps[j] for j in positions])
+        found = rows >= 0
+        prices[positions[found]] = tick_price(stock_data, rows[found])
+        # Before the day's first intraday bar: the last daily bar of an earlier day
+        daily_positions.extend(positions[~found].tolist())
+        daily_keys.extend([day - 1] * int((~found).sum()))
+
+    if daily_positions:
+        stock_data = read_stock_data(stock_symbol)
+        positions = np.array(daily_positions, dtype=np.int64)
+        rows = stock_data.asof_keys(np.array(daily_keys, dtype=np.int64))
+        found = rows >= 0
+        prices[positions[found]] = tick_price(stock_data, rows[found])
+    return prices
+
+
+@router.post("/market/data/ticks", response_model=TickBatchResponse)
+async def get_market_data_ticks(request: TickBatchRequest, current_user_id: str = Depends(get_current_user)) -> TickBatchResponse:
+    """
+    Batch variant of `/market/data/tick`: prices of every requested symbol at every requested timestamp.
+    Prices follow the same Open/Close average and as-of rules; a timestamp before a symbol's first bar gets None in that cell.
+    """
+    if len(request.stock_symbols) * len(request.timestamps) > MAX_BATCH_TICKS:
+        raise HTTPException(status_code=400, detail=f"Batch exceeds {MAX_BATCH_TICKS} ticks")
+
+    prices = []
+    for stock_symbol in request.stock_symbols:
+        row_prices = await io_pool.run(read_tick_prices, stock_symbol, request.timestamps)
+        prices.append([None if np.isnan(price) else price for price in row_prices.tolist()])
+
+    return TickBatchResponse(stock_symbols=request.stock_symbols, timestamps=request.timestamps, prices=prices)
+
+
+@router.post("/market/data/bars", response_model=List[Bar])
+async def get_market_data_bars(stock_symbol: str, interval: BarInterval, from_ts: datetime, to_ts: datetime,
+                               current_user_id: str = Depends(get_current_user)) -> List[Bar]:
+    """
+    OHLCV bars of a stock at a weekly, monthly, quarterly or yearly interval, aggregated from its daily data.
+    Each bar is dated by the first calendar day of its period, and every bar overlapping the range is returned.
+    Bars are computed once per stock and interval and served from cache until the stock's data changes.
+    """
+    stock_data = await io_pool.run(read_stock_data, stock_symbol)
+    bars, last_days = await io_pool.run(stock_data.resample, interval.value)
+    start = int(np.searchsorted(last_days, to_day(from_ts), side="left"))
+    stop = int(np.searchsorted(bars.dates, to_day(to_ts), side="right"))
+    if start >= stop:
+        raise HTTPException(status_code=404, detail="No data found for the given range")
+    rows = slice(start, stop)
+    return [
+        Bar(stock_symbol=stock_symbol, timestamp=timestamp, open=open_price, high=high, low=low, close=close_price, volume=volume)
+        for timestamp, open_price, high, low, close_price, volume in zip(
+            bars.iso_timestamps(rows), bars.open[rows].tolist(), bars.high[rows].tolist(), bars.low[rows].tolist(),
+            bars.close[rows].tolist(), bars.volume[rows].tolist())
+    ]
+
+
+@router.get("/market/data/stats")
+async def get_market_data_stats(current_user_id: str = Depends(get_current_user)) -> dict:
+    """
+    Report price store cache usage (bytes, hits, misses, evictions, invalidations) and the rows,
+    memory (bytes) and load time (ms) of every cached symbol.
+    """
+    return price_store.stats()
+
+
+def execute_trade(trade: Trade, db: Session, current_user_id: str) -> TradeORM:
+    """
+    Validate and record a trade for the user's portfolio (blocking database and file I/O, run on the I/O pool).
     """
     # Fetch user's portfolio
     portfolio = db.query(PortfolioORM).filter(PortfolioORM.user_id == current_user_id).first()
@@ -87,26 +247,19 @@ async def trade_stock(trade: Trade, db: Session = Depends(get_db), current_user_
     if trade.execution_ts.date() < portfolio.current_ts.date():
         raise HTTPException(status_code=400, detail="Cannot trade in the past")
 
-    # Load stock data from CSV
-    stock_data_path = f"assessment_app/data/{trade.symbol}.csv"
-    try:
-        stock_df = pd.read_csv(stock_data_path)
-    except FileNotFoundError:
-        raise HTTPException(status_code=404, detail="Stock data not found")
-
-    # Calculate average price
-    stock_df['Date'] = pd.to_datetime(stock_df['Date']).dt.date
-    trade_data = stock_df[stock_df['Date'] == trade.execution_ts.date()]
+    # Load stock data from the price store, as of the last bar at or before the execution timestamp
+    stock_data, i = read_asof_bar(trade.symbol, trade.execution_ts)
 
-    if trade_data.empty:
+    if i is None:
         raise HTTPException(status_code=404, detail="Trade date not found in stock data")
 
-    avg_price = (trade_data['Open'].values[0] + trade_data['Close'].values[0]) / 2
+    # Calculate average price
+    open_price = stock_data.open[i]
+    close_price = stock_data.close[i]
+    avg_price = (open_price + close_price) / 2
 
     # Validate trade price
-    if not (trade.price >= trade_data['Open'].values[0] and trade.price <= trade_data['Close'].values[0]):
-        print(trade_data['Close'].values[0])
-        print(trade_data['Open'].values[0])
+    if not (trade.price >= open_price and trade.price <= close_price):
         raise HTTPException(status_code=400, detail="Trade price not within the range of open and close prices")
 
     # Update portfolio cash
@@ -149,5 +302,19 @@ async def trade_stock(trade: Trade, db: Session = Depends(get_db), current_user_
     portfolio.current_ts = datetime.now(pytz.timezone('Asia/Kolkata'))
     db.commit()
     db.refresh(portfolio)
+    analysis_cache.invalidate(portfolio_tag(portfolio.id))
+    net_worth_cache.apply_trade(portfolio.id, portfolio.cash_remaining, portfolio.current_ts)
 
     return trade_record
+
+
+@router.post("/market/trade", response_model=Trade)
+async def trade_stock(trade: Trade, db: Session = Depends(get_db), current_user_id: str = Depends(get_current_user)) -> Trade:
+    """
+    Only if trade.price is within Open and Close price of that stock on the execution timestamp, then trade should be successful.
+    Trade.price must be average of Open and Close price of that stock on the execution timestamp.
+    Also, update the portfolio and trade history with the trade details and adjust cash and networth appropriately.
+    On every trade, current_ts of portfolio also becomes today.
+    One cannot place trade in date (Trade.execution_ts) older than portfolio.current_ts
+    """
+    return await io_pool.run(execute_trade, trade, db, current_user_id)
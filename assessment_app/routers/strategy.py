@@ -2,12 +2,16 @@ from datetime import datetime
 from typing import List
 
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
 from assessment_app.models.models import Portfolio, Holding, PortfolioRequest, Strategy
 from assessment_app.models.schema import PortfolioORM, HoldingORM
 from assessment_app.repository.database import get_db
 from assessment_app.service.auth_service import get_current_user
+from assessment_app.service.executor import io_pool
+from assessment_app.service.result_cache import analysis_cache, portfolio_tag
+from assessment_app.service.strategies import strategies
+from assessment_app.service.valuation import net_worth_cache
 
 router = APIRouter()
 
@@ -15,13 +19,11 @@ router = APIRouter()
 @router.get("/strategies", response_model=List[Strategy])
 async def get_strategies(current_user_id: str = Depends(get_current_user)) -> List[Strategy]:
     """
-    Get all strategies available. You do not need to implement this.
+    Get all strategies available, with the defaults of their parameters.
     """
     return [
-        Strategy(
-            id="0",
-            name="default"
-        )
+        Strategy(id=strategy.id, name=strategy.name, parameters=strategy.parameters)
+        for strategy in strategies.values()
     ]
 
 
@@ -87,19 +89,38 @@ async def delete_portfolio(portfolio_id: str, db: Session = Depends(get_db), cur
     
     db.delete(portfolio)
     db.commit()
+    analysis_cache.invalidate(portfolio_tag(portfolio.id))
+    net_worth_cache.invalidate(portfolio.id)
     portfolio_response = Portfolio(id=portfolio.id, cash_remaining=portfolio.cash_remaining, current_ts=portfolio.current_ts, holdings=holdings_response)
     return portfolio_response
 
 
+def load_net_worth(portfolio_id: str, db: Session, current_user_id: str) -> float:
+    """
+    Read the portfolio and its holdings in one round of queries, value them and cache the valuation.
+    """
+    epoch = net_worth_cache.epoch()
+    portfolio = (
+        db.query(PortfolioORM)
+        .options(selectinload(PortfolioORM.holdings))
+        .filter(PortfolioORM.id == portfolio_id, PortfolioORM.user_id == current_user_id)
+        .first()
+    )
+    if not portfolio:
+        raise HTTPException(status_code=404, detail="Portfolio not found")
+    holdings = [(holding.symbol, holding.quantity, holding.price) for holding in portfolio.holdings]
+    return net_worth_cache.load(portfolio.id, current_user_id, portfolio.cash_remaining, portfolio.current_ts, holdings, epoch)
+
+
 @router.get("/portfolio-net-worth", response_model=float)
 async def get_net_worth(portfolio_id: str, db: Session = Depends(get_db), current_user_id: str = Depends(get_current_user)) -> float:
     """
     Get net-worth from portfolio (holdings value and cash) at current_ts field in portfolio.
+    Holdings are valued at the closing price of the last trading day at or before current_ts (their stored
+    price if there is none). Valuations are cached per portfolio and kept up to date by trades, so repeated
+    polls do not read the portfolio from the database.
     """
-    portfolio = db.query(PortfolioORM).filter(PortfolioORM.id == portfolio_id, PortfolioORM.user_id == current_user_id).first()
-    if not portfolio:
-        raise HTTPException(status_code=404, detail="Portfolio not found")
-    
-    holdings_value = sum([holding.quantity * holding.price for holding in portfolio.holdings])
-    net_worth = holdings_value + portfolio.cash_remaining
+    net_worth = await io_pool.run(net_worth_cache.get, portfolio_id, current_user_id)
+    if net_worth is None:
+        net_worth = await io_pool.run(load_net_worth, portfolio_id, db, current_user_id)
     return net_worth
@@ -0,0 +1,130 @@
+from typing import Dict, Tuple
+
+import numpy as np
+
+from assessment_app.models.constants import TRADING_DAYS_IN_YEAR
+
+
+def rolling_returns(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Simple return over the last `window` bars at every bar, in percent.
+
+    Parameters:
+    values (np.ndarray): Prices or portfolio values, one per bar.
+    window (int): Number of bars in each window.
+
+    Returns:
+    np.ndarray: float64 array like `values`, NaN for the first `window` bars.
+    """
+    returns = np.full(len(values), np.nan)
+    if len(values) > window:
+        returns[window:] = (values[window:] / values[:-window] - 1) * 100
+    return returns
+
+
+def rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Mean of the last `window` bars (including the current one) at every bar, from one prefix sum.
+
+    Parameters:
+    values (np.ndarray): One value per bar.
+    window (int): Number of bars in each window (at least 1).
+
+    Returns:
+    np.ndarray: float64 array like `values`, NaN for the first `window - 1` bars.
+    """
+    means = np.full(len(values), np.nan)
+    if len(values) >= window:
+        sums = np.concatenate(([0.0], np.cumsum(values, dtype=float)))
+        means[window - 1:] = (sums[window:] - sums[:-window]) / window
+    return means
+
+
+def rolling_volatility(values: np.ndarray, window: int, periods_per_year: int = TRADING_DAYS_IN_YEAR) -> np.ndarray:
+    """
+    Annualized sample standard deviation of the log returns of the last `window` bars, in percent.
+
+    Every window's sum and sum of squares come from two prefix sums, so the whole series costs one
+    linear pass however large the window. Returns are centred on their mean before summing, which
+    leaves the variance unchanged and keeps the subtraction of prefix sums numerically stable.
+
+    Parameters:
+    values (np.ndarray): Prices or portfolio values, one per bar.
+    window (int): Number of returns in each window (at least 2).
+    periods_per_year (int): Bars per year, used to annualize.
+
+    Returns:
+    np.ndarray: float64 array like `values`, NaN for the first `window` bars.
+    """
+    volatility = np.full(len(values), np.nan)
+    if len(values) <= window:
+        return volatility
+    log_returns = np.diff(np.log(values))
+    log_returns -= log_returns.mean()
+    sums = np.concatenate(([0.0], np.cumsum(log_returns)))
+    squares = np.concatenate(([0.0], np.cumsum(log_returns ** 2)))
+    window_sums = sums[window:] - sums[:-window]
+    window_squares = squares[window:] - squares[:-window]
+    variance = np.maximum((window_squares - window_sums ** 2 / window) / (window - 1), 0.0)
+    volatility[window:] = np.sqrt(variance * periods_per_year) * 100
+    return volatility
+
+
+def drawdown(values: np.ndarray) -> np.ndarray:
+    """
+    Decline of every bar from the highest value seen so far (its running maximum), in percent (<= 0).
+    """
+    if not len(values):
+        return np.empty(0)
+    return (values / np.maximum.accumulate(values) - 1) * 100
+
+
+def rolling_analytics(values: np.ndarray, window: int) -> Dict[str, np.ndarray]:
+    """
+    Rolling returns and volatility of a value series, see `rolling_returns` and `rolling_volatility`.
+    """
+    return {
+        "returns": rolling_returns(values, window),
+        "volatility": rolling_volatility(values, window),
+    }
+
+
+def daily_log_returns(close: np.ndarray) -> np.ndarray:
+    """
+    Daily log returns of aligned price rows, over the dates where every row has a price.
+
+    Parameters:
+    close (np.ndarray): (symbols x dates) prices on a shared date axis, NaN where a symbol has no price.
+
+    Returns:
+    np.ndarray: (symbols x returns) array.
+    """
+    close = close[:, ~np.isnan(close).any(axis=0)]
+    return np.diff(np.log(close), axis=1)
+
+
+def covariance_matrices(close: np.ndarray) -> Tuple[np.ndarray, np.ndarray, int]:
+    """
+    Covariance and correlation of the daily log returns of aligned price rows.
+
+    Only dates where every row has a price are used (see `daily_log_returns`). Both matrices come from one product of the demeaned
+    (rows x returns) matrix with its transpose. Correlations of a row with no variance are NaN.
+
+    Parameters:
+    close (np.ndarray): (symbols x dates) prices on a shared date axis, NaN where a symbol has no price.
+
+    Returns:
+    Tuple[np.ndarray, np.ndarray, int]: Covariance (of daily log returns), correlation, and the number of
+    returns they were computed from.
+    """
+    returns = daily_log_returns(close)
+    observations = returns.shape[1]
+    if observations < 2:
+        nan = np.full((len(close), len(close)), np.nan)
+        return nan, nan.copy(), observations
+    returns = returns - returns.mean(axis=1, keepdims=True)
+    covariance = returns @ returns.T / (observations - 1)
+    std = np.sqrt(np.diag(covariance))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        correlation = covariance / np.outer(std, std)
+    return covariance, np.clip(correlation, -1.0, 1.0), observations
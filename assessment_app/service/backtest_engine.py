@@ -0,0 +1,136 @@
+from typing import Callable, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+# Buy and sell signal of every bar (boolean arrays); a bar with both is a buy
+Signals = Tuple[np.ndarray, np.ndarray]
+# Signal function of a strategy: (opens, closes, **parameters) -> Signals
+SignalFunction = Callable[..., Signals]
+
+# Rows of the bars with a fill, and whether each fill is a buy (else a sell). Every fill is LOT units at the bar's close.
+Fills = Tuple[np.ndarray, np.ndarray]
+
+# Units bought or sold per fill
+LOT = 100
+# Signal bars per vectorized window after a skipped buy, and per stretch of the sequential loop
+MIN_WINDOW = 64
+
+
+def simulate_holding(buy_signals: np.ndarray, sell_signals: np.ndarray, closes: np.ndarray, capital: float,
+                     quantity: int) -> Tuple[float, int, Fills]:
+    """
+    Trade one holding on its signals: buy 100 units at the close of a buy bar when there is cash for them,
+    sell 100 units at the close of a sell bar when enough are held. Trading stops once cash runs out.
+
+    Units and cash follow from array operations over the signal bars: units (in lots of 100) are a walk
+    floored at zero, i.e. its cumulative sum minus its running minimum, and cash is one cumulative sum of
+    the fills. That assumes every buy is affordable, so the signal bars are taken in windows, each accepted
+    up to its first unaffordable buy, which is skipped. Windows double while they pass. Where cash keeps
+    binding (or units are short), signals go through a tight sequential loop instead, in stretches that
+    double while windows keep failing early. Cumulative sums add in the same order as a loop, so results
+    are identical to a bar-by-bar simulation. For the same reason a holding can be simulated in consecutive
+    segments, each starting with the cash and units the previous one ended with (fill rows are then relative
+    to the segment).
+
+    Parameters:
+    buy_signals (np.ndarray): Boolean buy signal of every bar.
+    sell_signals (np.ndarray): Boolean sell signal of every bar.
+    closes (np.ndarray): Close prices of the bars.
+    capital (float): Cash available at the start.
+    quantity (int): Units held at the start.
+
+    Returns:
+    Tuple[float, int, Fills]: Cash and units held at the end, and the fills in order.
+    """
+    signals = np.flatnonzero(buy_signals | sell_signals)
+    is_buy = buy_signals[signals]
+    amounts = LOT * closes[signals]
+    filled = np.zeros(len(signals), dtype=bool)
+    buy_list, amount_list = None, None
+
+    start = 0
+    window = stretch = MIN_WINDOW
+    while start < len(signals) and capital > 0:
+        if quantity >= 0:
+            stop = min(start + window, len(signals))
+            buys = is_buy[start:stop]
+            amount = amounts[start:stop]
+
+            # Lots held after each signal if every buy fills; a sell without a lot to sell is skipped
+            walk = quantity // LOT + np.cumsum(np.where(buys, 1, -1))
+            lots = walk - np.minimum(np.minimum.accumulate(walk), 0)
+            sells = ~buys & (np.concatenate(([quantity // LOT], lots[:-1])) >= 1)
+
+            cash = np.cumsum(np.concatenate(([capital], np.where(buys, -amount, np.where(sells, amount, 0.0)))))
+            # First signal met with no cash left, or with a buy the cash does not cover
+            blocked = (cash[:-1] <= 0) | (buys & (cash[:-1] < amount))
+            accepted = int(np.argmax(blocked)) if blocked.any() else len(buys)
+
+            filled[start:start + accepted] = buys[:accepted] | sells[:accepted]
+            capital = float(cash[accepted])
+            quantity += LOT * (int(buys[:accepted].sum()) - int(sells[:accepted].sum()))
+            start += accepted
+            if accepted == len(buys):
+                window *= 2
+                stretch = MIN_WINDOW
+                continue
+            # The blocked buy is skipped (no cash at all ends the loop)
+            start += 1
+            window = MIN_WINDOW
+            if accepted >= MIN_WINDOW:
+                continue
+            stretch *= 2
+
+        # Sequential stretch while cash binds every few signals
+        if buy_list is None:
+            buy_list, amount_list = is_buy.tolist(), amounts.tolist()
+        stop = min(start + stretch, len(signals))
+        while start < stop and capital > 0:
+            if buy_list[start]:
+                if capital >= amount_list[start]:
+                    capital -= amount_list[start]
+                    quantity += LOT
+                    filled[start] = True
+            elif quantity >= LOT:
+                capital += amount_list[start]
+                quantity -= LOT
+                filled[start] = True
+            start += 1
+
+    rows = signals[filled]
+    return capital, quantity, (rows, buy_signals[rows])
+
+
+def simulate_portfolio(holdings: Sequence[Tuple[np.ndarray, np.ndarray, int]], capital: float,
+                       signals: SignalFunction, parameters: Dict[str, float]) -> Tuple[float, List[int], List[Fills]]:
+    """
+    Simulate every holding in turn, carrying the cash left by one holding into the next.
+
+    This is a pure function of its (picklable) arguments so it can run in a worker process. The signal
+    function is pickled by reference, so it must be a module-level function, see `strategies.register_strategy`.
+
+    Parameters:
+    holdings: (opens, closes, starting quantity) of each holding.
+    capital (float): Cash available at the start.
+    signals (SignalFunction): Signal function of the strategy.
+    parameters (Dict[str, float]): Keyword arguments of the signal function.
+
+    Returns:
+    Tuple[float, List[int], List[Fills]]: Final cash, and the final quantity and fills of each holding.
+    """
+    quantities = []
+    fills = []
+    for opens, closes, quantity in holdings:
+        buys, sells = signals(opens, closes, **parameters)
+        capital, quantity, holding_fills = simulate_holding(buys, sells, closes, capital, quantity)
+        quantities.append(quantity)
+        fills.append(holding_fills)
+    return capital, quantities, fills
+
+
+def portfolio_signals(holdings: Sequence[Tuple[np.ndarray, np.ndarray]], signals: SignalFunction,
+                      parameters: Dict[str, float]) -> List[Signals]:
+    """
+    Signals of every holding, from its (opens, closes), for simulations run segment by segment.
+    """
+    return [signals(opens, closes, **parameters) for opens, closes in holdings]
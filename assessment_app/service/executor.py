@@ -0,0 +1,111 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from fastapi import HTTPException
+
+IO_POOL_WORKERS = int(os.environ.get("IO_POOL_WORKERS", 16))
+IO_POOL_MAX_QUEUE = int(os.environ.get("IO_POOL_MAX_QUEUE", 256))
+CPU_POOL_WORKERS = int(os.environ.get("CPU_POOL_WORKERS", os.cpu_count() or 1))
+CPU_POOL_MAX_QUEUE = int(os.environ.get("CPU_POOL_MAX_QUEUE", 64))
+# Forking a server whose threads may hold locks (price store, logging) can leave them held in the child,
+# so workers are started from a clean process instead
+CPU_POOL_START_METHOD = os.environ.get(
+    "CPU_POOL_START_METHOD", "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+
+class BoundedPool:
+    """
+    Executor with a bounded backlog, used to keep blocking and CPU-heavy work off the event loop.
+
+    Async handlers `await pool.run(fn, *args)`. Once `max_queue` calls are already waiting for a
+    worker, further calls are rejected with 503 instead of growing the backlog without bound.
+    Counters are only touched from the event loop thread, so they need no lock; the executor is also
+    used directly from job threads, so creating it is guarded by one.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], Executor], max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._factory = factory
+        self._executor: Optional[Executor] = None
+        self._executor_lock = threading.Lock()
+        self.in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    @property
+    def executor(self) -> Executor:
+        # Created on first use so importing the app never forks worker processes
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = self._factory()
+            return self._executor
+
+    @property
+    def queued(self) -> int:
+        return max(0, self.in_flight - self.max_workers)
+
+    async def run(self, fn: Callable, *args):
+        """
+        Run `fn(*args)` on the pool and return its result (or raise its exception).
+
+        Raises:
+        HTTPException: 503 if the pool's backlog is full.
+        """
+        if self.queued >= self.max_queue:
+            self.rejected += 1
+            raise HTTPException(status_code=503, detail=f"Server busy, {self.name} pool is full")
+        self.in_flight += 1
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+        except BaseException:
+            # Raised by `fn`, or the awaiting request was cancelled
+            self.failed += 1
+            raise
+        finally:
+            self.in_flight -= 1
+        self.completed += 1
+        return result
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self) -> None:
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Blocking file reads and synchronous database calls
+io_pool = BoundedPool(
+    "io", lambda: ThreadPoolExecutor(max_workers=IO_POOL_WORKERS, thread_name_prefix="io"),
+    IO_POOL_WORKERS, IO_POOL_MAX_QUEUE,
+)
+
+# CPU-heavy, GIL-bound work such as backtest simulations; functions and arguments must be picklable
+cpu_pool = BoundedPool(
+    "cpu", lambda: ProcessPoolExecutor(
+        max_workers=CPU_POOL_WORKERS, mp_context=multiprocessing.get_context(CPU_POOL_START_METHOD),
+    ),
+    CPU_POOL_WORKERS, CPU_POOL_MAX_QUEUE,
+)
+
+
+def pool_stats() -> Dict[str, Dict[str, int]]:
+    return {pool.name: pool.stats() for pool in (io_pool, cpu_pool)}
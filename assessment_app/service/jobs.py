@@ -0,0 +1,128 @@
+import logging
+import os
+import socket
+import threading
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from fastapi import HTTPException
+
+logger = logging.getLogger(__name__)
+
+BACKTEST_JOB_WORKERS = int(os.environ.get("BACKTEST_JOB_WORKERS", 2))
+BACKTEST_JOB_MAX_QUEUE = int(os.environ.get("BACKTEST_JOB_MAX_QUEUE", 1000))
+# Seconds a running job's lease lasts without a heartbeat before another process may take the job over
+BACKTEST_JOB_LEASE_SECONDS = float(os.environ.get("BACKTEST_JOB_LEASE_SECONDS", 60))
+
+# Owner recorded on the jobs this process runs; unique per process start
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+class JobRunner:
+    """
+    Runs jobs on a bounded pool of background threads, so a request only submits a job and returns.
+
+    Job state lives with the job function (in the database); the runner only tracks the jobs queued or
+    running here, to bound the backlog (503 beyond `max_queue` queued jobs) and to drop cancelled jobs
+    that have not started. Unlike BoundedPool, it is used from the event loop and its worker threads,
+    so its state is guarded by a lock. `completed` counts jobs that returned, `failed` those that raised.
+    """
+
+    def __init__(self, name: str, run: Callable[..., None], max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._run_job = run
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    @property
+    def queued(self) -> int:
+        return max(0, len(self._futures) - self.max_workers)
+
+    def check_capacity(self) -> None:
+        """
+        Early check, before creating a job, that the backlog is not already full; `submit` checks again.
+
+        Raises:
+        HTTPException: 503 if the backlog is full.
+        """
+        with self._lock:
+            self._check_capacity()
+
+    def _check_capacity(self) -> None:
+        if self.queued >= self.max_queue:
+            self.rejected += 1
+            raise HTTPException(status_code=503, detail=f"Server busy, {self.name} queue is full")
+
+    def submit(self, job_id: str, *args, bounded: bool = True) -> None:
+        """
+        Queue `run(job_id, *args)` unless job `job_id` is already queued or running here.
+
+        Jobs resubmitted after a restart pass `bounded=False`: they were accepted already, so they are
+        queued even beyond `max_queue`.
+
+        Raises:
+        HTTPException: 503 if `bounded` and the backlog is full.
+        """
+        with self._lock:
+            if job_id in self._futures:
+                return
+            if bounded:
+                self._check_capacity()
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=self.name)
+            self._futures[job_id] = self._executor.submit(self._run, job_id, *args)
+
+    def _run(self, job_id: str, *args) -> None:
+        try:
+            self._run_job(job_id, *args)
+        except Exception:
+            logger.exception("Job %s failed", job_id)
+            with self._lock:
+                self.failed += 1
+        else:
+            with self._lock:
+                self.completed += 1
+        finally:
+            with self._lock:
+                self._futures.pop(job_id, None)
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Drop job `job_id` if it has not started. Returns whether it was dropped.
+        """
+        with self._lock:
+            future = self._futures.get(job_id)
+            if future is None or not future.cancel():
+                return False
+            del self._futures[job_id]
+            return True
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "in_flight": len(self._futures),
+                "queued": self.queued,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+            }
+
+    def shutdown(self) -> None:
+        """
+        Stop taking jobs; queued jobs stay queued in the database and are resubmitted on the next start, and
+        running jobs are taken over once their lease expires.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._futures.clear()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
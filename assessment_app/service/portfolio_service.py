@@ -3,6 +3,17 @@ from fastapi import HTTPException
 from assessment_app.models.schema import PortfolioORM
 from assessment_app.models.models import Portfolio, Holding
 
+def portfolio_from_orm(portfolio: PortfolioORM) -> Portfolio:
+    """
+    Convert a portfolio row and its holdings to the Portfolio response model.
+    """
+    holdings_response = []
+    for holding in portfolio.holdings:
+        holdings_response.append(Holding(symbol=holding.symbol, quantity=holding.quantity, price=holding.price))
+    portfolio_response = Portfolio(id=portfolio.id, cash_remaining=portfolio.cash_remaining, current_ts=portfolio.current_ts, holdings=holdings_response)
+    return portfolio_response
+
+
 def get_portfolio_for_user(user_id: str, db: Session) -> Portfolio:
     """
     Retrieve the portfolio of the current user from the database.
@@ -19,8 +30,24 @@ def get_portfolio_for_user(user_id: str, db: Session) -> Portfolio:
     if not portfolio:
         raise HTTPException(status_code=404, detail="Portfolio not found for the user")
     
-    holdings_response = []
-    for holding in portfolio.holdings:
-        holdings_response.append(Holding(symbol=holding.symbol, quantity=holding.quantity, price=holding.price))
-    portfolio_response = Portfolio(id=portfolio.id, cash_remaining=portfolio.cash_remaining, current_ts=portfolio.current_ts, holdings=holdings_response)
-    return portfolio_response
+    return portfolio_from_orm(portfolio)
+
+
+def get_portfolio_by_id(portfolio_id: str, user_id: str, db: Session) -> Portfolio:
+    """
+    Retrieve one of the current user's portfolios from the database.
+
+    Parameters:
+    - portfolio_id: str : The ID of the portfolio.
+    - user_id: str : The ID of the current user.
+    - db: Session : The database session.
+
+    Returns:
+    - Portfolio: The portfolio if it exists and belongs to the user.
+    """
+    portfolio = db.query(PortfolioORM).filter(PortfolioORM.id == portfolio_id, PortfolioORM.user_id == user_id).first()
+
+    if not portfolio:
+        raise HTTPException(status_code=404, detail="Portfolio not found")
+
+    return portfolio_from_orm(portfolio)
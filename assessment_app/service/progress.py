@@ -0,0 +1,57 @@
+import asyncio
+import os
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Optional, Tuple
+
+# Progress messages held for a slow reader before the oldest are dropped
+PROGRESS_MAX_PENDING = int(os.environ.get("PROGRESS_MAX_PENDING", 16))
+# Bars a streamed backtest simulates between two progress messages
+BACKTEST_PROGRESS_BARS = int(os.environ.get("BACKTEST_PROGRESS_BARS", 1000))
+
+
+class ProgressChannel:
+    """
+    Bounded buffer of messages from a producer to one reader, e.g. a streaming response.
+
+    Progress messages supersede each other, so when the reader falls behind and `max_pending` of them are
+    waiting, the oldest is dropped instead of blocking the producer or buffering without bound. The number
+    dropped is handed to the reader with the next message. The closing message is never dropped.
+    Used from the event loop thread only.
+    """
+
+    def __init__(self, max_pending: int = PROGRESS_MAX_PENDING):
+        self.max_pending = max_pending
+        self._pending: Deque[Tuple[str, Any]] = deque()
+        self._final: Optional[Tuple[str, Any]] = None
+        self._ready = asyncio.Event()
+        self.dropped = 0
+
+    def publish(self, event: str, data: Any) -> None:
+        if len(self._pending) >= self.max_pending:
+            self._pending.popleft()
+            self.dropped += 1
+        self._pending.append((event, data))
+        self._ready.set()
+
+    def close(self, event: str, data: Any) -> None:
+        """
+        Publish the last message; the reader stops after it.
+        """
+        self._final = (event, data)
+        self._ready.set()
+
+    async def messages(self) -> AsyncIterator[Tuple[str, Any, int]]:
+        """
+        (event, data, messages dropped since the previous one) in order, until the closing message.
+        """
+        while True:
+            await self._ready.wait()
+            self._ready.clear()
+            while self._pending:
+                event, data = self._pending.popleft()
+                dropped, self.dropped = self.dropped, 0
+                yield event, data, dropped
+            if self._final is not None:
+                dropped, self.dropped = self.dropped, 0
+                yield (*self._final, dropped)
+                return
@@ -0,0 +1,144 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Set, Tuple
+
+ANALYSIS_CACHE_MAX_ENTRIES = int(os.environ.get("ANALYSIS_CACHE_MAX_ENTRIES", 4096))
+ANALYSIS_CACHE_TTL_SECONDS = float(os.environ.get("ANALYSIS_CACHE_TTL_SECONDS", 3600))
+
+_MISSING = object()
+
+
+class ResultCache:
+    """
+    LRU cache of endpoint results with a time-to-live, per-endpoint hit counters and tag invalidation.
+
+    Callers key results by their normalized inputs plus a data-version stamp (see PriceSeries.version),
+    so a result is never served for changed data; the TTL bounds how long any entry is kept. Entries can
+    carry a tag (e.g. a portfolio id) so everything derived from one object can be dropped at once.
+    Exceptions raised while computing, such as HTTPException, are not cached.
+    """
+
+    def __init__(self, max_entries: int = ANALYSIS_CACHE_MAX_ENTRIES, ttl_seconds: float = ANALYSIS_CACHE_TTL_SECONDS,
+                 clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        # (endpoint, key) -> (expiry time, tag, value)
+        self._entries: "OrderedDict[Tuple[str, Hashable], Tuple[float, Optional[Hashable], Any]]" = OrderedDict()
+        self._tags: Dict[Hashable, Set[Tuple[str, Hashable]]] = {}
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, endpoint: str, key: Hashable, default: Any = None) -> Any:
+        """
+        Return the cached result of `endpoint` for `key`, or `default` if there is none (counted as a miss).
+        """
+        entry_key = (endpoint, key)
+        with self._lock:
+            counters = self._counters.setdefault(endpoint, {"hits": 0, "misses": 0})
+            entry = self._entries.get(entry_key)
+            if entry is not None and entry[0] <= self._clock():
+                self._remove(entry_key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                counters["misses"] += 1
+                return default
+            self._entries.move_to_end(entry_key)
+            counters["hits"] += 1
+            return entry[2]
+
+    def put(self, endpoint: str, key: Hashable, value: Any, tag: Optional[Hashable] = None) -> None:
+        """
+        Cache `value` as the result of `endpoint` for `key`, evicting the least recently used entries over the limit.
+        """
+        entry_key = (endpoint, key)
+        with self._lock:
+            if entry_key in self._entries:
+                self._remove(entry_key)
+            self._entries[entry_key] = (self._clock() + self.ttl_seconds, tag, value)
+            if tag is not None:
+                self._tags.setdefault(tag, set()).add(entry_key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def get_or_compute(self, endpoint: str, key: Hashable, compute: Callable[[], Any],
+                       tag: Optional[Hashable] = None) -> Any:
+        """
+        Return the cached result of `endpoint` for `key`, or compute, cache and return it.
+
+        Parameters:
+        endpoint (str): Name the hit counters are reported under.
+        key (Hashable): Normalized inputs and data version of the result.
+        compute (Callable[[], Any]): Produces the result on a miss.
+        tag (Hashable): Optional tag to invalidate the entry by.
+        """
+        value = self.get(endpoint, key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            self.put(endpoint, key, value, tag)
+        return value
+
+    def _remove(self, entry_key: Tuple[str, Hashable]) -> None:
+        _, tag, _ = self._entries.pop(entry_key)
+        if tag is not None:
+            keys = self._tags[tag]
+            keys.discard(entry_key)
+            if not keys:
+                del self._tags[tag]
+
+    def invalidate(self, tag: Hashable) -> int:
+        """
+        Drop every entry carrying `tag`.
+
+        Returns:
+        int: Number of entries dropped.
+        """
+        with self._lock:
+            entry_keys = list(self._tags.get(tag, ()))
+            for entry_key in entry_keys:
+                self._remove(entry_key)
+            self.invalidations += len(entry_keys)
+        return len(entry_keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def stats(self) -> dict:
+        """
+        Report cache size and counters, plus hits, misses and hit rate of every endpoint.
+        """
+        with self._lock:
+            return {
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "entries": len(self._entries),
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "endpoints": {
+                    endpoint: {
+                        **counters,
+                        "hit_rate": counters["hits"] / max(counters["hits"] + counters["misses"], 1),
+                    }
+                    for endpoint, counters in self._counters.items()
+                },
+            }
+
+
+def portfolio_tag(portfolio_id: str) -> Tuple[str, str]:
+    """
+    Tag of cached results derived from a portfolio, invalidated whenever the portfolio trades.
+    """
+    return "portfolio", portfolio_id
+
+
+analysis_cache = ResultCache()
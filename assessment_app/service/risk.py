@@ -0,0 +1,93 @@
+from typing import List, Tuple
+
+import numpy as np
+
+# Paths simulated per Monte Carlo task. Fixed, so a seed gives the same paths however many workers run them.
+MONTE_CARLO_CHUNK_PATHS = 20000
+
+
+def horizon_returns(log_returns: np.ndarray, horizon: int) -> np.ndarray:
+    """
+    Overlapping `horizon`-day log returns from daily ones, as differences of one cumulative sum per row.
+
+    Parameters:
+    log_returns (np.ndarray): (symbols x days) daily log returns.
+    horizon (int): Days per return.
+
+    Returns:
+    np.ndarray: (symbols x (days - horizon + 1)) array.
+    """
+    sums = np.zeros((log_returns.shape[0], log_returns.shape[1] + 1))
+    np.cumsum(log_returns, axis=1, out=sums[:, 1:])
+    return sums[:, horizon:] - sums[:, :-horizon]
+
+
+def tail_risk(losses: np.ndarray, confidence: float) -> Tuple[float, float]:
+    """
+    Value-at-Risk (the `confidence` quantile of the losses) and Expected Shortfall (the mean loss at or beyond it).
+    """
+    value_at_risk = float(np.quantile(losses, confidence))
+    return value_at_risk, float(losses[losses >= value_at_risk].mean())
+
+
+def historical_risk(log_returns: np.ndarray, exposures: np.ndarray, confidence: float,
+                    horizon: int) -> Tuple[float, float]:
+    """
+    Historical-simulation VaR and ES: the current positions revalued under every past `horizon`-day return.
+
+    Parameters:
+    log_returns (np.ndarray): (symbols x days) daily log returns.
+    exposures (np.ndarray): Current value of the position in each symbol.
+    confidence (float): Confidence level, e.g. 0.95.
+    horizon (int): Holding period in days.
+
+    Returns:
+    Tuple[float, float]: VaR and ES, as positive losses.
+    """
+    losses = -(exposures @ np.expm1(horizon_returns(log_returns, horizon)))
+    return tail_risk(losses, confidence)
+
+
+def return_distribution(log_returns: np.ndarray, horizon: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Mean and a covariance factor of `horizon`-day log returns, assuming i.i.d. normal daily returns.
+
+    The factor F satisfies F @ F.T == covariance. It comes from an eigendecomposition rather than a Cholesky
+    decomposition so a singular covariance (e.g. perfectly correlated symbols) is still accepted.
+    """
+    mean = log_returns.mean(axis=1) * horizon
+    covariance = np.atleast_2d(np.cov(log_returns)) * horizon
+    eigenvalues, eigenvectors = np.linalg.eigh(covariance)
+    return mean, eigenvectors * np.sqrt(np.maximum(eigenvalues, 0.0))
+
+
+def monte_carlo_chunks(seed: int, paths: int, chunk_paths: int = MONTE_CARLO_CHUNK_PATHS) -> List[Tuple[np.random.SeedSequence, int]]:
+    """
+    Split a simulation into (seed sequence, paths) tasks. Each task gets its own independent stream spawned
+    from `seed`, so the paths depend only on the seed and the task's position, not on scheduling.
+    """
+    sizes = [chunk_paths] * (paths // chunk_paths) + ([paths % chunk_paths] if paths % chunk_paths else [])
+    return list(zip(np.random.SeedSequence(seed).spawn(len(sizes)), sizes))
+
+
+def simulate_losses(exposures: np.ndarray, mean: np.ndarray, factor: np.ndarray,
+                    seed: np.random.SeedSequence, paths: int) -> np.ndarray:
+    """
+    Portfolio losses over `paths` simulated horizon returns drawn from N(mean, factor @ factor.T).
+
+    This is a pure function of its (picklable) arguments so it can run in a worker process.
+
+    Returns:
+    np.ndarray: One loss per path.
+    """
+    rng = np.random.default_rng(seed)
+    returns = mean + rng.standard_normal((paths, len(mean))) @ factor.T
+    return -(np.expm1(returns) @ exposures)
+
+
+def simulate_chunk_losses(exposures: np.ndarray, mean: np.ndarray, factor: np.ndarray,
+                          chunks: List[Tuple[np.random.SeedSequence, int]]) -> np.ndarray:
+    """
+    Losses of several `monte_carlo_chunks` tasks run one after another in one worker, concatenated in order.
+    """
+    return np.concatenate([simulate_losses(exposures, mean, factor, seed, paths) for seed, paths in chunks])
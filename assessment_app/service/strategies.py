@@ -0,0 +1,119 @@
+import importlib
+import math
+import os
+from typing import Callable, Dict, Optional
+
+import numpy as np
+from fastapi import HTTPException
+
+from assessment_app.service.analytics import rolling_mean
+from assessment_app.service.backtest_engine import SignalFunction, Signals
+
+# Comma-separated modules imported at startup, each registering its strategies with `register_strategy`
+STRATEGY_MODULES = os.environ.get("STRATEGY_MODULES", "")
+
+
+class StrategySpec:
+    """
+    A registered strategy: its signal function and the defaults of the function's parameters.
+
+    Parameters are positive finite numbers; those with an integer default (window lengths) only take integers.
+    """
+
+    def __init__(self, strategy_id: str, name: str, signals: SignalFunction, parameters: Dict[str, float]):
+        self.id = strategy_id
+        self.name = name
+        self.signals = signals
+        self.parameters = parameters
+
+    def resolve(self, parameters: Optional[Dict[str, float]]) -> Dict[str, float]:
+        """
+        The defaults overridden by `parameters`.
+
+        Raises:
+        HTTPException: 400 for an unknown parameter or an invalid value.
+        """
+        resolved = dict(self.parameters)
+        for name, value in (parameters or {}).items():
+            if name not in resolved:
+                raise HTTPException(status_code=400, detail=f"Unknown parameter {name} for strategy {self.name}")
+            if not (math.isfinite(value) and value > 0):
+                raise HTTPException(status_code=400, detail=f"Parameter {name} must be a positive finite number")
+            if isinstance(resolved[name], int):
+                if value != int(value):
+                    raise HTTPException(status_code=400, detail=f"Parameter {name} must be an integer")
+                value = int(value)
+            resolved[name] = value
+        return resolved
+
+
+# Registered strategies by id, in registration order
+strategies: Dict[str, StrategySpec] = {}
+
+
+def register_strategy(strategy_id: str, name: str, **parameters: float) -> Callable[[SignalFunction], SignalFunction]:
+    """
+    Decorator registering a module-level signal function `(opens, closes, **parameters) -> (buys, sells)`
+    as strategy `strategy_id`, with the given parameter defaults.
+    """
+    def register(signals: SignalFunction) -> SignalFunction:
+        if strategy_id in strategies:
+            raise ValueError(f"Strategy {strategy_id} is already registered")
+        strategies[strategy_id] = StrategySpec(strategy_id, name, signals, parameters)
+        return signals
+    return register
+
+
+def get_strategy(strategy_id: str) -> StrategySpec:
+    """
+    Raises:
+    HTTPException: 404 if no strategy is registered as `strategy_id`.
+    """
+    strategy = strategies.get(strategy_id)
+    if strategy is None:
+        raise HTTPException(status_code=404, detail="Strategy not found")
+    return strategy
+
+
+def load_strategy_modules(modules: str = STRATEGY_MODULES) -> None:
+    """
+    Import the strategy modules named in `modules` (comma-separated), registering their strategies.
+    """
+    for module in modules.split(","):
+        if module.strip():
+            importlib.import_module(module.strip())
+
+
+@register_strategy("0", "default")
+def candle_direction(opens: np.ndarray, closes: np.ndarray) -> Signals:
+    """
+    Buy when a bar closes below its open, sell when it closes above.
+    """
+    return closes < opens, closes > opens
+
+
+@register_strategy("1", "moving_average_crossover", fast=5, slow=20)
+def moving_average_crossover(opens: np.ndarray, closes: np.ndarray, fast: int, slow: int) -> Signals:
+    """
+    Buy when the `fast`-bar moving average of the close crosses above the `slow`-bar one, sell when it crosses below.
+    """
+    fast_mean, slow_mean = rolling_mean(closes, fast), rolling_mean(closes, slow)
+    above = fast_mean > slow_mean
+    # Bars where both averages are defined for this bar and the previous one
+    defined = ~(np.isnan(fast_mean) | np.isnan(slow_mean))
+    defined = np.concatenate(([False], defined[1:] & defined[:-1]))
+    previous = np.concatenate(([False], above[:-1]))
+    return defined & above & ~previous, defined & ~above & previous
+
+
+@register_strategy("2", "mean_reversion", window=20, width=2.0)
+def mean_reversion(opens: np.ndarray, closes: np.ndarray, window: int, width: float) -> Signals:
+    """
+    Buy when the close falls `width` standard deviations below its `window`-bar mean, sell when it rises as
+    far above it.
+    """
+    # Centred on the overall mean so the variance from prefix sums stays numerically stable
+    centred = closes - closes.mean() if len(closes) else closes
+    mean = rolling_mean(centred, window)
+    deviation = np.sqrt(np.maximum(rolling_mean(centred ** 2, window) - mean ** 2, 0.0))
+    return centred < mean - width * deviation, centred > mean + width * deviation
@@ -0,0 +1,97 @@
+import itertools
+import os
+from multiprocessing import shared_memory
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+from fastapi import HTTPException
+
+from assessment_app.service.backtest_engine import SignalFunction, simulate_portfolio
+from assessment_app.service.strategies import StrategySpec
+
+# Largest number of backtests (parameter sets x periods) in one sweep
+MAX_SWEEP_RUNS = int(os.environ.get("MAX_SWEEP_RUNS", 10000))
+
+# Picklable handle of a SharedPrices block: (block name, total bars, offset of each holding's first bar)
+SharedPricesHandle = Tuple[str, int, Tuple[int, ...]]
+# One backtest of a sweep: strategy parameters, and the (start, stop) bar rows of every holding
+SweepRun = Tuple[Dict[str, float], List[Tuple[int, int]]]
+
+
+class SharedPrices:
+    """
+    Open and close prices of several holdings packed into one shared memory block, a (2 x bars) float64
+    array, so worker processes map them instead of receiving pickled copies or reloading them.
+
+    The creating process owns the block; use it as a context manager, which unlinks the block on exit.
+    Workers still attached keep their mapping until they close it.
+    """
+
+    def __init__(self, columns: Sequence[Tuple[np.ndarray, np.ndarray]]):
+        offsets = np.concatenate(([0], np.cumsum([len(opens) for opens, _ in columns]))).astype(int).tolist()
+        self._block = shared_memory.SharedMemory(create=True, size=max(2 * offsets[-1] * 8, 1))
+        prices = np.ndarray((2, offsets[-1]), dtype=np.float64, buffer=self._block.buf)
+        for (opens, closes), start, stop in zip(columns, offsets, offsets[1:]):
+            prices[0, start:stop] = opens
+            prices[1, start:stop] = closes
+        # The block cannot be closed while an array still exports its buffer
+        del prices
+        self.handle: SharedPricesHandle = (self._block.name, offsets[-1], tuple(offsets[:-1]))
+
+    def __enter__(self) -> "SharedPrices":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._block.close()
+        self._block.unlink()
+
+
+def parameter_grid(strategy: StrategySpec, grid: Dict[str, List[float]]) -> List[Dict[str, float]]:
+    """
+    Every combination of the values in `grid`, each resolved against the strategy's defaults.
+
+    Raises:
+    HTTPException: 400 for an empty list of values, or an unknown parameter or invalid value (see StrategySpec.resolve).
+    """
+    for name, values in grid.items():
+        if not values:
+            raise HTTPException(status_code=400, detail=f"No values given for parameter {name}")
+    names = list(grid)
+    return [strategy.resolve(dict(zip(names, values))) for values in itertools.product(*grid.values())]
+
+
+def run_sweep_chunk(handle: SharedPricesHandle, quantities: List[int], capital: float, signals: SignalFunction,
+                    runs: List[SweepRun]) -> List[Tuple[float, int]]:
+    """
+    Run backtests on prices in shared memory (see `SharedPrices`), in a worker process.
+
+    Parameters:
+    handle (SharedPricesHandle): The prices' block.
+    quantities (List[int]): Starting quantity of every holding.
+    capital (float): Cash available at the start of every backtest.
+    signals (SignalFunction): Signal function of the strategy.
+    runs (List[SweepRun]): The backtests.
+
+    Returns:
+    List[Tuple[float, int]]: Final cash and number of trades of every backtest.
+    """
+    name, bars, offsets = handle
+    block = shared_memory.SharedMemory(name=name)
+    results = simulate_runs(np.ndarray((2, bars), dtype=np.float64, buffer=block.buf), offsets, quantities,
+                            capital, signals, runs)
+    # Only once the views of the block are gone; if a run raised, the mapping is closed when it is collected
+    block.close()
+    return results
+
+
+def simulate_runs(prices: np.ndarray, offsets: Sequence[int], quantities: List[int], capital: float,
+                  signals: SignalFunction, runs: List[SweepRun]) -> List[Tuple[float, int]]:
+    results = []
+    for parameters, rows in runs:
+        holdings = [
+            (prices[0, offset + start:offset + stop], prices[1, offset + start:offset + stop], quantity)
+            for offset, (start, stop), quantity in zip(offsets, rows, quantities)
+        ]
+        final_capital, _, fills = simulate_portfolio(holdings, capital, signals, parameters)
+        results.append((final_capital, sum(len(filled_rows) for filled_rows, _ in fills)))
+    return results
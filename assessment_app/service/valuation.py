@@ -0,0 +1,179 @@
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from assessment_app.repository.price_panel import PricePanel, PricePanelCache, price_panels
+
+NET_WORTH_CACHE_SIZE = int(os.environ.get("NET_WORTH_CACHE_SIZE", 100000))
+
+# (symbol, quantity, stored price) of a holding
+HoldingRow = Tuple[str, float, float]
+
+
+class Valuation:
+    """
+    Mark-to-market value of one portfolio at its current_ts.
+
+    Holdings are valued at the close of the last trading day at or before current_ts. Holdings without
+    such a close (no price data for the symbol, or current_ts before its first bar) keep their stored price.
+    """
+
+    def __init__(self, user_id: str, cash_remaining: float, current_ts: datetime, holdings: List[HoldingRow],
+                 panels: PricePanelCache):
+        self.user_id = user_id
+        self.cash_remaining = cash_remaining
+        self.current_ts = current_ts
+        self.holdings = holdings
+        self._panels = panels
+        self._price(self._priced_panel())
+
+    def _priced_panel(self) -> PricePanel:
+        symbols = []
+        for symbol in sorted({symbol for symbol, _, _ in self.holdings}):
+            try:
+                self._panels.store.get(symbol)
+            except FileNotFoundError:
+                continue
+            symbols.append(symbol)
+        return self._panels.get(symbols)
+
+    def _price(self, panel: PricePanel) -> None:
+        self.panel = panel
+        priced = [(symbol, quantity, price) for symbol, quantity, price in self.holdings if symbol in panel.symbols]
+        self.quantities = panel.quantities((symbol, quantity) for symbol, quantity, _ in priced)
+        # Stored value of each panel row, used where the symbol has no close yet
+        self.book_values = panel.quantities((symbol, quantity * price) for symbol, quantity, price in priced)
+        self.unpriced_value = sum(quantity * price for symbol, quantity, price in self.holdings if symbol not in panel.symbols)
+        self.reprice(self.current_ts)
+
+    def reprice(self, current_ts: datetime) -> None:
+        """
+        Value the holdings at `current_ts`: one as-of column lookup and one dot product.
+        """
+        self.current_ts = current_ts
+        self.column = column = int(self.panel.asof_columns([current_ts])[0])
+        if column < 0:
+            self.holdings_value = float(self.book_values.sum()) + self.unpriced_value
+            return
+        prices = self.panel.close[:, column]
+        market_values = np.where(np.isnan(prices), self.book_values, self.quantities * np.nan_to_num(prices))
+        self.holdings_value = float(market_values.sum()) + self.unpriced_value
+
+    def refresh(self, panel: PricePanel) -> None:
+        """
+        Re-price against `panel`, the latest panel over the same symbols, if any of them was reloaded since.
+        """
+        if panel is not self.panel:
+            self._price(panel)
+
+    @property
+    def net_worth(self) -> float:
+        return self.holdings_value + self.cash_remaining
+
+
+class NetWorthCache:
+    """
+    LRU of portfolio valuations, so a net-worth poll reads no portfolio from the database and does not
+    re-value its holdings unless their price data changed.
+
+    A trade updates its portfolio's cached valuation in place (cash, and holdings re-priced at the new
+    current_ts); changes to holdings drop it, and the next poll reloads it. Loads that overlap a change to
+    the same portfolio are not cached, so a load can never overwrite a newer update with data read before it.
+    """
+
+    def __init__(self, panels: PricePanelCache = price_panels, max_entries: int = NET_WORTH_CACHE_SIZE):
+        self.panels = panels
+        self.max_entries = max_entries
+        self._valuations: "OrderedDict[str, Valuation]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped on every change; the sequence number of the last change of each recently changed portfolio,
+        # oldest first, and the newest sequence number dropped from it (see `load`)
+        self._sequence = 0
+        self._changes: "OrderedDict[str, int]" = OrderedDict()
+        self._forgotten = 0
+        self.hits = 0
+        self.misses = 0
+        self.updates = 0
+
+    def get(self, portfolio_id: str, user_id: str) -> Optional[float]:
+        """
+        Cached net worth of a portfolio of `user_id`, or None if it has to be loaded.
+
+        The price panel is looked up outside the cache's lock, as it may check the symbols' price data
+        for changes (see PriceStore.get), so call this off the event loop.
+        """
+        with self._lock:
+            valuation = self._valuations.get(portfolio_id)
+            if valuation is None or valuation.user_id != user_id:
+                self.misses += 1
+                return None
+            self._valuations.move_to_end(portfolio_id)
+            self.hits += 1
+            symbols = valuation.panel.symbols
+        panel = self.panels.get(symbols)
+        with self._lock:
+            valuation.refresh(panel)
+            return valuation.net_worth
+
+    def epoch(self) -> int:
+        """
+        Token to pass to `load`, taken before reading the portfolio from the database.
+        """
+        with self._lock:
+            return self._sequence
+
+    def load(self, portfolio_id: str, user_id: str, cash_remaining: float, current_ts: datetime,
+             holdings: Iterable[HoldingRow], epoch: int) -> float:
+        """
+        Value a portfolio read from the database and cache the valuation unless the portfolio changed since `epoch`.
+
+        Returns:
+        float: The portfolio's net worth.
+        """
+        valuation = Valuation(user_id, cash_remaining, current_ts, list(holdings), self.panels)
+        with self._lock:
+            # A portfolio whose last change was forgotten may have changed any time up to `_forgotten`
+            if self._changes.get(portfolio_id, self._forgotten) <= epoch:
+                self._valuations[portfolio_id] = valuation
+                self._valuations.move_to_end(portfolio_id)
+                while len(self._valuations) > self.max_entries:
+                    self._valuations.popitem(last=False)
+        return valuation.net_worth
+
+    def apply_trade(self, portfolio_id: str, cash_remaining: float, current_ts: datetime) -> None:
+        """
+        Update a cached valuation after a trade: new cash, and holdings re-priced if current_ts moved to another day.
+        """
+        with self._lock:
+            self._changed(portfolio_id)
+            valuation = self._valuations.get(portfolio_id)
+            if valuation is None:
+                return
+            valuation.cash_remaining = cash_remaining
+            if valuation.panel.asof_columns([current_ts])[0] != valuation.column:
+                valuation.reprice(current_ts)
+            valuation.current_ts = current_ts
+            self.updates += 1
+
+    def invalidate(self, portfolio_id: str) -> None:
+        with self._lock:
+            self._changed(portfolio_id)
+            self._valuations.pop(portfolio_id, None)
+
+    def _changed(self, portfolio_id: str) -> None:
+        self._sequence += 1
+        self._changes[portfolio_id] = self._sequence
+        self._changes.move_to_end(portfolio_id)
+        while len(self._changes) > self.max_entries:
+            _, self._forgotten = self._changes.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._valuations), "hits": self.hits, "misses": self.misses, "updates": self.updates}
+
+
+net_worth_cache = NetWorthCache()
@@ -41,3 +41,257 @@
 #     )
 #     assert response.status_code == 200
 #     assert response.json() == pytest.approx(0.42, 0.001)  # Mock CAGR value
+
+
+import uuid
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from assessment_app.main import app
+from assessment_app.repository.price_store import asof_rows, price_store, to_day
+from assessment_app.routers import analysis
+from assessment_app.utils.utils import compute_cagr
+from assessment_app.service.auth_service import get_current_user
+from assessment_app.service.result_cache import analysis_cache
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def authenticated():
+    app.dependency_overrides[get_current_user] = lambda: "testuser@example.com"
+    yield
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+def test_get_stocks_analysis_matches_single_window(authenticated):
+    windows = [
+        {"start_ts": "2023-07-19T00:00:00", "end_ts": "2024-07-18T00:00:00"},
+        {"start_ts": "2023-07-22T00:00:00", "end_ts": "2024-07-18T00:00:00"},
+        {"start_ts": "2023-07-20T00:00:00", "end_ts": "2023-12-29T00:00:00"},
+    ]
+    request = {"stock_symbols": ["HDFCBANK", "RELIANCE"], "windows": windows}
+
+    response = client.post("/analysis/estimate_returns/stocks", json=request)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["stock_symbols"] == ["HDFCBANK", "RELIANCE"]
+    for symbol, cagrs in zip(data["stock_symbols"], data["cagr"]):
+        for window, cagr in zip(windows, cagrs):
+            single = client.get("/analysis/estimate_returns/stock", params={"stock_symbol": symbol, **window})
+            assert cagr == pytest.approx(single.json(), rel=1e-12)
+
+
+def test_get_stocks_analysis_unknown_symbol(authenticated):
+    request = {"stock_symbols": ["UNKNOWN"], "windows": [{"start_ts": "2023-07-19T00:00:00", "end_ts": "2024-07-18T00:00:00"}]}
+
+    response = client.post("/analysis/estimate_returns/stocks", json=request)
+
+    assert response.status_code == 404
+
+
+def test_get_stock_rolling_analysis(authenticated):
+    params = {"stock_symbol": "HDFCBANK", "start_ts": "2023-09-01T00:00:00", "end_ts": "2024-07-18T00:00:00", "window": 30}
+
+    response = client.get("/analysis/rolling/stock", params=params)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["timestamps"][0] == "2023-09-01T00:00:00"
+    n = len(data["timestamps"])
+    assert len(data["values"]) == len(data["returns"]) == len(data["volatility"]) == len(data["drawdown"]) == n
+    # Windows reach back before start_ts, so every point in this range is defined
+    assert None not in data["returns"] and None not in data["volatility"]
+    assert max(data["drawdown"]) == 0.0
+    assert data["max_drawdown"] == min(data["drawdown"])
+
+
+def test_get_stock_rolling_analysis_invalid_window(authenticated):
+    params = {"stock_symbol": "HDFCBANK", "start_ts": "2023-09-01T00:00:00", "end_ts": "2024-07-18T00:00:00", "window": 1}
+
+    response = client.get("/analysis/rolling/stock", params=params)
+
+    assert response.status_code == 400
+
+
+@pytest.fixture
+def portfolio_user():
+    # A fresh user per test, so the portfolio endpoints see only the portfolio created here
+    user_id = f"{uuid.uuid4()}@example.com"
+    app.dependency_overrides[get_current_user] = lambda: user_id
+    holdings = [{"symbol": "HDFCBANK", "quantity": 100, "price": 70.0}, {"symbol": "RELIANCE", "quantity": 10, "price": 2000.0}]
+    client.post("/portfolio", json={"strategy_id": "0", "holdings": holdings})
+    yield holdings
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+def close_on(series, ts):
+    # Close of the bar on the (trading) day of ts
+    row = int(asof_rows(series.dates, [to_day(ts)])[0])
+    assert series.dates[row] == to_day(ts)
+    return series.close[row]
+
+
+def test_estimate_portfolio_returns(portfolio_user):
+    params = {"start_ts": "2023-07-19T00:00:00", "end_ts": "2024-07-18T00:00:00"}
+
+    response = client.get("/analysis/estimate_returns/portfolio", params=params)
+
+    assert response.status_code == 200
+    start_value = end_value = 0.0
+    for holding in portfolio_user:
+        series = price_store.get(holding["symbol"])
+        start_value += holding["quantity"] * close_on(series, datetime(2023, 7, 19))
+        end_value += holding["quantity"] * close_on(series, datetime(2024, 7, 18))
+    expected = compute_cagr(start_value, end_value, datetime(2023, 7, 19), datetime(2024, 7, 18))
+    assert response.json() == pytest.approx(expected, rel=1e-12)
+
+
+def test_estimate_portfolio_returns_not_a_trading_day(portfolio_user):
+    params = {"start_ts": "2023-07-22T00:00:00", "end_ts": "2024-07-18T00:00:00"}
+
+    response = client.get("/analysis/estimate_returns/portfolio", params=params)
+
+    # Saturday's value is Friday's close
+    assert response.status_code == 200
+    start_value = end_value = 0.0
+    for holding in portfolio_user:
+        series = price_store.get(holding["symbol"])
+        start_value += holding["quantity"] * close_on(series, datetime(2023, 7, 21))
+        end_value += holding["quantity"] * close_on(series, datetime(2024, 7, 18))
+    expected = compute_cagr(start_value, end_value, datetime(2023, 7, 22), datetime(2024, 7, 18))
+    assert response.json() == pytest.approx(expected, rel=1e-12)
+
+
+def test_estimate_portfolio_returns_before_first_close(portfolio_user):
+    params = {"start_ts": "2020-01-01T00:00:00", "end_ts": "2024-07-18T00:00:00"}
+
+    response = client.get("/analysis/estimate_returns/portfolio", params=params)
+
+    assert response.status_code == 400
+
+
+def test_get_correlation(authenticated):
+    request = {"stock_symbols": ["RELIANCE", "HDFCBANK"], "start_ts": "2023-07-19T00:00:00", "end_ts": "2024-07-18T00:00:00"}
+
+    response = client.post("/analysis/correlation", json=request)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["stock_symbols"] == ["HDFCBANK", "RELIANCE"]
+    assert data["observations"] > 200
+    assert data["correlation"][0][0] == pytest.approx(1.0)
+    assert data["correlation"][0][1] == pytest.approx(data["correlation"][1][0])
+    assert -1.0 <= data["correlation"][0][1] <= 1.0
+    assert data["covariance"][0][1] == pytest.approx(data["covariance"][1][0])
+
+
+def test_get_correlation_defaults_to_all_symbols(authenticated):
+    request = {"start_ts": "2023-07-19T00:00:00", "end_ts": "2024-07-18T00:00:00"}
+
+    response = client.post("/analysis/correlation", json=request)
+
+    assert response.status_code == 200
+    assert response.json()["stock_symbols"] == ["HDFCBANK", "ICICIBANK", "RELIANCE", "TATAMOTORS"]
+
+
+def test_estimate_portfolio_returns_is_cached(portfolio_user):
+    params = {"start_ts": "2023-07-19T00:00:00", "end_ts": "2024-07-18T00:00:00"}
+    before = client.get("/analysis/cache/stats").json()["endpoints"].get("estimate_returns/portfolio", {"hits": 0})
+
+    first = client.get("/analysis/estimate_returns/portfolio", params=params)
+    second = client.get("/analysis/estimate_returns/portfolio", params=params)
+
+    assert first.json() == second.json()
+    after = client.get("/analysis/cache/stats").json()["endpoints"]["estimate_returns/portfolio"]
+    assert after["hits"] == before["hits"] + 1
+
+
+def test_get_portfolio_risk(portfolio_user):
+    params = {"start_ts": "2023-07-19T00:00:00", "end_ts": "2024-07-18T00:00:00", "simulations": 50000, "seed": 11}
+
+    response = client.get("/analysis/risk/portfolio", params=params)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["seed"] == 11 and data["observations"] > 200
+    for estimate in (data["historical"], data["monte_carlo"]):
+        assert 0 < estimate["value_at_risk"] <= estimate["expected_shortfall"] < data["portfolio_value"]
+    # Same seed, same paths: served from a fresh computation once the cache is cleared
+    analysis_cache.clear()
+    assert client.get("/analysis/risk/portfolio", params=params).json() == data
+
+
+def test_get_portfolio_risk_without_seed_is_not_cached(portfolio_user):
+    params = {"start_ts": "2023-07-19T00:00:00", "end_ts": "2024-07-18T00:00:00", "simulations": 1000}
+    analysis_cache.clear()
+
+    first = client.get("/analysis/risk/portfolio", params=params).json()
+    second = client.get("/analysis/risk/portfolio", params=params).json()
+
+    assert first["seed"] != second["seed"]
+    assert analysis_cache.stats()["entries"] == 0
+
+
+def test_get_portfolio_risk_invalid_confidence(portfolio_user):
+    params = {"start_ts": "2023-07-19T00:00:00", "end_ts": "2024-07-18T00:00:00", "confidence": 1.5}
+
+    response = client.get("/analysis/risk/portfolio", params=params)
+
+    assert response.status_code == 400
+
+
+def test_get_portfolio_risk_negative_seed(portfolio_user):
+    params = {"start_ts": "2023-07-19T00:00:00", "end_ts": "2024-07-18T00:00:00", "seed": -1}
+
+    response = client.get("/analysis/risk/portfolio", params=params)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Seed must not be negative"
+
+
+def create_portfolio(holdings):
+    return client.post("/portfolio", json={"strategy_id": "0", "holdings": holdings}).json()["id"]
+
+
+def test_optimize_portfolio(portfolio_user):
+    portfolio_id = create_portfolio(portfolio_user)
+    request = {"portfolio_id": portfolio_id, "start_ts": "2023-07-19T00:00:00", "end_ts": "2024-07-18T00:00:00",
+               "max_weight": 0.8, "frontier_points": 100}
+
+    response = client.post("/analysis/optimize/portfolio", json=request)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["stock_symbols"] == ["HDFCBANK", "RELIANCE"]
+    assert len(data["frontier"]) == 100
+    for point in data["frontier"]:
+        assert sum(point["weights"]) == pytest.approx(1.0)
+        assert max(point["weights"]) <= 0.8 + 1e-12
+    assert data["min_variance"]["volatility"] <= data["optimal"]["volatility"]
+    assert sum(data["current"]["weights"]) == pytest.approx(1.0)
+
+
+def test_optimize_portfolio_over_size_budget(portfolio_user, monkeypatch):
+    monkeypatch.setattr(analysis, "MAX_FRONTIER_SIZE", 100)
+    portfolio_id = create_portfolio(portfolio_user)
+    request = {"portfolio_id": portfolio_id, "start_ts": "2023-07-19T00:00:00", "end_ts": "2024-07-18T00:00:00",
+               "frontier_points": 51}
+
+    response = client.post("/analysis/optimize/portfolio", json=request)
+
+    assert response.status_code == 400
+    assert "at most 50 points" in response.json()["detail"]
+
+
+def test_optimize_portfolio_unknown_symbol(portfolio_user):
+    portfolio_id = create_portfolio(portfolio_user + [{"symbol": "UNKNOWN", "quantity": 1, "price": 1.0}])
+    request = {"portfolio_id": portfolio_id, "start_ts": "2023-07-19T00:00:00", "end_ts": "2024-07-18T00:00:00"}
+
+    response = client.post("/analysis/optimize/portfolio", json=request)
+
+    assert response.status_code == 400
+    assert "UNKNOWN" in response.json()["detail"]
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from assessment_app.service.analytics import (
+    covariance_matrices, drawdown, rolling_analytics, rolling_returns, rolling_volatility
+)
+
+
+@pytest.fixture
+def values():
+    rng = np.random.default_rng(0)
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.02, 300)))
+
+
+def test_rolling_returns(values):
+    returns = rolling_returns(values, 30)
+
+    assert np.isnan(returns[:30]).all()
+    expected = [(values[i] / values[i - 30] - 1) * 100 for i in range(30, len(values))]
+    assert np.allclose(returns[30:], expected)
+
+
+def test_rolling_volatility_matches_window_std(values):
+    volatility = rolling_volatility(values, 30)
+
+    log_returns = np.diff(np.log(values))
+    expected = [np.std(log_returns[i - 30:i], ddof=1) * np.sqrt(252) * 100 for i in range(30, len(values))]
+    assert np.isnan(volatility[:30]).all()
+    assert np.allclose(volatility[30:], expected, rtol=1e-9)
+
+
+def test_rolling_short_series():
+    values = np.array([100.0, 101.0, 102.0])
+
+    stats = rolling_analytics(values, 5)
+
+    assert np.isnan(stats["returns"]).all()
+    assert np.isnan(stats["volatility"]).all()
+
+
+def test_drawdown():
+    values = np.array([100.0, 120.0, 90.0, 130.0, 117.0])
+
+    assert np.allclose(drawdown(values), [0.0, 0.0, -25.0, 0.0, -10.0])
+    assert len(drawdown(np.empty(0))) == 0
+
+
+def test_covariance_matrices():
+    rng = np.random.default_rng(1)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (3, 100)), axis=1))
+    close[2, :10] = np.nan
+
+    covariance, correlation, observations = covariance_matrices(close)
+
+    returns = np.diff(np.log(close[:, 10:]), axis=1)
+    assert observations == 89
+    assert np.allclose(covariance, np.cov(returns))
+    assert np.allclose(correlation, np.corrcoef(returns))
+
+
+def test_covariance_matrices_too_few_prices():
+    covariance, correlation, observations = covariance_matrices(np.array([[1.0, 2.0], [3.0, 4.0]]))
+
+    assert observations == 1
+    assert np.isnan(covariance).all() and np.isnan(correlation).all()
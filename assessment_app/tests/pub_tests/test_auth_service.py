@@ -66,7 +66,7 @@ def test_get_current_user_valid_token(test_user_token):
     
     response = client.get("/strategies")
     assert response.status_code == 200
-    assert response.json() == [{'id': '0', 'name': 'default'}]
+    assert response.json()[0] == {'id': '0', 'name': 'default', 'parameters': {}}
 
 def test_get_current_user_invalid_token():
     invalid_token = "invalid_token"
@@ -0,0 +1,137 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from fastapi import HTTPException
+
+from assessment_app.service.backtest_engine import MIN_WINDOW, simulate_holding, simulate_portfolio
+from assessment_app.service.executor import BoundedPool
+from assessment_app.service.strategies import candle_direction
+
+
+def bars(opens, closes):
+    opens, closes = np.array(opens, dtype=float), np.array(closes, dtype=float)
+    return (*candle_direction(opens, closes), closes)
+
+
+def as_list(fills):
+    rows, buys = fills
+    return list(zip(rows.tolist(), buys.tolist()))
+
+
+def simulate_bar_by_bar(opens, closes, capital, quantity):
+    fills = []
+    for row, (open_price, close) in enumerate(zip(opens.tolist(), closes.tolist())):
+        if capital <= 0:
+            break
+        if close < open_price and capital >= 100 * close:
+            capital -= 100 * close
+            quantity += 100
+            fills.append((row, True))
+        elif close > open_price and quantity >= 100:
+            capital += 100 * close
+            quantity -= 100
+            fills.append((row, False))
+    return capital, quantity, fills
+
+
+def test_simulate_holding():
+    capital, quantity, fills = simulate_holding(*bars([10.0, 10.0, 10.0, 10.0], [9.0, 11.0, 10.0, 12.0]), 1000.0, 0)
+
+    assert as_list(fills) == [(0, True), (1, False)]
+    assert capital == 1200.0
+    assert quantity == 0
+
+
+def test_simulate_holding_needs_cash_and_units():
+    capital, quantity, fills = simulate_holding(*bars([10.0, 10.0], [9.0, 11.0]), 500.0, 50)
+
+    assert as_list(fills) == []
+    assert (capital, quantity) == (500.0, 50)
+
+
+def test_simulate_holding_stops_without_cash():
+    holding = bars([10.0, 10.0, 10.0, 10.0], [10.0, 11.0, 9.0, 11.0])
+
+    # A buy may spend the last of the cash, after which nothing trades
+    capital, quantity, fills = simulate_holding(*holding, 900.0, 0)
+
+    assert as_list(fills) == [(2, True)]
+    assert (capital, quantity) == (0.0, 100)
+    assert as_list(simulate_holding(*holding, 0.0, 100)[2]) == []
+
+
+@pytest.mark.parametrize("capital, quantity", [(1e3, 0), (2e4, 0), (1e5, 250), (1e9, 0), (5e3, -300)])
+def test_simulate_holding_matches_bar_by_bar(capital, quantity):
+    rng = np.random.default_rng(int(capital) + quantity)
+    closes = np.exp(np.cumsum(rng.normal(0, 0.02, 8 * MIN_WINDOW))) * 10
+    opens = np.round(closes * np.exp(rng.normal(0, 0.01, len(closes))), 2)
+    closes = np.round(closes, 2)
+
+    capital_left, quantity_left, fills = simulate_holding(*candle_direction(opens, closes), closes, capital, quantity)
+
+    assert (capital_left, quantity_left, as_list(fills)) == simulate_bar_by_bar(opens, closes, capital, quantity)
+
+
+def test_simulate_portfolio_carries_cash():
+    first = (np.array([10.0]), np.array([9.0]), 0)
+    second = (np.array([10.0]), np.array([5.0]), 0)
+
+    capital, quantities, fills = simulate_portfolio([first, second], 1000.0, candle_direction, {})
+
+    assert quantities == [100, 0]
+    assert [as_list(holding_fills) for holding_fills in fills] == [[(0, True)], []]
+    assert capital == 100.0
+
+
+def test_bounded_pool_rejects_when_full():
+    pool = BoundedPool("test", lambda: None, max_workers=1, max_queue=0)
+    pool.in_flight = 1
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(pool.run(sum, [1, 2]))
+
+    assert exc.value.status_code == 503
+    assert pool.stats()["rejected"] == 1
+
+
+def test_bounded_pool_runs():
+    pool = BoundedPool("test", lambda: ThreadPoolExecutor(1), 1, 1)
+    try:
+        assert asyncio.run(pool.run(sum, [1, 2])) == 3
+        assert pool.stats()["completed"] == 1
+        assert pool.stats()["in_flight"] == 0
+    finally:
+        pool.shutdown()
+
+
+def test_bounded_pool_counts_failures_apart():
+    pool = BoundedPool("test", lambda: ThreadPoolExecutor(1), 1, 1)
+    try:
+        with pytest.raises(TypeError):
+            asyncio.run(pool.run(sum, [1, "2"]))
+        assert pool.stats()["completed"] == 0
+        assert pool.stats()["failed"] == 1
+        assert pool.stats()["in_flight"] == 0
+    finally:
+        pool.shutdown()
+
+
+def test_bounded_pool_creates_one_executor_across_threads():
+    created = []
+
+    def factory():
+        time.sleep(0.05)
+        created.append(1)
+        return ThreadPoolExecutor(1)
+
+    pool = BoundedPool("test", factory, 1, 1)
+    try:
+        with ThreadPoolExecutor(4) as threads:
+            executors = list(threads.map(lambda _: pool.executor, range(4)))
+        assert len(created) == 1
+        assert all(executor is executors[0] for executor in executors)
+    finally:
+        pool.shutdown()
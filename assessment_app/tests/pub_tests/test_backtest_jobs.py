@@ -0,0 +1,195 @@
+import threading
+import time
+import uuid
+from datetime import timedelta
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from assessment_app.main import app
+from assessment_app.models.schema import BacktestJobORM
+from assessment_app.repository.database import get_db
+from assessment_app.routers import backtest
+from assessment_app.service.auth_service import get_current_user
+from assessment_app.service.jobs import BACKTEST_JOB_LEASE_SECONDS, JobRunner
+
+client = TestClient(app)
+
+BACKTEST = {"strategy_id": "0", "start_date": "2023-07-19T00:00:00", "end_date": "2024-07-18T00:00:00",
+            "initial_capital": 100000.0}
+
+
+def test_job_runner_runs_and_bounds_backlog():
+    release = threading.Event()
+    ran = []
+
+    def run(job_id):
+        release.wait(5)
+        ran.append(job_id)
+
+    runner = JobRunner("test", run, max_workers=1, max_queue=1)
+    try:
+        runner.submit("a")
+        runner.submit("b")
+        runner.submit("b")
+        with pytest.raises(HTTPException) as exc:
+            runner.check_capacity()
+        assert exc.value.status_code == 503
+        # A submit past the early check is rejected too, unless it resubmits an accepted job
+        with pytest.raises(HTTPException) as exc:
+            runner.submit("c")
+        assert exc.value.status_code == 503
+        runner.submit("d", bounded=False)
+        assert runner.cancel("d")
+        # "b" has not started, so it can be dropped
+        assert runner.cancel("b")
+        release.set()
+        for _ in range(100):
+            if runner.stats()["in_flight"] == 0:
+                break
+            time.sleep(0.01)
+        assert ran == ["a"]
+        assert runner.stats()["completed"] == 1
+        assert not runner.cancel("a")
+    finally:
+        runner.shutdown()
+
+
+@pytest.fixture
+def portfolio_id():
+    user_id = f"{uuid.uuid4()}@example.com"
+    app.dependency_overrides[get_current_user] = lambda: user_id
+    holdings = [{"symbol": "HDFCBANK", "quantity": 100, "price": 70.0}, {"symbol": "RELIANCE", "quantity": 10, "price": 2000.0}]
+    yield client.post("/portfolio", json={"strategy_id": "0", "holdings": holdings}).json()["id"]
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+@pytest.fixture
+def run_job(monkeypatch):
+    # Jobs are queued but only run when the test runs them, on the database the app's requests use
+    monkeypatch.setattr(backtest.backtest_jobs, "submit", lambda job_id, bind, bounded=True: None)
+    sessions = app.dependency_overrides.get(get_db, get_db)()
+    bind = next(sessions).get_bind()
+    run = lambda job_id: backtest.run_backtest_job(job_id, bind)
+    run.bind = bind
+    yield run
+    sessions.close()
+
+
+def cash_remaining(portfolio_id):
+    return client.get(f"/portfolio/{portfolio_id}", params={"current_ts": "2024-07-18T00:00:00"}).json()["cash_remaining"]
+
+
+def test_job_runs_backtest(portfolio_id):
+    response = client.post("/backtest/jobs", json={**BACKTEST, "portfolio_id": portfolio_id})
+
+    assert response.status_code == 202
+    job_id = response.json()["id"]
+    for _ in range(200):
+        job = client.get(f"/backtest/jobs/{job_id}").json()
+        if job["status"] not in ("QUEUED", "RUNNING"):
+            break
+        time.sleep(0.05)
+    assert job["status"] == "SUCCEEDED"
+    assert job["result"]["trades"]
+    assert job["result"]["profit_loss"] == job["result"]["final_capital"] - BACKTEST["initial_capital"]
+    assert cash_remaining(portfolio_id) == job["result"]["final_capital"]
+
+
+def test_cancel_queued_job(portfolio_id, run_job):
+    job_id = client.post("/backtest/jobs", json={**BACKTEST, "portfolio_id": portfolio_id}).json()["id"]
+
+    assert client.post(f"/backtest/jobs/{job_id}/cancel").json()["status"] == "CANCELLED"
+
+    run_job(job_id)
+    assert client.get(f"/backtest/jobs/{job_id}").json()["status"] == "CANCELLED"
+
+
+def test_cancel_running_job_rolls_back(portfolio_id, run_job, monkeypatch):
+    cash = cash_remaining(portfolio_id)
+    job_id = client.post("/backtest/jobs", json={**BACKTEST, "portfolio_id": portfolio_id}).json()["id"]
+    apply_backtest = backtest.apply_backtest
+
+    def cancel_while_running(*args):
+        assert client.post(f"/backtest/jobs/{job_id}/cancel").json()["status"] == "RUNNING"
+        return apply_backtest(*args)
+
+    monkeypatch.setattr(backtest, "apply_backtest", cancel_while_running)
+    run_job(job_id)
+
+    job = client.get(f"/backtest/jobs/{job_id}").json()
+    assert job["status"] == "CANCELLED" and job["result"] is None
+    assert cash_remaining(portfolio_id) == cash
+
+
+def test_failed_job(portfolio_id, run_job):
+    job_id = client.post("/backtest/jobs", json={**BACKTEST, "portfolio_id": portfolio_id}).json()["id"]
+    client.delete(f"/portfolio/{portfolio_id}")
+
+    run_job(job_id)
+
+    job = client.get(f"/backtest/jobs/{job_id}").json()
+    assert job["status"] == "FAILED"
+    assert job["error"] == "Portfolio not found"
+
+
+def update_job(bind, job_id, **values):
+    db = Session(bind=bind)
+    db.query(BacktestJobORM).filter(BacktestJobORM.id == job_id).update(values)
+    db.commit()
+    db.close()
+
+
+def test_reclaim_requeues_only_expired_leases(portfolio_id, run_job):
+    stale, fresh = (client.post("/backtest/jobs", json={**BACKTEST, "portfolio_id": portfolio_id}).json()["id"]
+                    for _ in range(2))
+    now = backtest.utc_now()
+    update_job(run_job.bind, stale, status="RUNNING", owner="gone:1",
+               heartbeat_at=now - timedelta(seconds=2 * BACKTEST_JOB_LEASE_SECONDS))
+    update_job(run_job.bind, fresh, status="RUNNING", owner="alive:1", heartbeat_at=now)
+
+    assert backtest.reclaim_backtest_jobs(run_job.bind) == [stale]
+    assert client.get(f"/backtest/jobs/{stale}").json()["status"] == "QUEUED"
+    assert client.get(f"/backtest/jobs/{fresh}").json()["status"] == "RUNNING"
+
+    run_job(stale)
+    assert client.get(f"/backtest/jobs/{stale}").json()["status"] == "SUCCEEDED"
+
+
+def test_job_taken_over_is_not_committed(portfolio_id, run_job, monkeypatch):
+    cash = cash_remaining(portfolio_id)
+    job_id = client.post("/backtest/jobs", json={**BACKTEST, "portfolio_id": portfolio_id}).json()["id"]
+    apply_backtest = backtest.apply_backtest
+
+    def lose_lease(*args):
+        update_job(run_job.bind, job_id, status="QUEUED", owner=None)
+        return apply_backtest(*args)
+
+    monkeypatch.setattr(backtest, "apply_backtest", lose_lease)
+    run_job(job_id)
+
+    job = client.get(f"/backtest/jobs/{job_id}").json()
+    assert job["status"] == "QUEUED" and job["result"] is None
+    assert cash_remaining(portfolio_id) == cash
+
+
+def test_job_taken_over_does_not_record_its_failure(portfolio_id, run_job, monkeypatch):
+    job_id = client.post("/backtest/jobs", json={**BACKTEST, "portfolio_id": portfolio_id}).json()["id"]
+
+    def fail_after_takeover(*args):
+        update_job(run_job.bind, job_id, owner="other:1")
+        raise HTTPException(status_code=400, detail="Lost the lease")
+
+    monkeypatch.setattr(backtest, "apply_backtest", fail_after_takeover)
+    run_job(job_id)
+
+    job = client.get(f"/backtest/jobs/{job_id}").json()
+    assert job["status"] == "RUNNING" and job["error"] is None
+
+
+def test_unknown_job(portfolio_id):
+    assert client.get("/backtest/jobs/missing").status_code == 404
+    assert client.post("/backtest/jobs/missing/cancel").status_code == 404
+    assert client.post("/backtest/jobs", json={**BACKTEST, "portfolio_id": "missing"}).status_code == 404
@@ -0,0 +1,150 @@
+import asyncio
+import json
+import threading
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from assessment_app.main import app
+from assessment_app.routers import backtest
+from assessment_app.service.auth_service import get_current_user
+from assessment_app.service.progress import ProgressChannel
+
+client = TestClient(app)
+
+BACKTEST = {"strategy_id": "1", "start_date": "2023-07-19T00:00:00", "end_date": "2024-07-18T00:00:00",
+            "initial_capital": 100000.0}
+
+
+def read_all(channel):
+    async def read():
+        return [message async for message in channel.messages()]
+    return asyncio.run(read())
+
+
+def test_channel_drops_oldest_progress_for_slow_reader():
+    channel = ProgressChannel(max_pending=3)
+    for step in range(10):
+        channel.publish("progress", step)
+    channel.close("result", "done")
+
+    assert read_all(channel) == [("progress", 7, 7), ("progress", 8, 0), ("progress", 9, 0), ("result", "done", 0)]
+
+
+def test_channel_keeps_up_with_fast_reader():
+    async def produce_and_read():
+        channel = ProgressChannel(max_pending=1)
+
+        async def produce():
+            for step in range(5):
+                channel.publish("progress", step)
+                await asyncio.sleep(0)
+            channel.close("result", "done")
+
+        producer = asyncio.create_task(produce())
+        messages = [message async for message in channel.messages()]
+        await producer
+        return messages
+
+    assert asyncio.run(produce_and_read()) == [("progress", step, 0) for step in range(5)] + [("result", "done", 0)]
+
+
+@pytest.fixture
+def new_portfolio():
+    user_id = f"{uuid.uuid4()}@example.com"
+    app.dependency_overrides[get_current_user] = lambda: user_id
+    holdings = [{"symbol": "HDFCBANK", "quantity": 100, "price": 70.0}, {"symbol": "RELIANCE", "quantity": 10, "price": 2000.0}]
+    yield lambda: client.post("/portfolio", json={"strategy_id": "0", "holdings": holdings}).json()["id"]
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+def parse_events(text):
+    events = []
+    for block in text.strip().split("\n\n"):
+        event, data = block.split("\n")
+        events.append((event[len("event: "):], json.loads(data[len("data: "):])))
+    return events
+
+
+def test_stream_backtest_matches_backtest(new_portfolio, monkeypatch):
+    expected = client.post("/backtest", json={**BACKTEST, "portfolio_id": new_portfolio()}).json()
+    monkeypatch.setattr(backtest, "BACKTEST_PROGRESS_BARS", 100)
+
+    response = client.post("/backtest/stream", json={**BACKTEST, "portfolio_id": new_portfolio()})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = parse_events(response.text)
+    assert [event for event, _ in events] == ["progress"] * 6 + ["result"]
+    progress = [data for _, data in events[:-1]]
+    assert [point["symbol"] for point in progress] == ["HDFCBANK"] * 3 + ["RELIANCE"] * 3
+    assert progress[-1]["percent"] == 100.0
+    assert progress[-1]["current_date"] == "2024-07-18T00:00:00"
+    assert progress[-1]["capital"] == expected["final_capital"]
+    assert progress[-1]["trades"] == len(expected["trades"])
+    assert events[-1][1] == expected
+
+
+def test_stream_backtest_unknown_portfolio(new_portfolio):
+    response = client.post("/backtest/stream", json={**BACKTEST, "portfolio_id": "missing"})
+
+    assert response.status_code == 404
+
+
+@pytest.mark.parametrize("path", ["/backtest", "/backtest/stream", "/backtest/jobs"])
+def test_backtest_rejects_infinite_parameter(new_portfolio, path):
+    request = json.dumps({**BACKTEST, "portfolio_id": new_portfolio()})[:-1] + ', "parameters": {"fast": Infinity}}'
+
+    response = client.post(path, content=request, headers={"Content-Type": "application/json"})
+
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("path", ["/backtest", "/backtest/stream"])
+def test_backtest_rejects_symbol_outside_data_dir(new_portfolio, path):
+    holdings = [{"symbol": "../data/HDFCBANK", "quantity": 100, "price": 70.0}]
+    portfolio_id = client.post("/portfolio", json={"strategy_id": "0", "holdings": holdings}).json()["id"]
+
+    response = client.post(path, json={**BACKTEST, "portfolio_id": portfolio_id})
+
+    assert response.status_code == 400
+    assert "../data/HDFCBANK" in response.json()["detail"]
+
+
+def test_stream_cancelled_while_committing_closes_after_commit(monkeypatch):
+    events = []
+    committing = threading.Event()
+    release = threading.Event()
+
+    class Session:
+        def commit(self):
+            committing.set()
+            release.wait(5)
+            events.append("commit")
+
+        def close(self):
+            events.append("close")
+
+    async def simulate(*args):
+        return None
+
+    monkeypatch.setattr(backtest, "simulate_with_progress", simulate)
+    monkeypatch.setattr(backtest, "apply_backtest", lambda *args: None)
+    monkeypatch.setattr(backtest, "backtest_committed", lambda portfolio_id: events.append("invalidate"))
+
+    async def cancel_while_committing():
+        producer = asyncio.create_task(backtest.run_streamed_backtest(
+            None, None, {}, Session(), SimpleNamespace(id="p"), [], ProgressChannel()
+        ))
+        await asyncio.get_running_loop().run_in_executor(None, committing.wait, 5)
+        producer.cancel()
+        await asyncio.sleep(0.05)
+        assert events == []
+        release.set()
+        with pytest.raises(asyncio.CancelledError):
+            await producer
+
+    asyncio.run(cancel_while_committing())
+    assert events == ["commit", "invalidate", "close"]
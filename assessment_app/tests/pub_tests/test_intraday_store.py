@@ -0,0 +1,99 @@
+from datetime import date, datetime
+
+import numpy as np
+import pytest
+
+from assessment_app.repository import intraday_store as intraday_module
+from assessment_app.repository.intraday_store import IntradayStore, bars_at, bars_between
+from assessment_app.repository.price_store import DAILY, INTRADAY, PriceStore, to_day
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    (tmp_path / "TEST.csv").write_text(
+        "Date,Open,High,Low,Close,Adj Close,Volume\n"
+        "2023-07-19,614.0,621.0,613.0,620.6,620.6,1000\n"
+        "2023-07-20,622.65,625.0,620.0,621.65,621.65,1200\n"
+        "2023-07-21,621.0,627.0,620.5,625.75,625.75,1500\n"
+    )
+    partitions = tmp_path / "intraday" / "TEST"
+    partitions.mkdir(parents=True)
+    for day in ("2023-07-19", "2023-07-20"):
+        (partitions / f"{day}.csv").write_text(
+            "Datetime,Open,High,Low,Close,Volume\n"
+            f"{day} 09:15:00,614.0,615.0,613.5,614.5,10\n"
+            f"{day} 09:16:00,614.5,616.0,614.0,615.5,20\n"
+            f"{day} 09:17:00,615.5,616.5,615.0,616.0,30\n"
+        )
+    (partitions / "notes.csv").write_text("not a day partition\n")
+    return tmp_path
+
+
+@pytest.fixture
+def stores(data_dir, monkeypatch):
+    daily = PriceStore(str(data_dir))
+    intraday = IntradayStore(str(data_dir / "intraday"))
+    monkeypatch.setattr(intraday_module, "price_store", daily)
+    monkeypatch.setattr(intraday_module, "intraday_store", intraday)
+    return daily, intraday
+
+
+def test_days(data_dir):
+    store = IntradayStore(str(data_dir / "intraday"))
+
+    assert store.days("TEST").tolist() == [to_day(date(2023, 7, 19)), to_day(date(2023, 7, 20))]
+    assert store.days("MISSING").tolist() == []
+    assert store.has_day("TEST", datetime(2023, 7, 20, 10, 0))
+    assert not store.has_day("TEST", datetime(2023, 7, 21, 10, 0))
+
+
+def test_get_day_loads_only_that_partition(data_dir):
+    store = IntradayStore(str(data_dir / "intraday"))
+
+    series = store.get_day("TEST", to_day(date(2023, 7, 20)))
+
+    assert series.unit == INTRADAY
+    assert series.symbol == "TEST"
+    assert series.dates[1] == series.key(datetime(2023, 7, 20, 9, 16))
+    assert series.asof(datetime(2023, 7, 20, 9, 16, 30)) == 1
+    assert series.timestamp(series.dates[0]) == datetime(2023, 7, 20, 9, 15)
+    assert list(store.partitions.stats()["symbols"]) == ["TEST/2023-07-20"]
+
+
+def test_get_range_across_days(data_dir):
+    store = IntradayStore(str(data_dir / "intraday"))
+
+    series = store.get_range("TEST", datetime(2023, 7, 19, 9, 16), datetime(2023, 7, 20, 9, 15))
+
+    assert series.iso_timestamps(slice(None)) == [
+        "2023-07-19T09:16:00", "2023-07-19T09:17:00", "2023-07-20T09:15:00",
+    ]
+    assert series.close.tolist() == [615.5, 616.0, 614.5]
+    assert series.datetimes(np.array([0, 2])) == [datetime(2023, 7, 19, 9, 16), datetime(2023, 7, 20, 9, 15)]
+
+
+def test_bars_at(stores):
+    assert bars_at("TEST", datetime(2023, 7, 19, 9, 15)).unit == INTRADAY
+    assert bars_at("TEST", datetime(2023, 7, 19)).unit == DAILY
+    assert bars_at("TEST", datetime(2023, 7, 21, 9, 15)).unit == DAILY
+
+
+def test_bars_between(stores):
+    daily = bars_between("TEST", datetime(2023, 7, 20), datetime(2023, 7, 21))
+    intraday = bars_between("TEST", datetime(2023, 7, 20, 9, 16), datetime(2023, 7, 21, 15, 30))
+
+    assert daily.unit == DAILY
+    assert daily.close.tolist() == [621.65, 625.75]
+    assert intraday.unit == INTRADAY
+    # 2023-07-21 has no partition, so its daily bar stands in for the day
+    assert intraday.close.tolist() == [615.5, 616.0, 625.75]
+    assert intraday.iso_timestamps(slice(None)) == [
+        "2023-07-20T09:16:00", "2023-07-20T09:17:00", "2023-07-21T00:00:00",
+    ]
+
+
+def test_bars_between_keeps_daily_bars_before_the_first_partition(stores):
+    series = bars_between("TEST", datetime(2023, 7, 18, 9, 30), datetime(2023, 7, 19, 9, 15))
+
+    assert series.close.tolist() == [614.5]
+    assert bars_between("TEST", datetime(2023, 7, 1, 9, 30), datetime(2023, 7, 1, 15, 30)).close.tolist() == []
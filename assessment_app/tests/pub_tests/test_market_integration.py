@@ -100,4 +100,189 @@
 #     portfolio = db.query(Portfolio).filter(Portfolio.id == "1").first()
 #     assert portfolio is not None
 #     assert portfolio.cash_remaining == 1000000.0 - (620.0 * 10)
-#     assert portfolio.current_ts.date() == datetime.now(pytz.timezone('Asia/Kolkata')).date()
\ No newline at end of file
+#     assert portfolio.current_ts.date() == datetime.now(pytz.timezone('Asia/Kolkata')).date()
+
+import json
+from datetime import datetime
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from assessment_app.main import app
+from assessment_app.models.constants import StreamFormat
+from assessment_app.repository.price_store import PriceSeries, to_day
+from assessment_app.routers.market_integration import iter_tick_rows
+from assessment_app.service.auth_service import get_current_user
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def authenticated():
+    app.dependency_overrides[get_current_user] = lambda: "testuser@example.com"
+    yield
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+@pytest.fixture
+def series():
+    days = np.array([to_day(datetime(2023, 7, d)) for d in (19, 20, 21)], dtype=np.int64)
+    return PriceSeries(
+        symbol="TEST",
+        dates=days,
+        open_=np.array([614.0, 622.65, 621.0]),
+        high=np.array([621.0, 625.0, 627.0]),
+        low=np.array([613.0, 620.0, 620.5]),
+        close=np.array([620.6, 621.65, 625.75]),
+        volume=np.array([1000, 1200, 1500], dtype=np.int64),
+    )
+
+
+def test_iter_tick_rows_ndjson(series):
+    chunks = list(iter_tick_rows(series, slice(1, 3), StreamFormat.NDJSON, chunk_rows=1))
+
+    assert len(chunks) == 2
+    rows = [json.loads(line) for line in "".join(chunks).splitlines()]
+    assert rows == [
+        {"stock_symbol": "TEST", "timestamp": "2023-07-20T00:00:00", "price": (622.65 + 621.65) / 2},
+        {"stock_symbol": "TEST", "timestamp": "2023-07-21T00:00:00", "price": (621.0 + 625.75) / 2},
+    ]
+
+
+def test_iter_tick_rows_csv(series):
+    lines = "".join(iter_tick_rows(series, slice(0, 1), StreamFormat.CSV)).splitlines()
+
+    assert lines == ["stock_symbol,timestamp,price", f"TEST,2023-07-19T00:00:00,{(614.0 + 620.6) / 2!r}"]
+
+
+def test_stream_market_data_range_matches_range(authenticated):
+    params = {"stock_symbol": "ICICIBANK", "from_ts": "2023-07-19T00:00:00", "to_ts": "2023-08-31T00:00:00"}
+
+    expected = client.post("/market/data/range", params=params)
+    response = client.post("/market/data/range/stream", params=params)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert [json.loads(line) for line in response.text.splitlines()] == expected.json()
+
+
+def test_stream_market_data_range_empty(authenticated):
+    params = {"stock_symbol": "ICICIBANK", "from_ts": "2030-01-01T00:00:00", "to_ts": "2030-02-01T00:00:00"}
+
+    response = client.post("/market/data/range/stream", params=params)
+
+    assert response.status_code == 404
+
+
+def test_get_market_data_ticks(authenticated):
+    timestamps = ["2023-07-20T00:00:00", "2023-07-22T00:00:00", "2024-07-18T00:00:00"]
+    request = {"stock_symbols": ["HDFCBANK", "RELIANCE"], "timestamps": timestamps}
+
+    response = client.post("/market/data/ticks", json=request)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["stock_symbols"] == ["HDFCBANK", "RELIANCE"]
+    assert len(data["prices"]) == 2
+    for symbol, prices in zip(data["stock_symbols"], data["prices"]):
+        for ts, price in zip(timestamps, prices):
+            tick = client.post("/market/data/tick", params={"stock_symbol": symbol, "current_ts": ts}).json()
+            assert price == tick["price"]
+        # Saturday resolves to Friday's bar
+        friday = client.post("/market/data/tick", params={"stock_symbol": symbol, "current_ts": "2023-07-21T00:00:00"}).json()
+        assert prices[1] == friday["price"]
+
+
+def test_get_market_data_tick_before_first_bar(authenticated):
+    params = {"stock_symbol": "HDFCBANK", "current_ts": "2020-01-01T00:00:00"}
+
+    response = client.post("/market/data/tick", params=params)
+
+    assert response.status_code == 404
+
+
+def test_get_market_data_ticks_unknown_symbol(authenticated):
+    request = {"stock_symbols": ["UNKNOWN"], "timestamps": ["2023-07-20T00:00:00"]}
+
+    response = client.post("/market/data/ticks", json=request)
+
+    assert response.status_code == 404
+
+
+@pytest.fixture
+def intraday_data(tmp_path, monkeypatch):
+    from assessment_app.repository import intraday_store as intraday_module
+    from assessment_app.repository.intraday_store import IntradayStore
+    from assessment_app.routers import market_integration
+
+    partitions = tmp_path / "HDFCBANK"
+    partitions.mkdir()
+    (partitions / "2023-07-20.csv").write_text(
+        "Datetime,Open,High,Low,Close,Volume\n"
+        "2023-07-20 09:15:00,70.0,70.5,69.9,70.2,100\n"
+        "2023-07-20 09:16:00,70.2,70.6,70.1,70.4,200\n"
+    )
+    store = IntradayStore(str(tmp_path))
+    monkeypatch.setattr(intraday_module, "intraday_store", store)
+    monkeypatch.setattr(market_integration, "intraday_store", store)
+    return store
+
+
+def test_get_market_data_tick_intraday(authenticated, intraday_data):
+    params = {"stock_symbol": "HDFCBANK", "current_ts": "2023-07-20T09:16:00"}
+
+    response = client.post("/market/data/tick", params=params)
+
+    assert response.status_code == 200
+    assert response.json()["price"] == pytest.approx((70.2 + 70.4) / 2)
+
+    # Midnight timestamps still resolve to the daily bar
+    daily = client.post("/market/data/tick", params={"stock_symbol": "HDFCBANK", "current_ts": "2023-07-20T00:00:00"})
+    assert daily.json()["price"] != response.json()["price"]
+
+
+def test_get_market_data_range_intraday(authenticated, intraday_data):
+    params = {"stock_symbol": "HDFCBANK", "from_ts": "2023-07-20T09:00:00", "to_ts": "2023-07-20T15:30:00"}
+
+    response = client.post("/market/data/range", params=params)
+
+    assert response.status_code == 200
+    assert [tick["timestamp"] for tick in response.json()] == ["2023-07-20T09:15:00", "2023-07-20T09:16:00"]
+
+
+def test_get_market_data_ticks_intraday(authenticated, intraday_data):
+    request = {"stock_symbols": ["HDFCBANK"],
+               "timestamps": ["2023-07-20T09:15:00", "2023-07-20T09:20:00", "2023-07-20T00:00:00", "2023-07-20T09:00:00"]}
+
+    response = client.post("/market/data/ticks", json=request)
+
+    prices = response.json()["prices"][0]
+    assert prices[0] == pytest.approx((70.0 + 70.2) / 2)
+    # As of the 09:16 bar
+    assert prices[1] == pytest.approx((70.2 + 70.4) / 2)
+    assert prices[2] is not None
+    # Before the day's first intraday bar: the previous day's daily bar
+    previous = client.post("/market/data/tick", params={"stock_symbol": "HDFCBANK", "current_ts": "2023-07-19T00:00:00"}).json()
+    assert prices[3] == previous["price"]
+
+
+def test_get_market_data_bars(authenticated):
+    params = {"stock_symbol": "RELIANCE", "interval": "M", "from_ts": "2023-07-20T00:00:00", "to_ts": "2023-09-01T00:00:00"}
+
+    response = client.post("/market/data/bars", params=params)
+
+    assert response.status_code == 200
+    bars = response.json()
+    assert [bar["timestamp"] for bar in bars] == ["2023-07-01T00:00:00", "2023-08-01T00:00:00", "2023-09-01T00:00:00"]
+    for bar in bars:
+        assert bar["low"] <= bar["open"] <= bar["high"]
+        assert bar["low"] <= bar["close"] <= bar["high"]
+
+
+def test_get_market_data_bars_invalid_interval(authenticated):
+    params = {"stock_symbol": "RELIANCE", "interval": "H", "from_ts": "2023-07-20T00:00:00", "to_ts": "2023-09-01T00:00:00"}
+
+    response = client.post("/market/data/bars", params=params)
+
+    assert response.status_code == 422
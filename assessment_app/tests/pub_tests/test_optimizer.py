@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from assessment_app.service.optimizer import efficient_frontier, project_to_bounds
+
+
+@pytest.fixture
+def moments():
+    rng = np.random.default_rng(3)
+    returns = rng.normal([0.0004, 0.0008, 0.0002, 0.001], [0.01, 0.02, 0.008, 0.03], size=(250, 4)).T
+    return returns.mean(axis=1) * 252, np.cov(returns) * 252
+
+
+def test_project_to_bounds():
+    rng = np.random.default_rng(0)
+    weights = rng.normal(size=(500, 5))
+
+    projected = project_to_bounds(weights, 0.0, 0.3)
+
+    assert projected.sum(axis=1) == pytest.approx(np.ones(500))
+    assert projected.min() >= 0.0 and projected.max() <= 0.3
+    # Points already inside the set are left where they are
+    assert project_to_bounds(projected, 0.0, 0.3) == pytest.approx(projected)
+
+
+@pytest.mark.parametrize("lower, upper", [(0.0, 0.3), (-1.0, 2.0), (0.1, 0.25)])
+def test_project_to_bounds_is_nearest_point(lower, upper):
+    weights = np.random.default_rng(1).normal(size=(200, 5))
+
+    projected = project_to_bounds(weights, lower, upper)
+
+    # tau by bisection on the (non-increasing) sum of clip(v - tau, lower, upper)
+    low, high = np.full(200, -100.0), np.full(200, 100.0)
+    for _ in range(200):
+        tau = (low + high) / 2
+        above = np.clip(weights - tau[:, None], lower, upper).sum(axis=1) > 1
+        low, high = np.where(above, tau, low), np.where(above, high, tau)
+    assert projected == pytest.approx(np.clip(weights - low[:, None], lower, upper), abs=1e-12)
+
+
+def test_min_variance_matches_closed_form(moments):
+    mean, covariance = moments
+
+    weights, _, volatility = efficient_frontier(mean, covariance, -10.0, 10.0, 50)
+
+    inverse = np.linalg.solve(covariance, np.ones(4))
+    assert weights[0] == pytest.approx(inverse / inverse.sum(), abs=1e-9)
+    assert volatility[0] == pytest.approx(volatility.min())
+
+
+def test_frontier_respects_bounds(moments):
+    mean, covariance = moments
+
+    weights, returns, volatility = efficient_frontier(mean, covariance, 0.0, 0.4, 200)
+
+    assert weights.shape == (200, 4)
+    assert weights.sum(axis=1) == pytest.approx(np.ones(200))
+    assert weights.min() >= 0.0 and weights.max() <= 0.4 + 1e-12
+    # Higher risk tolerance never buys a lower expected return or a lower risk
+    assert (np.diff(returns) >= -1e-9).all() and (np.diff(volatility) >= -1e-9).all()
+    assert returns[-1] == pytest.approx(np.sort(mean)[::-1][:2].sum() * 0.4 + np.sort(mean)[::-1][2] * 0.2)
@@ -0,0 +1,103 @@
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import create_engine, event, insert, update
+from sqlalchemy.pool import StaticPool
+
+from assessment_app.models.schema import PriceORM, PriceSymbolORM
+from assessment_app.repository.price_db import DatabasePriceStore, copy_buffer, create_price_tables
+from assessment_app.repository.price_store import from_day, load_price_series
+
+
+@pytest.fixture
+def bind():
+    # COPY needs Postgres; the store's reads are plain indexed selects, exercised here on SQLite
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    create_price_tables(engine)
+    with engine.begin() as connection:
+        connection.execute(insert(PriceORM), [
+            {"symbol": "TEST", "ts": datetime(2023, 7, day), "open": 600.0 + day, "high": 630.0, "low": 590.0,
+             "close": 610.0 + day, "volume": 1000 * day}
+            for day in (21, 19, 20)
+        ])
+        connection.execute(insert(PriceSymbolORM), [{"symbol": "TEST", "row_count": 3, "version": 1}])
+    return engine
+
+
+def test_copy_buffer(tmp_path):
+    (tmp_path / "TEST.csv").write_text(
+        "Date,Open,High,Low,Close,Adj Close,Volume\n"
+        "2023-07-19,614.0,621.0,613.0,620.6,620.6,1000\n"
+        "2023-07-20,622.65,625.0,620.0,621.65,621.65,1200\n"
+    )
+
+    rows = copy_buffer(load_price_series("TEST", str(tmp_path))).read().splitlines()
+
+    assert rows == [
+        "TEST,2023-07-19T00:00:00,614.0,621.0,613.0,620.6,1000",
+        "TEST,2023-07-20T00:00:00,622.65,625.0,620.0,621.65,1200",
+    ]
+
+
+def test_database_price_store_get(bind):
+    store = DatabasePriceStore(bind)
+
+    series = store.get("TEST")
+
+    assert [from_day(day) for day in series.dates] == [date(2023, 7, 19), date(2023, 7, 20), date(2023, 7, 21)]
+    assert series.close.tolist() == [629.0, 630.0, 631.0]
+    assert series.volume.tolist() == [19000, 20000, 21000]
+    assert store.get("TEST") is series
+    assert (store.hits, store.misses) == (1, 1)
+
+
+def test_database_price_store_missing_symbol(bind):
+    store = DatabasePriceStore(bind)
+
+    with pytest.raises(FileNotFoundError):
+        store.get("MISSING")
+    with pytest.raises(FileNotFoundError):
+        store.get_range("MISSING", datetime(2023, 7, 19), datetime(2023, 7, 21))
+
+
+def test_database_price_store_get_range(bind):
+    store = DatabasePriceStore(bind)
+
+    # Uncached: fetched with a range query, without caching the symbol
+    fetched = store.get_range("TEST", datetime(2023, 7, 20, 9, 30), datetime(2023, 7, 21))
+    assert fetched.close.tolist() == [630.0, 631.0]
+    assert store.stats()["symbols"] == {}
+
+    # Cached: sliced from the cached series
+    store.get("TEST")
+    sliced = store.get_range("TEST", datetime(2023, 7, 20, 9, 30), datetime(2023, 7, 21))
+    assert sliced.close.tolist() == [630.0, 631.0]
+    assert store.hits == 1
+
+
+def test_database_price_store_reloads_new_ingest(bind):
+    store = DatabasePriceStore(bind, version_ttl=0)
+    store.get("TEST")
+
+    with bind.begin() as connection:
+        connection.execute(update(PriceORM).where(PriceORM.ts == datetime(2023, 7, 19)).values(close=1.0))
+        connection.execute(update(PriceSymbolORM).values(version=PriceSymbolORM.version + 1))
+
+    assert store.get("TEST").close[0] == 1.0
+    assert store.invalidations == 1
+
+
+def test_database_price_store_reads_the_version_once_per_ttl(bind):
+    store = DatabasePriceStore(bind, version_ttl=60)
+    store.get("TEST")
+    queries = []
+    event.listen(bind, "before_cursor_execute", lambda *args: queries.append(args[2]))
+
+    for _ in range(3):
+        store.get("TEST")
+        store.get_range("TEST", datetime(2023, 7, 19), datetime(2023, 7, 20))
+
+    assert queries == []
+    store.clear("TEST")
+    store.get("TEST")
+    assert len(queries) == 2
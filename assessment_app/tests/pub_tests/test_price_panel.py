@@ -0,0 +1,70 @@
+import os
+from datetime import date, datetime
+
+import numpy as np
+import pytest
+
+from assessment_app.repository.price_panel import PricePanel, PricePanelCache
+from assessment_app.repository.price_store import PriceStore, from_day
+
+
+@pytest.fixture
+def store(tmp_path):
+    (tmp_path / "A.csv").write_text(
+        "Date,Open,High,Low,Close,Adj Close,Volume\n"
+        "2023-07-19,10.0,10.0,10.0,10.0,10.0,100\n"
+        "2023-07-20,11.0,11.0,11.0,11.0,11.0,100\n"
+        "2023-07-21,12.0,12.0,12.0,12.0,12.0,100\n"
+    )
+    # B starts a day later and skips 2023-07-21
+    (tmp_path / "B.csv").write_text(
+        "Date,Open,High,Low,Close,Adj Close,Volume\n"
+        "2023-07-20,100.0,100.0,100.0,100.0,100.0,100\n"
+        "2023-07-24,110.0,110.0,110.0,110.0,110.0,100\n"
+    )
+    return PriceStore(str(tmp_path))
+
+
+def test_build_aligns_and_forward_fills(store):
+    panel = PricePanel.build([store.get("A"), store.get("B")])
+
+    assert [from_day(day) for day in panel.dates] == [
+        date(2023, 7, 19), date(2023, 7, 20), date(2023, 7, 21), date(2023, 7, 24),
+    ]
+    assert np.array_equal(panel.close, [[10.0, 11.0, 12.0, 12.0], [np.nan, 100.0, 100.0, 110.0]], equal_nan=True)
+
+
+def test_values_matrix_vector_product(store):
+    panel = PricePanel.build([store.get("A"), store.get("B")])
+    quantities = panel.quantities([("A", 2), ("B", 1), ("A", 1)])
+
+    assert quantities.tolist() == [3.0, 1.0]
+    assert np.array_equal(panel.values(quantities), [np.nan, 133.0, 136.0, 146.0], equal_nan=True)
+    assert panel.values(quantities, np.array([3, 1])).tolist() == [146.0, 133.0]
+    assert panel.values(quantities, panel.range_columns(datetime(2023, 7, 20), datetime(2023, 7, 21))).tolist() == [133.0, 136.0]
+    # Symbols with no quantity do not make values NaN
+    assert panel.values(panel.quantities([("A", 1)])).tolist() == [10.0, 11.0, 12.0, 12.0]
+
+
+def test_asof_columns(store):
+    panel = PricePanel.build([store.get("A"), store.get("B")])
+    timestamps = [datetime(2023, 7, 18), datetime(2023, 7, 20, 15, 30), datetime(2023, 7, 22), datetime(2023, 7, 30)]
+
+    assert panel.asof_columns(timestamps).tolist() == [-1, 1, 2, 3]
+
+
+def test_cache_rebuilds_on_reload(store, tmp_path):
+    cache = PricePanelCache(store)
+
+    panel = cache.get(["B", "A", "A"])
+    assert panel.symbols == ("A", "B")
+    assert cache.get(["A", "B"]) is panel
+
+    os.utime(tmp_path / "B.csv", ns=(0, 0))
+    assert cache.get(["A", "B"]) is not panel
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_cache_missing_symbol(store):
+    with pytest.raises(FileNotFoundError):
+        PricePanelCache(store).get(["A", "MISSING"])
@@ -0,0 +1,245 @@
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+
+import numpy as np
+import pytest
+
+from assessment_app.repository.price_store import (
+    PriceStore, asof_rows, from_day, is_valid_symbol, load_price_series, to_day
+)
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    # Rows are written out of order to check that the loader sorts them
+    (tmp_path / "TEST.csv").write_text(
+        "Date,Open,High,Low,Close,Adj Close,Volume\n"
+        "2023-07-20,622.65,625.0,620.0,621.65,621.65,1200\n"
+        "2023-07-19,614.0,621.0,613.0,620.6,620.6,1000\n"
+        "2023-07-21,621.0,627.0,620.5,625.75,625.75,1500\n"
+    )
+    return str(tmp_path)
+
+
+def test_day_conversion_round_trip():
+    assert to_day(date(1970, 1, 2)) == 1
+    assert to_day(datetime(2023, 7, 19, 15, 30)) == to_day(date(2023, 7, 19))
+    assert from_day(to_day(date(2023, 7, 19))) == date(2023, 7, 19)
+
+
+def test_load_price_series(data_dir):
+    series = load_price_series("TEST", data_dir)
+
+    assert len(series) == 3
+    assert [from_day(day) for day in series.dates] == [date(2023, 7, 19), date(2023, 7, 20), date(2023, 7, 21)]
+    assert series.close.tolist() == [620.6, 621.65, 625.75]
+    assert series.volume.tolist() == [1000, 1200, 1500]
+    assert series.mid[0] == pytest.approx((614.0 + 620.6) / 2)
+    # Six columns of three rows plus the window table
+    assert series.nbytes == 6 * 3 * 8 + 3 * 8
+
+
+def test_price_store_loads_each_symbol_once(data_dir):
+    store = PriceStore(data_dir)
+
+    first = store.get("TEST")
+    second = store.get("TEST")
+
+    assert first is second
+    stats = store.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["symbols"]["TEST"]["rows"] == 3
+    assert stats["symbols"]["TEST"]["bytes"] == first.nbytes
+    assert stats["symbols"]["TEST"]["load_time_ms"] >= 0
+
+
+def test_price_store_missing_symbol(data_dir):
+    store = PriceStore(data_dir)
+
+    with pytest.raises(FileNotFoundError):
+        store.get("MISSING")
+
+
+def test_price_store_bundled_data():
+    series = PriceStore().get("HDFCBANK")
+
+    assert len(series) > 0
+    assert (series.dates[1:] > series.dates[:-1]).all()
+
+
+def test_range_slice(data_dir):
+    series = load_price_series("TEST", data_dir)
+
+    assert series.range_slice(date(2023, 7, 19), date(2023, 7, 20)) == slice(0, 2)
+    assert series.range_slice(date(2023, 7, 1), date(2023, 8, 1)) == slice(0, 3)
+    assert series.range_slice(date(2023, 7, 21), date(2023, 7, 19)) == slice(2, 2)
+    assert len(series.dates[series.range_slice(date(2023, 8, 1), date(2023, 8, 2))]) == 0
+
+
+def test_price_store_get_range(data_dir):
+    store = PriceStore(data_dir)
+
+    series = store.get_range("TEST", datetime(2023, 7, 20, 9, 30), datetime(2023, 7, 21))
+
+    assert series.close.tolist() == [621.65, 625.75]
+    assert store.get_range("TEST", datetime(2023, 7, 22), datetime(2023, 7, 25)).close.tolist() == []
+    assert store.misses == 1
+
+
+def test_price_store_evicts_least_recently_used(data_dir):
+    for symbol in ("A", "B"):
+        shutil.copy(os.path.join(data_dir, "TEST.csv"), os.path.join(data_dir, f"{symbol}.csv"))
+    # Six columns of three rows plus the window table
+    entry_bytes = 6 * 3 * 8 + 3 * 8
+    store = PriceStore(data_dir, max_bytes=2 * entry_bytes)
+
+    store.get("TEST")
+    store.get("A")
+    store.get("TEST")
+    store.get("B")
+
+    stats = store.stats()
+    assert list(stats["symbols"]) == ["TEST", "B"]
+    assert stats["bytes"] == 2 * entry_bytes
+    assert stats["evictions"] == 1
+
+
+def test_price_store_reloads_changed_file(data_dir):
+    store = PriceStore(data_dir)
+    first = store.get("TEST")
+
+    path = os.path.join(data_dir, "TEST.csv")
+    with open(path, "a") as file:
+        file.write("2023-07-24,626.0,630.0,625.0,629.0,629.0,900\n")
+
+    second = store.get("TEST")
+    assert second is not first
+    assert len(second) == 4
+    assert store.stats()["invalidations"] == 1
+
+
+def test_asof(data_dir):
+    series = load_price_series("TEST", data_dir)
+
+    assert series.asof(datetime(2023, 7, 19)) == 0
+    # Saturday and the following Sunday resolve to Friday's bar
+    assert series.asof(datetime(2023, 7, 22)) == 2
+    assert series.asof(datetime(2023, 7, 23, 12, 0)) == 2
+    assert series.asof(datetime(2023, 7, 18)) is None
+    assert series.asof_many([datetime(2024, 1, 1), datetime(2023, 7, 18), datetime(2023, 7, 20)]).tolist() == [2, -1, 1]
+
+
+def test_asof_rows():
+    axis = np.array([10, 20, 30], dtype=np.int64)
+
+    assert asof_rows(axis, np.array([5, 10, 15, 30, 99])).tolist() == [-1, 0, 0, 2, 2]
+    assert asof_rows(np.empty(0, dtype=np.int64), np.array([1])).tolist() == [-1]
+
+
+def test_resample(data_dir):
+    series = load_price_series("TEST", data_dir)
+
+    weekly, last_days = series.resample("W")
+
+    assert weekly.iso_timestamps(slice(None)) == ["2023-07-17T00:00:00"]
+    assert weekly.datetimes(slice(None)) == [datetime(2023, 7, 17)]
+    assert [from_day(day) for day in last_days] == [date(2023, 7, 21)]
+    assert weekly.open.tolist() == [614.0]
+    assert weekly.high.tolist() == [627.0]
+    assert weekly.low.tolist() == [613.0]
+    assert weekly.close.tolist() == [625.75]
+    assert weekly.volume.tolist() == [3700]
+    assert series.resample("W")[0] is weekly
+
+
+def test_resample_periods(data_dir):
+    series = load_price_series("TEST", data_dir)
+
+    for interval, start in (("M", "2023-07-01"), ("Q", "2023-07-01"), ("Y", "2023-01-01")):
+        bars, _ = series.resample(interval)
+        assert bars.iso_timestamps(slice(None)) == [f"{start}T00:00:00"]
+        assert bars.volume.tolist() == [3700]
+
+
+def test_window_table(data_dir):
+    store = PriceStore(data_dir)
+    series = store.get("TEST")
+    nbytes = series.nbytes
+
+    assert series.window_log_return(0, 2) == pytest.approx(np.log(625.75 / 620.6))
+    assert series.window_log_return(1, 1) == 0.0
+    assert np.allclose(series.window_log_return(np.array([0, 1]), np.array([1, 2])),
+                       np.log([621.65 / 620.6, 625.75 / 621.65]))
+    # Built on the first window query, and counted before it
+    assert series.nbytes == nbytes == store.stats()["bytes"]
+
+
+def test_window_table_is_built_on_first_query(data_dir, monkeypatch):
+    logs = []
+    log = np.log
+    monkeypatch.setattr(np, "log", lambda values: logs.append(len(values)) or log(values))
+
+    series = PriceStore(data_dir).get("TEST")
+    assert logs == []
+
+    series.window_log_return(0, 1)
+    series.window_log_return(1, 2)
+    assert logs == [3]
+
+
+def test_memoize_is_dropped_with_reloaded_series(data_dir):
+    store = PriceStore(data_dir)
+    series = store.get("TEST")
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return series.close.sum()
+
+    assert series.memoize("total", compute) == series.memoize("total", compute)
+    assert len(calls) == 1
+
+    os.utime(os.path.join(data_dir, "TEST.csv"), ns=(0, 0))
+    reloaded = store.get("TEST")
+    reloaded.memoize("total", compute)
+    assert len(calls) == 2
+
+
+def test_price_store_loads_outside_the_lock(data_dir):
+    shutil.copy(os.path.join(data_dir, "TEST.csv"), os.path.join(data_dir, "SLOW.csv"))
+    started, release = threading.Event(), threading.Event()
+    loads = []
+
+    class SlowStore(PriceStore):
+        def _load(self, symbol):
+            loads.append(symbol)
+            if symbol == "SLOW":
+                started.set()
+                release.wait(5)
+            return super()._load(symbol)
+
+    store = SlowStore(data_dir)
+    store.get("TEST")
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        slow = [pool.submit(store.get, "SLOW") for _ in range(2)]
+        assert started.wait(5)
+        # A hit on another symbol is served while SLOW is loading
+        assert len(store.get("TEST")) == 3
+        release.set()
+        first, second = (future.result(5) for future in slow)
+
+    assert first is second
+    assert loads == ["TEST", "SLOW"]
+    assert store.stats()["misses"] == 2
+
+
+@pytest.mark.parametrize("symbol, valid", [
+    ("HDFCBANK", True), ("M_M", True), ("BRK.B", True), ("../data/HDFCBANK", False), ("..", False),
+    ("hdfcbank", False), ("", False), ("HDFC/BANK", False),
+])
+def test_is_valid_symbol(symbol, valid):
+    assert is_valid_symbol(symbol) == valid
@@ -0,0 +1,102 @@
+import pytest
+from fastapi import HTTPException
+
+from assessment_app.service.result_cache import ResultCache, portfolio_tag
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def counting(value):
+    calls = []
+
+    def compute():
+        calls.append(value)
+        return value
+    return compute, calls
+
+
+def test_hit_after_miss():
+    cache = ResultCache()
+    compute, calls = counting(1.5)
+
+    assert cache.get_or_compute("stock", ("A", 1), compute) == 1.5
+    assert cache.get_or_compute("stock", ("A", 1), compute) == 1.5
+    assert len(calls) == 1
+
+    stats = cache.stats()["endpoints"]["stock"]
+    assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 1, 0.5)
+
+
+def test_new_data_version_misses():
+    cache = ResultCache()
+    compute, calls = counting(1.5)
+
+    cache.get_or_compute("stock", ("A", 1), compute)
+    cache.get_or_compute("stock", ("A", 2), compute)
+    assert len(calls) == 2
+
+
+def test_lru_eviction():
+    cache = ResultCache(max_entries=2)
+    cache.get_or_compute("stock", "a", lambda: 1)
+    cache.get_or_compute("stock", "b", lambda: 2)
+    # Touch "a" so "b" is the least recently used
+    cache.get_or_compute("stock", "a", lambda: 1)
+    cache.get_or_compute("stock", "c", lambda: 3)
+
+    compute, calls = counting(2)
+    cache.get_or_compute("stock", "b", compute)
+    assert calls == [2]
+    assert cache.get_or_compute("stock", "c", lambda: None) == 3
+    assert cache.stats()["evictions"] == 2
+
+
+def test_ttl_expiry():
+    clock = FakeClock()
+    cache = ResultCache(ttl_seconds=10, clock=clock)
+    compute, calls = counting(1)
+
+    cache.get_or_compute("stock", "a", compute)
+    clock.now = 9.9
+    cache.get_or_compute("stock", "a", compute)
+    assert len(calls) == 1
+
+    clock.now = 10.0
+    cache.get_or_compute("stock", "a", compute)
+    assert len(calls) == 2
+    assert cache.stats()["expirations"] == 1
+
+
+def test_invalidate_tag():
+    cache = ResultCache()
+    cache.get_or_compute("portfolio", ("p1", 1), lambda: 1, tag=portfolio_tag("p1"))
+    cache.get_or_compute("rolling", ("p1", 2), lambda: 2, tag=portfolio_tag("p1"))
+    cache.get_or_compute("portfolio", ("p2", 1), lambda: 3, tag=portfolio_tag("p2"))
+
+    assert cache.invalidate(portfolio_tag("p1")) == 2
+    assert cache.invalidate(portfolio_tag("p1")) == 0
+
+    compute, calls = counting(1)
+    cache.get_or_compute("portfolio", ("p1", 1), compute, tag=portfolio_tag("p1"))
+    assert calls == [1]
+    assert cache.get_or_compute("portfolio", ("p2", 1), lambda: None) == 3
+    assert cache.stats()["entries"] == 2
+
+
+def test_errors_are_not_cached():
+    cache = ResultCache()
+
+    def fail():
+        raise HTTPException(status_code=400, detail="Invalid start or end date")
+
+    for _ in range(2):
+        with pytest.raises(HTTPException):
+            cache.get_or_compute("stock", "a", fail)
+    assert cache.stats()["entries"] == 0
+    assert cache.stats()["endpoints"]["stock"]["misses"] == 2
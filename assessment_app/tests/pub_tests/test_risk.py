@@ -0,0 +1,89 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+
+from assessment_app.service.risk import (
+    historical_risk, horizon_returns, monte_carlo_chunks, return_distribution, simulate_chunk_losses,
+    simulate_losses, tail_risk,
+)
+
+
+@pytest.fixture
+def log_returns():
+    rng = np.random.default_rng(7)
+    return rng.normal(0.0005, 0.01, size=(3, 250))
+
+
+def test_horizon_returns_sums_overlapping_days(log_returns):
+    returns = horizon_returns(log_returns, 5)
+
+    assert returns.shape == (3, 246)
+    assert returns[:, 0] == pytest.approx(log_returns[:, :5].sum(axis=1))
+    assert returns[:, -1] == pytest.approx(log_returns[:, -5:].sum(axis=1))
+    assert np.allclose(horizon_returns(log_returns, 1), log_returns, rtol=0, atol=1e-15)
+
+
+def test_tail_risk():
+    losses = np.arange(1.0, 101.0)
+
+    value_at_risk, expected_shortfall = tail_risk(losses, 0.95)
+
+    assert value_at_risk == pytest.approx(np.quantile(losses, 0.95))
+    assert expected_shortfall == pytest.approx(losses[losses >= value_at_risk].mean())
+    assert expected_shortfall >= value_at_risk
+
+
+def test_historical_risk_revalues_positions(log_returns):
+    exposures = np.array([1000.0, 2000.0, 500.0])
+
+    value_at_risk, _ = historical_risk(log_returns, exposures, 0.99, 1)
+
+    losses = [-sum(e * (np.exp(r) - 1) for e, r in zip(exposures, day)) for day in log_returns.T]
+    assert value_at_risk == pytest.approx(np.quantile(losses, 0.99))
+
+
+def test_monte_carlo_chunks():
+    chunks = monte_carlo_chunks(42, 50001, chunk_paths=20000)
+
+    assert [paths for _, paths in chunks] == [20000, 20000, 10001]
+    assert monte_carlo_chunks(42, 40000, chunk_paths=20000)[1][0].generate_state(4).tolist() == \
+        chunks[1][0].generate_state(4).tolist()
+
+
+def test_simulated_losses_match_distribution(log_returns):
+    exposures = np.array([1000.0, 2000.0, 500.0])
+    mean, factor = return_distribution(log_returns, 10)
+    assert factor @ factor.T == pytest.approx(np.cov(log_returns) * 10)
+
+    (seed, paths), = monte_carlo_chunks(1, 200000, chunk_paths=200000)
+    losses = simulate_losses(exposures, mean, factor, seed, paths)
+
+    expected = -(exposures * np.expm1(mean + np.diag(factor @ factor.T) / 2)).sum()
+    assert losses.mean() == pytest.approx(expected, rel=0.05, abs=5.0)
+
+
+def test_simulation_is_identical_across_processes(log_returns):
+    exposures = np.array([1000.0, 2000.0, 500.0])
+    mean, factor = return_distribution(log_returns, 1)
+    chunks = monte_carlo_chunks(3, 30000, chunk_paths=10000)
+
+    serial = np.concatenate([simulate_losses(exposures, mean, factor, seed, paths) for seed, paths in chunks])
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        parallel = np.concatenate(list(executor.map(
+            simulate_losses, *zip(*[(exposures, mean, factor, seed, paths) for seed, paths in chunks])
+        )))
+
+    assert np.array_equal(serial, parallel)
+
+
+def test_chunk_groups_match_single_chunks(log_returns):
+    exposures = np.array([1000.0, 2000.0, 500.0])
+    mean, factor = return_distribution(log_returns, 1)
+    chunks = monte_carlo_chunks(5, 50000, chunk_paths=10000)
+
+    single = np.concatenate([simulate_losses(exposures, mean, factor, seed, paths) for seed, paths in chunks])
+    grouped = np.concatenate([simulate_chunk_losses(exposures, mean, factor, chunks[:2]),
+                              simulate_chunk_losses(exposures, mean, factor, chunks[2:])])
+
+    assert np.array_equal(single, grouped)
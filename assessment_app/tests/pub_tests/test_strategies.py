@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+from fastapi import HTTPException
+
+from assessment_app.service.analytics import rolling_mean
+from assessment_app.service.strategies import (
+    get_strategy, load_strategy_modules, mean_reversion, moving_average_crossover, register_strategy, strategies
+)
+
+
+def test_registry_lists_builtin_strategies():
+    assert [(strategy.id, strategy.name) for strategy in strategies.values()][:3] == [
+        ("0", "default"), ("1", "moving_average_crossover"), ("2", "mean_reversion"),
+    ]
+    assert get_strategy("1").parameters == {"fast": 5, "slow": 20}
+
+
+def test_unknown_strategy():
+    with pytest.raises(HTTPException) as exc:
+        get_strategy("missing")
+
+    assert exc.value.status_code == 404
+
+
+def test_resolve_parameters():
+    strategy = get_strategy("2")
+
+    assert strategy.resolve(None) == {"window": 20, "width": 2.0}
+    resolved = strategy.resolve({"window": 10.0, "width": 1.5})
+    assert resolved == {"window": 10, "width": 1.5} and isinstance(resolved["window"], int)
+    for parameters in ({"span": 3.0}, {"window": 0.0}, {"window": 2.5}, {"window": float("inf")},
+                       {"width": float("inf")}, {"width": float("nan")}):
+        with pytest.raises(HTTPException) as exc:
+            strategy.resolve(parameters)
+        assert exc.value.status_code == 400
+
+
+def test_duplicate_registration():
+    with pytest.raises(ValueError):
+        register_strategy("0", "again")(lambda opens, closes: (opens < closes, opens > closes))
+
+
+def test_load_strategy_modules():
+    load_strategy_modules(" ,assessment_app.service.strategies")
+
+    with pytest.raises(ModuleNotFoundError):
+        load_strategy_modules("assessment_app.missing_strategies")
+
+
+def test_rolling_mean():
+    means = rolling_mean(np.array([1.0, 2.0, 3.0, 4.0]), 3)
+
+    assert np.isnan(means[:2]).all()
+    assert means[2:].tolist() == [2.0, 3.0]
+    assert np.isnan(rolling_mean(np.array([1.0]), 2)).all()
+
+
+def test_moving_average_crossover():
+    closes = np.array([5.0, 4.0, 3.0, 2.0, 3.0, 4.0, 5.0, 4.0, 3.0, 2.0])
+
+    buys, sells = moving_average_crossover(closes, closes, 2, 3)
+
+    # The fast average is below the slow one on bars 2-4, above on bars 5-7 and below again from bar 8
+    assert np.flatnonzero(buys).tolist() == [5]
+    assert np.flatnonzero(sells).tolist() == [8]
+
+
+def test_mean_reversion_bands():
+    closes = np.array([10.0, 10.0, 10.0, 10.0, 7.0, 10.0, 13.0])
+
+    buys, sells = mean_reversion(closes, closes, 4, 1.0)
+
+    assert np.flatnonzero(buys).tolist() == [4]
+    assert np.flatnonzero(sells).tolist() == [6]
@@ -0,0 +1,49 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pytest
+from fastapi import HTTPException
+
+from assessment_app.service.backtest_engine import simulate_portfolio
+from assessment_app.service.strategies import get_strategy, moving_average_crossover
+from assessment_app.service.sweep import SharedPrices, parameter_grid, run_sweep_chunk
+
+
+@pytest.fixture
+def prices():
+    rng = np.random.default_rng(11)
+    closes = [np.round(np.exp(np.cumsum(rng.normal(0, 0.02, length))) * 100, 2) for length in (300, 250)]
+    return [(np.round(close * np.exp(rng.normal(0, 0.01, len(close))), 2), close) for close in closes]
+
+
+def test_parameter_grid():
+    grid = parameter_grid(get_strategy("1"), {"fast": [2, 3], "slow": [10.0]})
+
+    assert grid == [{"fast": 2, "slow": 10}, {"fast": 3, "slow": 10}]
+    assert parameter_grid(get_strategy("1"), {}) == [{"fast": 5, "slow": 20}]
+    for values in ([], [2.5]):
+        with pytest.raises(HTTPException) as exc:
+            parameter_grid(get_strategy("1"), {"fast": values})
+        assert exc.value.status_code == 400
+
+
+def test_sweep_chunk_matches_direct_simulation(prices):
+    runs = [({"fast": fast, "slow": 20}, [(start, 250), (0, 200)]) for fast in (2, 5) for start in (0, 100)]
+
+    with SharedPrices(prices) as shared:
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            results = executor.submit(run_sweep_chunk, shared.handle, [100, 0], 50000.0,
+                                      moving_average_crossover, runs).result()
+
+    for (parameters, rows), (final_capital, trades) in zip(runs, results):
+        holdings = [(opens[start:stop], closes[start:stop], quantity)
+                    for (opens, closes), (start, stop), quantity in zip(prices, rows, [100, 0])]
+        capital, _, fills = simulate_portfolio(holdings, 50000.0, moving_average_crossover, parameters)
+        assert final_capital == capital
+        assert trades == sum(len(filled_rows) for filled_rows, _ in fills)
+
+
+def test_shared_prices_without_bars():
+    with SharedPrices([]) as shared:
+        assert run_sweep_chunk(shared.handle, [], 100.0, moving_average_crossover, [({"fast": 2, "slow": 3}, [])]) \
+            == [(100.0, 0)]
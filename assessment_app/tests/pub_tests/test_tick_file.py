@@ -0,0 +1,65 @@
+import os
+from datetime import date
+
+import pytest
+
+from assessment_app.repository.price_store import PriceStore, load_price_series
+from assessment_app.repository.tick_file import convert_csv, main, open_tick_file, tick_file_path
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    (tmp_path / "TEST.csv").write_text(
+        "Date,Open,High,Low,Close,Adj Close,Volume\n"
+        "2023-07-19,614.0,621.0,613.0,620.6,620.6,1000\n"
+        "2023-07-20,622.65,625.0,620.0,621.65,621.65,1200\n"
+        "2023-07-21,621.0,627.0,620.5,625.75,625.75,1500\n"
+    )
+    return str(tmp_path)
+
+
+def test_round_trip(data_dir):
+    path = convert_csv("TEST", data_dir)
+    expected = load_price_series("TEST", data_dir)
+
+    series = open_tick_file("TEST", path)
+
+    assert series.mapped
+    assert os.path.getsize(path) == 16 + 6 * 3 * 8
+    for column in ("dates", "open", "high", "low", "close", "volume"):
+        assert getattr(series, column).tolist() == getattr(expected, column).tolist()
+    assert not series.close.flags.writeable
+
+
+def test_range_slice_is_a_view(data_dir):
+    series = open_tick_file("TEST", convert_csv("TEST", data_dir))
+    rows = series.range_slice(date(2023, 7, 20), date(2023, 7, 21))
+
+    assert series.close[rows].base is not None
+    assert series.close[rows].tolist() == [621.65, 625.75]
+
+
+def test_invalid_file(tmp_path):
+    path = tmp_path / "BAD.bin"
+    path.write_bytes(b"not a tick file at all")
+
+    with pytest.raises(ValueError):
+        open_tick_file("BAD", str(path))
+
+
+def test_store_prefers_tick_file(data_dir):
+    main(["--data-dir", data_dir])
+
+    assert os.path.exists(tick_file_path("TEST", data_dir))
+    assert PriceStore(data_dir).get("TEST").mapped
+
+
+def test_store_ignores_stale_tick_file(data_dir):
+    path = convert_csv("TEST", data_dir)
+    csv_path = os.path.join(data_dir, "TEST.csv")
+    os.utime(path, (0, 0))
+
+    series = PriceStore(data_dir).get("TEST")
+
+    assert not series.mapped
+    assert os.path.getmtime(csv_path) > os.path.getmtime(path)
@@ -1,5 +1,8 @@
 from datetime import datetime
-from assessment_app.utils.utils import compute_cagr, datetime_to_str, str_to_datetime
+
+import numpy as np
+
+from assessment_app.utils.utils import compute_cagr, compute_cagr_from_log_return, datetime_to_str, str_to_datetime
 
 # Test for compute_cagr function
 def test_compute_cagr():
@@ -15,6 +18,38 @@ def test_compute_cagr():
     
     assert round(result, 2) == expected_cagr, f"Expected {expected_cagr}, got {result}"
 
+# Test for the vectorized compute_cagr path
+def test_compute_cagr_arrays():
+    start_dates = np.array(["2020-01-01", "2020-01-01", "2021-06-30T12:00", "2020-01-01"], dtype="datetime64[s]")
+    end_dates = np.array(["2023-01-01", "2020-01-01", "2022-06-30T06:00", "2021-01-01"], dtype="datetime64[s]")
+    beginning_values = np.array([1000.0, 1000.0, 500.0, 0.0])
+    ending_values = np.array([2000.0, 2000.0, 750.0, 100.0])
+
+    result = compute_cagr(beginning_values, ending_values, start_dates, end_dates)
+
+    expected = [
+        compute_cagr(b, e, s.astype(datetime), d.astype(datetime))
+        for b, e, s, d in zip(beginning_values.tolist(), ending_values.tolist(), start_dates, end_dates)
+    ]
+    assert result.shape == (4,)
+    assert np.allclose(result, expected, rtol=1e-12, atol=0)
+    assert result[1] == 0.0 and result[3] == 0.0
+
+# Test for compute_cagr_from_log_return function
+def test_compute_cagr_from_log_return():
+    start_date = datetime(2020, 1, 1)
+    end_date = datetime(2023, 1, 1)
+
+    result = compute_cagr_from_log_return(np.log(2000 / 1000), start_date, end_date)
+
+    assert round(result, 2) == 25.99
+    assert compute_cagr_from_log_return(0.5, start_date, start_date) == 0.0
+    arrays = compute_cagr_from_log_return(
+        np.log([2.0, 1.5]), np.array([start_date, start_date], dtype="datetime64[s]"),
+        np.array([end_date, start_date], dtype="datetime64[s]"),
+    )
+    assert np.allclose(arrays, [compute_cagr(1000, 2000, start_date, end_date), 0.0])
+
 # Test for datetime_to_str function
 def test_datetime_to_str():
     dt = datetime(2023, 9, 14)
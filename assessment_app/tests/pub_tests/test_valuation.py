@@ -0,0 +1,95 @@
+from datetime import datetime
+
+import pytest
+
+from assessment_app.repository.price_panel import PricePanelCache
+from assessment_app.repository.price_store import PriceStore
+from assessment_app.service.valuation import NetWorthCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    (tmp_path / "A.csv").write_text(
+        "Date,Open,High,Low,Close,Adj Close,Volume\n"
+        "2023-07-19,10.0,10.0,10.0,10.0,10.0,100\n"
+        "2023-07-20,11.0,11.0,11.0,11.0,11.0,100\n"
+        "2023-07-24,12.0,12.0,12.0,12.0,12.0,100\n"
+    )
+    (tmp_path / "B.csv").write_text(
+        "Date,Open,High,Low,Close,Adj Close,Volume\n"
+        "2023-07-20,100.0,100.0,100.0,100.0,100.0,100\n"
+        "2023-07-21,110.0,110.0,110.0,110.0,110.0,100\n"
+    )
+    return NetWorthCache(PricePanelCache(PriceStore(str(tmp_path))))
+
+
+HOLDINGS = [("A", 10, 1.0), ("B", 2, 5.0), ("UNKNOWN", 3, 7.0)]
+
+
+def test_values_holdings_at_last_close(cache):
+    epoch = cache.epoch()
+
+    # Saturday: A's close from Thursday, B's from Friday; UNKNOWN has no data and keeps its stored price
+    net_worth = cache.load("p1", "u1", 1000.0, datetime(2023, 7, 22, 15, 0), HOLDINGS, epoch)
+
+    assert net_worth == 1000.0 + 10 * 11.0 + 2 * 110.0 + 3 * 7.0
+    assert cache.get("p1", "u1") == net_worth
+
+
+def test_stored_price_before_first_close(cache):
+    net_worth = cache.load("p1", "u1", 0.0, datetime(2023, 7, 19), HOLDINGS, cache.epoch())
+
+    # B has no close until 2023-07-20
+    assert net_worth == 10 * 10.0 + 2 * 5.0 + 3 * 7.0
+
+
+def test_trade_updates_cached_valuation(cache):
+    cache.load("p1", "u1", 1000.0, datetime(2023, 7, 20), HOLDINGS, cache.epoch())
+
+    cache.apply_trade("p1", 900.0, datetime(2023, 7, 24))
+
+    assert cache.get("p1", "u1") == 900.0 + 10 * 12.0 + 2 * 110.0 + 3 * 7.0
+    assert cache.stats()["updates"] == 1
+
+
+def test_other_user_misses(cache):
+    cache.load("p1", "u1", 1000.0, datetime(2023, 7, 20), HOLDINGS, cache.epoch())
+
+    assert cache.get("p1", "u2") is None
+
+
+def test_load_overlapping_a_change_is_not_cached(cache):
+    epoch = cache.epoch()
+    cache.apply_trade("p1", 900.0, datetime(2023, 7, 24))
+
+    cache.load("p1", "u1", 1000.0, datetime(2023, 7, 20), HOLDINGS, epoch)
+
+    assert cache.get("p1", "u1") is None
+
+
+def test_invalidate(cache):
+    cache.load("p1", "u1", 1000.0, datetime(2023, 7, 20), HOLDINGS, cache.epoch())
+
+    cache.invalidate("p1")
+
+    assert cache.get("p1", "u1") is None
+
+
+def test_change_to_another_portfolio_does_not_drop_a_load(cache):
+    epoch = cache.epoch()
+    cache.apply_trade("p2", 900.0, datetime(2023, 7, 24))
+
+    cache.load("p1", "u1", 1000.0, datetime(2023, 7, 20), HOLDINGS, epoch)
+
+    assert cache.get("p1", "u1") is not None
+
+
+def test_poll_reprices_after_price_data_changes(cache, tmp_path):
+    cache.load("p1", "u1", 0.0, datetime(2023, 7, 24), [("A", 10, 1.0)], cache.epoch())
+    assert cache.get("p1", "u1") == 10 * 12.0
+
+    path = tmp_path / "A.csv"
+    # "13.00" also changes the file's size, so the change is seen within the mtime resolution
+    path.write_text(path.read_text().replace("2023-07-24,12.0,12.0,12.0,12.0,12.0", "2023-07-24,13.0,13.0,13.0,13.0,13.00"))
+
+    assert cache.get("p1", "u1") == 10 * 13.0
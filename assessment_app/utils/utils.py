@@ -1,27 +1,40 @@
 import datetime
+from typing import Union
+
+import numpy as np
 
 from assessment_app.models.constants import DAYS_IN_YEAR
 from datetime import datetime
 
+SECONDS_IN_DAY = 24 * 60 * 60
+
 
-def compute_cagr(beginning_value: float, ending_value: float, start_date: datetime, end_date: datetime) -> float:
+def compute_cagr(beginning_value: Union[float, np.ndarray], ending_value: Union[float, np.ndarray],
+                 start_date: Union[datetime, np.ndarray], end_date: Union[datetime, np.ndarray]) -> Union[float, np.ndarray]:
     """
     Compute the Compound Annual Growth Rate (CAGR).
 
+    Every argument may also be an array (dates as datetime64 arrays), in which case the CAGR of every
+    element is computed in one vectorized pass and returned as a float64 array; scalars and arrays
+    broadcast against each other.
+
     Parameters:
-    beginning_value (float): The initial value of the investment.
-    ending_value (float): The value of the investment at the end of the period.
-    start_date (datetime): The starting date of the investment.
-    end_date (datetime): The ending date of the investment.
+    beginning_value (float | np.ndarray): The initial value of the investment.
+    ending_value (float | np.ndarray): The value of the investment at the end of the period.
+    start_date (datetime | np.ndarray): The starting date of the investment.
+    end_date (datetime | np.ndarray): The ending date of the investment.
 
     Returns:
-    float: The CAGR as a decimal.
+    float | np.ndarray: The CAGR as a decimal.
 
     Example:
         12% CAGR for the specified duration would return 12.0 as output from this method
         200% CAGR would mean your returned value would be 200 for the duration
         5% CAGR would mean your returned value would be 5 for the duration
     """
+    if any(np.ndim(arg) for arg in (beginning_value, ending_value, start_date, end_date)):
+        return compute_cagr_array(beginning_value, ending_value, start_date, end_date)
+
     # Calculate the number of days between start_date and end_date
     duration_in_days = (end_date - start_date).days
     
@@ -35,6 +48,56 @@ def compute_cagr(beginning_value: float, ending_value: float, start_date: dateti
     return cagr
 
 
+def compute_cagr_array(beginning_value, ending_value, start_date, end_date) -> np.ndarray:
+    """
+    Vectorized `compute_cagr`: same formula and zero-duration / zero-value rule, over broadcast arrays.
+
+    Durations count whole elapsed days, like `timedelta.days`. Where the growth overflows a float the
+    result is inf rather than an OverflowError.
+    """
+    beginning_value = np.asarray(beginning_value, dtype=np.float64)
+    ending_value = np.asarray(ending_value, dtype=np.float64)
+    duration_in_years = elapsed_days(start_date, end_date) / DAYS_IN_YEAR
+
+    valid = (duration_in_years != 0) & (beginning_value != 0)
+    with np.errstate(divide="ignore", over="ignore", invalid="ignore"):
+        growth = ending_value / np.where(valid, beginning_value, 1.0)
+        cagr = (growth ** (1 / np.where(valid, duration_in_years, 1.0)) - 1) * 100
+    return np.where(valid, cagr, 0.0)
+
+
+def compute_cagr_from_log_return(log_return: Union[float, np.ndarray], start_date: Union[datetime, np.ndarray],
+                                 end_date: Union[datetime, np.ndarray]) -> Union[float, np.ndarray]:
+    """
+    CAGR, as `compute_cagr`, from the log of ending_value / beginning_value, e.g. the difference of two
+    entries of a cumulative log-return table. Scalars give a float, arrays a float64 array.
+
+    Parameters:
+    log_return (float | np.ndarray): log(ending_value / beginning_value).
+    start_date (datetime | np.ndarray): The starting date of the investment.
+    end_date (datetime | np.ndarray): The ending date of the investment.
+
+    Returns:
+    float | np.ndarray: The CAGR as a decimal, 0.0 for a zero duration.
+    """
+    duration_in_years = np.asarray(elapsed_days(start_date, end_date) / DAYS_IN_YEAR)
+    valid = duration_in_years != 0
+    with np.errstate(over="ignore"):
+        cagr = np.expm1(np.asarray(log_return) / np.where(valid, duration_in_years, 1.0)) * 100
+    cagr = np.where(valid, cagr, 0.0)
+    return float(cagr) if cagr.ndim == 0 else cagr
+
+
+def elapsed_days(start_date: Union[datetime, np.ndarray], end_date: Union[datetime, np.ndarray]) -> Union[int, np.ndarray]:
+    """
+    Whole days elapsed between two datetimes (or datetime64 arrays), rounded down like `timedelta.days`.
+    """
+    if isinstance(start_date, datetime) and isinstance(end_date, datetime):
+        return (end_date - start_date).days
+    elapsed = np.asarray(end_date, dtype="datetime64[s]") - np.asarray(start_date, dtype="datetime64[s]")
+    return elapsed.astype(np.int64) // SECONDS_IN_DAY
+
+
 def datetime_to_str(dt: datetime) -> str:
     """
     Convert a datetime object to a string in the format 'YYYY-MM-DD'.